@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from redis.exceptions import RedisError
 
 from redis_client import get_redis_client
+from metrics import record_cache
 
 from database import get_db, User
 from .models import UserCreate, UserLogin, Token, UserResponse
@@ -65,11 +66,14 @@ class AuthService:
         """Retrieve hashed password from Redis cache."""
         try:
             client = get_redis_client()
-            return client.hget(
+            cached = client.hget(
                 AuthService._redis_key(username),
                 "hashed_password",
             )
+            record_cache("auth_credentials", cached is not None)
+            return cached
         except RedisError:
+            record_cache("auth_credentials", False)
             return None
 
     @staticmethod
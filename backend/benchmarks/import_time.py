@@ -0,0 +1,104 @@
+"""
+Cold-start benchmark: measure how long importing the API module takes.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the median total import time plus the slowest top-level imports as
+JSON. Exits with status 1 when the median exceeds the budget.
+
+Usage: python -m benchmarks.import_time [--module main_with_auth] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+
+
+def measure_once(module: str) -> Tuple[float, Dict[str, float]]:
+    """Import the module in a fresh interpreter; return total ms and per-import ms"""
+    env = dict(os.environ)
+    # Importing must not require a live database; the engine connects lazily
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = 0
+    top_level: Dict[str, float] = {}
+    children: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        # importtime indents nested imports by two spaces per level and
+        # prints a module's imports before the module itself
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                total_us = int(cumulative)
+                top_level = children
+            children = {}
+        elif depth == 1:
+            children[name] = int(cumulative) / 1000
+    return total_us / 1000, top_level
+
+
+def run(module: str, repeat: int, budget_ms: float, top: int) -> Dict:
+    totals: List[float] = []
+    breakdown: Dict[str, float] = {}
+    for _ in range(repeat):
+        total_ms, top_level = measure_once(module)
+        totals.append(total_ms)
+        for name, ms in top_level.items():
+            breakdown[name] = min(ms, breakdown.get(name, ms))
+
+    median_ms = statistics.median(totals)
+    slowest = sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "benchmark": "import_time",
+        "module": module,
+        "python": sys.version.split()[0],
+        "runs": repeat,
+        "medianMs": round(median_ms, 1),
+        "minMs": round(min(totals), 1),
+        "maxMs": round(max(totals), 1),
+        "budgetMs": budget_ms,
+        "withinBudget": median_ms <= budget_ms,
+        "slowestImports": [{"module": name, "ms": round(ms, 1)} for name, ms in slowest],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main_with_auth")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.module, args.repeat, args.budget_ms, args.top)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+    print(payload)
+    return 0 if report["withinBudget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
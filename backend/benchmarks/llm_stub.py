@@ -0,0 +1,132 @@
+"""
+Minimal OpenAI-compatible chat completions server for load tests.
+
+Answers POST /v1/chat/completions (plain and streamed) with a canned analysis
+after a configurable delay, so load tests exercise the LLM code paths without
+calling OpenAI.
+
+Usage: python -m benchmarks.llm_stub [--port 18080] [--latency-ms 800]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DEFAULT_PORT = 18080
+DEFAULT_LATENCY_MS = 800.0
+CANNED_SUMMARY = (
+    "1. Executive Summary: the backlog is led by high-value, low-risk features.\n"
+    "2. Top Priorities: ship authentication and security fixes first.\n"
+    "3. Risks & Mitigations: schedule high-cost items after discovery spikes.\n"
+    "4. Dependencies & Sequencing: platform work precedes reporting features.\n"
+    "5. Next Steps: confirm estimates with the delivery team."
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_seconds = DEFAULT_LATENCY_MS / 1000
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 (signature from the base class)
+        pass
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        model = body.get("model", "stub")
+        time.sleep(self.latency_seconds)
+
+        if body.get("stream"):
+            self._stream(model)
+            return
+
+        payload = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": CANNED_SUMMARY},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, model: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for line in CANNED_SUMMARY.splitlines(keepends=True):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": line}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class LLMStubServer:
+    """Run the stub in a background thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, latency_ms: float = DEFAULT_LATENCY_MS) -> None:
+        handler = type("StubHandler", (_Handler,), {"latency_seconds": latency_ms / 1000})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "LLMStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    args = parser.parse_args()
+
+    stub = LLMStubServer(args.host, args.port, args.latency_ms)
+    print(f"LLM stub listening on {stub.base_url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+End-to-end load test for the authenticated API (main_with_auth).
+
+Each virtual user registers, logs in and then repeats the full workflow:
+upload a CSV, run the prioritization, poll the stored results, queue an LLM
+analysis and poll it to completion, and export CSV and PDF reports. Reports
+throughput plus p50/p95/p99 latency per route as JSON.
+
+The LLM analysis step needs an admin account (--admin-username/--admin-password)
+so the harness can point the LLM configuration at its built-in stub server
+(benchmarks.llm_stub); without one the step is skipped. Run it against a
+scratch deployment: it creates users and sessions and replaces the LLM config.
+
+Usage: python -m benchmarks.load_test --base-url http://localhost:8000 --users 20 --iterations 5
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.llm_stub import DEFAULT_LATENCY_MS, LLMStubServer
+from benchmarks.services import generate_requirements_csv
+
+DEFAULT_BASE_URL = os.getenv("LOAD_TEST_BASE_URL", "http://localhost:8000")
+POLL_INTERVAL_SECONDS = 0.25
+ANALYSIS_TIMEOUT_SECONDS = 120.0
+PASSWORD = "load-test-password"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class LoadRecorder:
+    """Collect per-route latencies and failures"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.flows_completed = 0
+        self.flows_failed = 0
+
+    def summary(self) -> Dict[str, Dict]:
+        routes = {}
+        for route in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies.get(route, [])
+            routes[route] = {
+                "count": len(values),
+                "errors": self.errors.get(route, 0),
+                "meanMs": round(statistics.fmean(values), 2) if values else None,
+                "p50Ms": round(percentile(values, 50), 2) if values else None,
+                "p95Ms": round(percentile(values, 95), 2) if values else None,
+                "p99Ms": round(percentile(values, 99), 2) if values else None,
+                "maxMs": round(max(values), 2) if values else None,
+            }
+        return routes
+
+
+class VirtualUser:
+    """One simulated client running the upload → analyze → export workflow"""
+
+    def __init__(self, client, recorder: LoadRecorder, csv_content: bytes, llm_enabled: bool) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.csv_content = csv_content
+        self.llm_enabled = llm_enabled
+        self.headers: Dict[str, str] = {}
+
+    async def request(self, route: str, method: str, url: str, expected: int = 200, **kwargs):
+        """Send a request and record it under its route template"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except Exception:
+            self.recorder.errors[route] += 1
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if response.status_code != expected:
+            self.recorder.errors[route] += 1
+            raise RuntimeError(f"{route} returned {response.status_code}: {response.text[:200]}")
+        self.recorder.latencies[route].append(elapsed_ms)
+        return response
+
+    async def login(self, username: str) -> None:
+        await self.request("POST /auth/register", "POST", "/auth/register", json={
+            "email": f"{username}@loadtest.example.com",
+            "username": username,
+            "password": PASSWORD,
+        })
+        response = await self.request("POST /auth/login", "POST", "/auth/login", json={
+            "username": username,
+            "password": PASSWORD,
+        })
+        self.headers = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+
+    async def run_flow(self) -> None:
+        response = await self.request(
+            "POST /requirements/upload", "POST", "/requirements/upload",
+            files={"file": ("requirements.csv", self.csv_content, "text/csv")},
+        )
+        session_id = response.json()["sessionId"]
+
+        await self.request("POST /prioritization/analyze", "POST", "/prioritization/analyze", json={
+            "sessionId": session_id,
+        })
+        await self.request("GET /prioritization/{sessionId}", "GET", f"/prioritization/{session_id}")
+
+        if self.llm_enabled:
+            await self.run_analysis(session_id)
+
+        await self.request("GET /export/csv/{sessionId}", "GET", f"/export/csv/{session_id}")
+        await self.request("GET /export/pdf/{sessionId}", "GET", f"/export/pdf/{session_id}")
+
+    async def run_analysis(self, session_id: str) -> None:
+        start = time.perf_counter()
+        response = await self.request(
+            "POST /prioritization/chatgpt/jobs", "POST", "/prioritization/chatgpt/jobs",
+            expected=202, json={"sessionId": session_id, "bypassCache": True},
+        )
+        analysis_id = response.json()["id"]
+
+        while time.perf_counter() - start < ANALYSIS_TIMEOUT_SECONDS:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            response = await self.request("GET /analyses/{analysisId}", "GET", f"/analyses/{analysis_id}")
+            status = response.json()["status"]
+            if status == "completed":
+                # Queue-to-result time as seen by a polling client
+                self.recorder.latencies["analysis job (end to end)"].append((time.perf_counter() - start) * 1000)
+                return
+            if status == "failed":
+                self.recorder.errors["analysis job (end to end)"] += 1
+                raise RuntimeError(f"Analysis {analysis_id} failed: {response.json().get('error')}")
+
+        self.recorder.errors["analysis job (end to end)"] += 1
+        raise RuntimeError(f"Analysis {analysis_id} did not finish within {ANALYSIS_TIMEOUT_SECONDS}s")
+
+
+async def configure_llm(client, admin_username: str, admin_password: str, stub_url: str) -> None:
+    """Point the server's LLM configuration at the stub"""
+    response = await client.post("/auth/login", json={"username": admin_username, "password": admin_password})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+    response = await client.put("/admin/llm-config", headers=headers, json={
+        "apiKey": "load-test",
+        "baseUrl": stub_url,
+        "model": "load-test-stub",
+    })
+    response.raise_for_status()
+
+
+async def run(
+    base_url: str,
+    users: int,
+    iterations: int,
+    duration: Optional[float],
+    rows: int,
+    admin_username: Optional[str],
+    admin_password: Optional[str],
+    stub_host: str,
+    stub_port: int,
+    stub_latency_ms: float,
+) -> Dict:
+    import httpx
+
+    recorder = LoadRecorder()
+    csv_content = generate_requirements_csv(rows)
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+    stub = None
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=httpx.Timeout(60.0)) as client:
+        llm_enabled = bool(admin_username and admin_password)
+        if llm_enabled:
+            stub = LLMStubServer(stub_host, stub_port, stub_latency_ms).start()
+            await configure_llm(client, admin_username, admin_password, stub.base_url)
+
+        run_id = uuid.uuid4().hex[:8]
+        virtual_users = [VirtualUser(client, recorder, csv_content, llm_enabled) for _ in range(users)]
+        await asyncio.gather(*(
+            user.login(f"load-{run_id}-{index}") for index, user in enumerate(virtual_users)
+        ))
+
+        async def drive(user: VirtualUser, deadline: Optional[float]) -> None:
+            completed = 0
+            while (completed < iterations) if deadline is None else (time.perf_counter() < deadline):
+                try:
+                    await user.run_flow()
+                    recorder.flows_completed += 1
+                except Exception:
+                    recorder.flows_failed += 1
+                completed += 1
+
+        # Registration and login are reported per route but excluded from throughput
+        setup_requests = sum(len(values) for values in recorder.latencies.values())
+        start = time.perf_counter()
+        deadline = start + duration if duration else None
+        await asyncio.gather(*(drive(user, deadline) for user in virtual_users))
+        elapsed = time.perf_counter() - start
+
+    if stub:
+        stub.stop()
+
+    routes = recorder.summary()
+    total_requests = sum(
+        stats["count"] for route, stats in routes.items() if not route.startswith("analysis job")
+    ) - setup_requests
+    return {
+        "benchmark": "load_test",
+        "baseUrl": base_url,
+        "users": users,
+        "iterations": None if duration else iterations,
+        "durationSeconds": round(elapsed, 2),
+        "rowsPerUpload": rows,
+        "llmStub": {"enabled": llm_enabled, "latencyMs": stub_latency_ms if llm_enabled else None},
+        "requests": total_requests,
+        "throughputRps": round(total_requests / elapsed, 2) if elapsed else None,
+        "flowsCompleted": recorder.flows_completed,
+        "flowsFailed": recorder.flows_failed,
+        "flowsPerSecond": round(recorder.flows_completed / elapsed, 3) if elapsed else None,
+        "routes": routes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=5, help="Workflows per user")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a fixed iteration count")
+    parser.add_argument("--rows", type=int, default=100, help="Requirements per uploaded CSV")
+    parser.add_argument("--admin-username", default=os.getenv("LOAD_TEST_ADMIN_USERNAME"))
+    parser.add_argument("--admin-password", default=os.getenv("LOAD_TEST_ADMIN_PASSWORD"))
+    parser.add_argument("--stub-host", default="127.0.0.1",
+                        help="Address the API server can reach the LLM stub on")
+    parser.add_argument("--stub-port", type=int, default=18080)
+    parser.add_argument("--stub-latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(
+        args.base_url,
+        args.users,
+        args.iterations,
+        args.duration,
+        args.rows,
+        args.admin_username,
+        args.admin_password,
+        args.stub_host,
+        args.stub_port,
+        args.stub_latency_ms,
+    ))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+    print(payload)
+    return 0 if report["flowsFailed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Service benchmark: time the hot paths of the backend services on synthetic data.
+
+Generates requirement sets of the requested sizes from sample_requirements.csv
+and times FileService.parse_requirements, PrioritizationService.prioritize_requirements
+(plus every ranking method on compact records), every ExportService format and the DatabaseService save/load paths (SQLite, plus
+Postgres when BENCH_POSTGRES_URL or --postgres-url is set). The report is JSON so
+runs from different versions can be diffed; --baseline marks regressions.
+
+Usage: python -m benchmarks.services [--sizes 100,1000,10000] [--baseline previous.json]
+
+BENCH_POSTGRES_URL must point to a scratch database: the schema is created if
+missing and the benchmark user and its sessions are deleted afterwards.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# The service modules import the shared database package, which must not try
+# to reach the default Postgres server just because it was imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_FILE = BACKEND_DIR / "sample_requirements.csv"
+SCORE_FIELDS = ["businessValue", "cost", "risk", "urgency", "stakeholderValue"]
+DEFAULT_SIZES = "100,1000,10000"
+# Rendering and row-by-row inserts grow linearly and dominate the run time, so
+# the larger sizes only exercise parsing and scoring unless raised explicitly
+DEFAULT_MAX_EXPORT_ROWS = 10000
+DEFAULT_MAX_DB_ROWS = 10000
+REGRESSION_THRESHOLD = 1.2
+
+
+def generate_requirements_csv(rows: int, seed: int = 42) -> bytes:
+    """Build a CSV with `rows` requirements modelled on the sample file"""
+    with open(SAMPLE_FILE, newline="", encoding="utf-8") as handle:
+        templates = list(csv.DictReader(handle))
+
+    rng = random.Random(seed)
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(templates[0].keys()))
+    writer.writeheader()
+    for index in range(rows):
+        row = dict(templates[index % len(templates)])
+        row["id"] = f"req-{index + 1:07d}"
+        row["title"] = f"{row['title']} #{index // len(templates) + 1}"
+        for field in SCORE_FIELDS:
+            # Keep the sample's shape but vary it, leaving ~5% of scores empty
+            row[field] = "" if rng.random() < 0.05 else rng.randint(1, 10)
+        writer.writerow(row)
+    return output.getvalue().encode("utf-8")
+
+
+def time_call(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Run func `repeat` times and summarise the wall time in milliseconds"""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "medianMs": round(statistics.median(timings), 2),
+        "minMs": round(min(timings), 2),
+        "maxMs": round(max(timings), 2),
+        "runs": repeat,
+    }
+
+
+def _result(name: str, rows: int, stats: Dict[str, float], **extra) -> Dict:
+    rows_per_second = rows / (stats["medianMs"] / 1000) if stats["medianMs"] else None
+    return {
+        "name": name,
+        "rows": rows,
+        **extra,
+        **stats,
+        "rowsPerSecond": round(rows_per_second) if rows_per_second else None,
+    }
+
+
+def bench_services(rows: int, repeat: int, max_export_rows: int) -> List[Dict]:
+    """Parse, prioritize and export a synthetic set of `rows` requirements"""
+    from models.requirement import RankingMethod
+    from services.export_service import ExportService
+    from services.file_service import FileService
+    from services.prioritization_service import PrioritizationService
+
+    file_service = FileService()
+    prioritization_service = PrioritizationService()
+    export_service = ExportService()
+    # Template compilation and font loading happen once at app start-up
+    export_service.warm_up()
+
+    content = generate_requirements_csv(rows)
+    requirements = file_service.parse_requirements(content, "benchmark.csv")
+    records = file_service.parse_records(content, "benchmark.csv")
+    prioritized = prioritization_service.prioritize_requirements(requirements)
+
+    results = [
+        _result("parse_csv", rows, time_call(
+            lambda: file_service.parse_requirements(content, "benchmark.csv"), repeat
+        )),
+        _result("prioritize", rows, time_call(
+            lambda: prioritization_service.prioritize_requirements(requirements), repeat
+        )),
+    ]
+    for method in RankingMethod:
+        results.append(_result(f"rank_{method.value}", rows, time_call(
+            lambda: prioritization_service.prioritize_records(records, None, method), repeat
+        )))
+    if rows > max_export_rows:
+        return results
+
+    session_id = "benchmark"
+    results.extend([
+        _result("export_csv", rows, time_call(
+            lambda: export_service.generate_csv(prioritized), repeat
+        )),
+        _result("export_html", rows, time_call(
+            lambda: export_service.generate_html(prioritized, session_id), repeat
+        )),
+        _result("export_pdf", rows, time_call(
+            lambda: export_service.generate_pdf(prioritized, session_id), repeat
+        )),
+    ])
+    return results
+
+
+def bench_database(url: str, backend: str, rows: int, repeat: int) -> List[Dict]:
+    """Time DatabaseService save/load round trips against the given database"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from database.database import Base
+    from database.models import User
+    import database.models  # noqa: F401  (registers all tables on Base.metadata)
+    from services.database_service import DatabaseService
+    from services.file_service import FileService
+    from services.prioritization_service import PrioritizationService
+
+    requirements = FileService().parse_requirements(generate_requirements_csv(rows), "benchmark.csv")
+    prioritized = PrioritizationService().prioritize_requirements(requirements)
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = BenchSession()
+
+    suffix = uuid.uuid4().hex[:12]
+    user = User(
+        email=f"bench-{suffix}@example.com",
+        username=f"bench-{suffix}",
+        hashed_password="!",
+    )
+    db.add(user)
+    db.commit()
+
+    # Every run writes into a fresh session so the timings never include deletes
+    session_ids: List[str] = []
+
+    def save_requirements() -> None:
+        session = DatabaseService.create_session(db, user.id, "benchmark")
+        session_ids.append(session.id)
+        DatabaseService.save_requirements(db, session.id, requirements)
+
+    def save_prioritized() -> None:
+        DatabaseService.save_prioritized_requirements(db, session_ids[-1], prioritized)
+
+    try:
+        results = [
+            _result("db_save_requirements", rows, time_call(save_requirements, repeat), backend=backend),
+            _result("db_save_prioritized", rows, time_call(save_prioritized, repeat), backend=backend),
+            _result("db_get_requirements", rows, time_call(
+                lambda: DatabaseService.get_requirements(db, session_ids[-1]), repeat
+            ), backend=backend),
+            _result("db_get_prioritized", rows, time_call(
+                lambda: DatabaseService.get_prioritized_requirements(db, session_ids[-1]), repeat
+            ), backend=backend),
+        ]
+    finally:
+        db.rollback()
+        db.delete(db.get(User, user.id))
+        db.commit()
+        db.close()
+        engine.dispose()
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[Dict]:
+    """Annotate results with the ratio against a previous report"""
+    previous = {
+        (item["name"], item["rows"], item.get("backend")): item["medianMs"]
+        for item in baseline.get("results", [])
+    }
+    regressions = []
+    for item in results:
+        before = previous.get((item["name"], item["rows"], item.get("backend")))
+        if not before:
+            continue
+        item["baselineMs"] = before
+        item["ratio"] = round(item["medianMs"] / before, 2)
+        if item["ratio"] > threshold:
+            regressions.append({"name": item["name"], "rows": item["rows"], "backend": item.get("backend"), "ratio": item["ratio"]})
+    return regressions
+
+
+def run(
+    sizes: List[int],
+    repeat: int,
+    max_export_rows: int,
+    max_db_rows: int,
+    postgres_url: Optional[str],
+    skip_db: bool,
+) -> Dict:
+    results: List[Dict] = []
+    for rows in sizes:
+        results.extend(bench_services(rows, repeat, max_export_rows))
+
+    if not skip_db:
+        databases = []
+        with tempfile.TemporaryDirectory() as tmp:
+            databases.append(("sqlite", f"sqlite:///{Path(tmp) / 'benchmark.db'}"))
+            if postgres_url:
+                databases.append(("postgresql", postgres_url))
+            for backend, url in databases:
+                for rows in sizes:
+                    if rows <= max_db_rows:
+                        results.extend(bench_database(url, backend, rows, repeat))
+
+    return {
+        "benchmark": "services",
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "sizes": sizes,
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma separated row counts, e.g. 100,1000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-export-rows", type=int, default=DEFAULT_MAX_EXPORT_ROWS)
+    parser.add_argument("--max-db-rows", type=int, default=DEFAULT_MAX_DB_ROWS)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    parser.add_argument("--skip-db", action="store_true")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Median ratio above which a result counts as a regression")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run(sizes, args.repeat, args.max_export_rows, args.max_db_rows, args.postgres_url, args.skip_db)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        report["baselineRevision"] = baseline.get("revision")
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+    print(payload)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
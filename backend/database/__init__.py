@@ -3,7 +3,11 @@ Database configuration and models
 """
 
 from .database import get_db, engine, Base
-from .models import User, Session, Requirement as DBRequirement, PrioritizedRequirement as DBPrioritizedRequirement, LLMConfig
+from .models import (
+    User, Session, Requirement as DBRequirement, PrioritizedRequirement as DBPrioritizedRequirement,
+    LLMConfig, Analysis, RequirementDependency, RequirementSignature, RequirementSignatureBand,
+    WeightProfile, Scenario, ScenarioResult,
+)
 
 __all__ = [
     "get_db", 
@@ -13,5 +17,12 @@ __all__ = [
     "Session", 
     "DBRequirement",
     "DBPrioritizedRequirement",
-    "LLMConfig"
+    "LLMConfig",
+    "Analysis",
+    "RequirementDependency",
+    "RequirementSignature",
+    "RequirementSignatureBand",
+    "WeightProfile",
+    "Scenario",
+    "ScenarioResult"
 ]
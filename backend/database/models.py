@@ -2,7 +2,7 @@
 SQLAlchemy database models
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, UniqueConstraint, LargeBinary, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -41,6 +41,10 @@ class Session(Base):
     user = relationship("User", back_populates="sessions")
     requirements = relationship("Requirement", back_populates="session", cascade="all, delete-orphan")
     prioritized_requirements = relationship("PrioritizedRequirement", back_populates="session", cascade="all, delete-orphan")
+    analyses = relationship("Analysis", back_populates="session", cascade="all, delete-orphan")
+    dependencies = relationship("RequirementDependency", back_populates="session", cascade="all, delete-orphan")
+    scenarios = relationship("Scenario", back_populates="session", cascade="all, delete-orphan")
+    signatures = relationship("RequirementSignature", back_populates="session", cascade="all, delete-orphan")
 
 
 class Requirement(Base):
@@ -76,6 +80,7 @@ class PrioritizedRequirement(Base):
     rank = Column(Integer, nullable=False)
     confidence = Column(Float, nullable=True)
     reasoning = Column(Text, nullable=True)
+    contributions = Column(JSON, nullable=True)  # Score points per criterion
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -83,6 +88,104 @@ class PrioritizedRequirement(Base):
     requirement = relationship("Requirement", back_populates="prioritized_requirements")
 
 
+class RequirementDependency(Base):
+    """Dependency edge between two requirements of a session (by external ID)"""
+    __tablename__ = "requirement_dependencies"
+    __table_args__ = (
+        UniqueConstraint("session_id", "requirement_id", "depends_on", name="uq_requirement_dependency"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False, index=True)
+    requirement_id = Column(String, nullable=False)  # External ID of the dependent requirement
+    depends_on = Column(String, nullable=False)  # External ID of the prerequisite
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    session = relationship("Session", back_populates="dependencies")
+
+
+class RequirementSignature(Base):
+    """MinHash signature of a requirement's text, for near-duplicate detection"""
+    __tablename__ = "requirement_signatures"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False, index=True)
+    requirement_id = Column(String, nullable=False)  # External ID of the requirement
+    title = Column(String, nullable=False)
+    signature = Column(LargeBinary, nullable=False)  # Little-endian uint32 minimum hashes
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    session = relationship("Session", back_populates="signatures")
+    bands = relationship("RequirementSignatureBand", back_populates="signature", cascade="all, delete-orphan")
+
+
+class RequirementSignatureBand(Base):
+    """LSH bucket of one signature band; equal buckets mark candidate duplicates"""
+    __tablename__ = "requirement_signature_bands"
+    __table_args__ = (
+        Index("ix_requirement_signature_bands_user_bucket", "user_id", "bucket"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    signature_id = Column(String, ForeignKey("requirement_signatures.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    bucket = Column(String, nullable=False)  # "<band>:<hash of the band's rows>"
+    
+    # Relationships
+    signature = relationship("RequirementSignature", back_populates="bands")
+
+
+class WeightProfile(Base):
+    """Named scoring weights saved by a user (e.g. one per team)"""
+    __tablename__ = "weight_profiles"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_weight_profile_name"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    weights = Column(JSON, nullable=False)  # Weights fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class Scenario(Base):
+    """Ranking of a session under one set of weights, kept alongside its other scenarios"""
+    __tablename__ = "scenarios"
+    __table_args__ = (
+        UniqueConstraint("session_id", "name", name="uq_scenario_name"),
+    )
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    profile_id = Column(String, nullable=True)  # Weight profile the weights came from, if any
+    weights = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    session = relationship("Session", back_populates="scenarios")
+    results = relationship("ScenarioResult", back_populates="scenario", cascade="all, delete-orphan")
+
+
+class ScenarioResult(Base):
+    """Score and rank of one requirement in a scenario"""
+    __tablename__ = "scenario_results"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    scenario_id = Column(String, ForeignKey("scenarios.id", ondelete="CASCADE"), nullable=False, index=True)
+    requirement_id = Column(String, nullable=False)  # External ID of the requirement
+    priority_score = Column(Float, nullable=False)
+    rank = Column(Integer, nullable=False)
+    
+    # Relationships
+    scenario = relationship("Scenario", back_populates="results")
+
+
 class LLMConfig(Base):
     """LLM configuration model for storing API settings"""
     __tablename__ = "llm_config"
@@ -93,3 +196,24 @@ class LLMConfig(Base):
     model = Column(String, nullable=False, default="gpt-4o-mini")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class Analysis(Base):
+    """LLM analysis job and its persisted result"""
+    __tablename__ = "analyses"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    prompt = Column(Text, nullable=True)
+    model = Column(String, nullable=True)
+    summary = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Refreshed by the worker process holding the job; a stale value means the job was lost
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    session = relationship("Session", back_populates="analyses")
@@ -5,10 +5,9 @@ from fastapi.staticfiles import StaticFiles
 import uvicorn
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List
 import os
 import tempfile
-import pandas as pd
 from pathlib import Path
 
 from models import (
@@ -20,6 +19,8 @@ from models import (
 from services.prioritization_service import PrioritizationService
 from services.file_service import FileService
 from services.export_service import ExportService
+from services.dependency_graph import DependencyGraph
+from services.session_store import SessionData, create_session_store
 
 app = FastAPI(
     title="ARIA - Advanced Requirements Intelligence & Analytics API",
@@ -43,7 +44,22 @@ prioritization_service = PrioritizationService()
 file_service = FileService()
 export_service = ExportService()
 
-sessions: Dict[str, Dict[str, Any]] = {}
+# Bounded session storage; ARIA_SESSION_STORE=redis shares sessions between workers
+session_store = create_session_store()
+
+
+def _get_session(session_id: str) -> SessionData:
+    session = session_store.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="SESSION_NOT_FOUND",
+                message="Session not found"
+            ).dict()
+        )
+    return session
+
 
 @app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
@@ -77,13 +93,11 @@ async def upload_requirements(file: UploadFile = File(...)):
                     message="Maximum 100 requirements allowed"
                 ).dict()
             )
+        # Unknown prerequisite IDs and dependency cycles are rejected
+        DependencyGraph.from_records(requirements)
         
         session_id = str(uuid.uuid4())
-        sessions[session_id] = {
-            "requirements": requirements,
-            "created_at": datetime.now(),
-            "prioritized_requirements": None
-        }
+        session_store.save(session_id, SessionData(requirements=requirements))
         
         return UploadResponse(
             sessionId=session_id,
@@ -112,13 +126,10 @@ async def create_requirements(request: CreateRequirementsRequest):
                     message="Maximum 100 requirements allowed"
                 ).dict()
             )
+        DependencyGraph.from_records(request.requirements)
         
         session_id = str(uuid.uuid4())
-        sessions[session_id] = {
-            "requirements": request.requirements,
-            "created_at": datetime.now(),
-            "prioritized_requirements": None
-        }
+        session_store.save(session_id, SessionData(requirements=request.requirements))
         
         return CreateRequirementsResponse(
             sessionId=session_id,
@@ -137,33 +148,17 @@ async def create_requirements(request: CreateRequirementsRequest):
 
 @app.get("/requirements", response_model=RequirementsList, tags=["requirements"])
 async def get_requirements(sessionId: str):
-    if sessionId not in sessions:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found"
-            ).dict()
-        )
-    
+    session = _get_session(sessionId)
     return RequirementsList(
         sessionId=sessionId,
-        requirements=sessions[sessionId]["requirements"]
+        requirements=session.requirements
     )
 
 @app.post("/prioritization/analyze", response_model=PrioritizationResponse, tags=["prioritization"])
 async def analyze_prioritization(request: PrioritizationRequest):
     try:
-        if request.sessionId not in sessions:
-            raise HTTPException(
-                status_code=404,
-                detail=Error(
-                    error="SESSION_NOT_FOUND",
-                    message="Session not found"
-                ).dict()
-            )
-        
-        requirements = sessions[request.sessionId]["requirements"]
+        session = _get_session(request.sessionId)
+        requirements = session.requirements
         if not requirements:
             raise HTTPException(
                 status_code=400,
@@ -177,11 +172,12 @@ async def analyze_prioritization(request: PrioritizationRequest):
         
         start_time = datetime.now()
         prioritized_requirements = prioritization_service.prioritize_requirements(
-            requirements, weights
+            requirements, weights, request.method, request.pairwiseComparisons
         )
         processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
         
-        sessions[request.sessionId]["prioritized_requirements"] = prioritized_requirements
+        session.prioritized_requirements = prioritized_requirements
+        session_store.save(request.sessionId, session)
         
         return PrioritizationResponse(
             sessionId=request.sessionId,
@@ -206,17 +202,8 @@ async def analyze_prioritization(request: PrioritizationRequest):
 
 @app.get("/prioritization/{sessionId}", response_model=PrioritizationResponse, tags=["prioritization"])
 async def get_prioritization(sessionId: str):
-    if sessionId not in sessions:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found"
-            ).dict()
-        )
-    
-    session = sessions[sessionId]
-    if not session["prioritized_requirements"]:
+    session = _get_session(sessionId)
+    if not session.prioritized_requirements:
         raise HTTPException(
             status_code=404,
             detail=Error(
@@ -227,11 +214,11 @@ async def get_prioritization(sessionId: str):
     
     return PrioritizationResponse(
         sessionId=sessionId,
-        prioritizedRequirements=session["prioritized_requirements"],
+        prioritizedRequirements=session.prioritized_requirements,
         processingTimeMs=0,
         metadata={
-            "totalRequirements": len(session["requirements"]),
-            "averageScore": sum(r.priorityScore for r in session["prioritized_requirements"]) / len(session["prioritized_requirements"]),
+            "totalRequirements": len(session.requirements),
+            "averageScore": sum(r.priorityScore for r in session.prioritized_requirements) / len(session.prioritized_requirements),
             "modelVersion": "1.0.0",
             "weightsUsed": {}
         }
@@ -239,17 +226,8 @@ async def get_prioritization(sessionId: str):
 
 @app.get("/export/csv/{sessionId}", tags=["export"])
 async def export_csv(sessionId: str):
-    if sessionId not in sessions:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found"
-            ).dict()
-        )
-    
-    session = sessions[sessionId]
-    if not session["prioritized_requirements"]:
+    session = _get_session(sessionId)
+    if not session.prioritized_requirements:
         raise HTTPException(
             status_code=404,
             detail=Error(
@@ -258,7 +236,7 @@ async def export_csv(sessionId: str):
             ).dict()
         )
     
-    csv_content = export_service.generate_csv(session["prioritized_requirements"])
+    csv_content = export_service.generate_csv(session.prioritized_requirements)
     
     with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
         f.write(csv_content)
@@ -272,17 +250,8 @@ async def export_csv(sessionId: str):
 
 @app.get("/export/html/{sessionId}", response_class=HTMLResponse, tags=["export"])
 async def export_html(sessionId: str):
-    if sessionId not in sessions:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found"
-            ).dict()
-        )
-    
-    session = sessions[sessionId]
-    if not session["prioritized_requirements"]:
+    session = _get_session(sessionId)
+    if not session.prioritized_requirements:
         raise HTTPException(
             status_code=404,
             detail=Error(
@@ -291,22 +260,13 @@ async def export_html(sessionId: str):
             ).dict()
         )
     
-    html_content = export_service.generate_html(session["prioritized_requirements"], sessionId)
+    html_content = export_service.generate_html(session.prioritized_requirements, sessionId)
     return HTMLResponse(content=html_content)
 
 @app.get("/export/pdf/{sessionId}", tags=["export"])
 async def export_pdf(sessionId: str):
-    if sessionId not in sessions:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found"
-            ).dict()
-        )
-    
-    session = sessions[sessionId]
-    if not session["prioritized_requirements"]:
+    session = _get_session(sessionId)
+    if not session.prioritized_requirements:
         raise HTTPException(
             status_code=404,
             detail=Error(
@@ -315,7 +275,7 @@ async def export_pdf(sessionId: str):
             ).dict()
         )
     
-    pdf_content = export_service.generate_pdf(session["prioritized_requirements"], sessionId)
+    pdf_content = export_service.generate_pdf(session.prioritized_requirements, sessionId)
     
     with tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False) as f:
         f.write(pdf_content)
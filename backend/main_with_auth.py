@@ -5,18 +5,20 @@ AI-powered requirements prioritization tool
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, status, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import uuid
+import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
 import os
 import tempfile
 import logging
-import pandas as pd
 from pathlib import Path
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 from models import (
     Requirement, PrioritizedRequirement, UploadResponse,
@@ -24,17 +26,74 @@ from models import (
     RequirementsList, PrioritizationRequest, PrioritizationResponse,
     Error, HealthResponse, Weights, SessionSummary, SessionsResponse,
     SessionDetails, ChatGPTAnalysisRequest, ChatGPTAnalysisResponse,
-    LLMConfigRequest, LLMConfigResponse, ExportRequest
+    LLMConfigRequest, LLMConfigResponse, ExportRequest,
+    AnalysisResponse, AnalysisHistoryResponse, ProfileSummary, ProfilesResponse,
+    RequirementRecord, PrioritizedRecord, ReleasePlanRequest, ReleasePlanResponse, ParetoResponse,
+    DependencyEdge, DependenciesResponse, DuplicateCluster, PriorDuplicate, DuplicateReport,
+    SearchResponse, ThemesRequest, ThemesResponse, WeightProfileRequest, WeightProfile,
+    WeightProfilesResponse, ScenarioRequest, ScenariosResponse
 )
 from services.prioritization_service import PrioritizationService
 from services.file_service import FileService
 from services.export_service import ExportService
 from services.database_service import DatabaseService
-from services.analysis_service import AnalysisService
-from services.llm_config_service import LLMConfigService
-from database import get_db, engine, Base
+from services.release_planning_service import ReleasePlanningService
+from services.pareto_service import ParetoService, MAXIMIZE
+from services.dependency_graph import DependencyGraph, DependencyCycleError
+from services.duplicate_service import DuplicateDetectionService
+from services.search_service import SearchService
+from services.clustering_service import ClusteringService
+from services.scenario_service import ScenarioService, MAX_SCENARIOS
+from models.compact import SCORE_FIELDS
+from services.analysis_job_service import AnalysisJobService
+from services.llm_cache_service import LLMResponseCache
+from services.llm_client_registry import LLMClientRegistry
+from services.llm_config_service import LLMConfigService, LLMConfigSnapshot
+from database import get_db, engine, Analysis
+from database.database import SessionLocal
 from auth import AuthService, get_current_user, get_current_admin_user, UserCreate, UserLogin, Token, UserResponse
 from database.models import User
+from resources import AppResources
+from metrics import MetricsMiddleware, StageTimer, render_metrics, METRICS_CONTENT_TYPE
+from profiling import ProfileStore, ProfilingMiddleware, render_pstats
+from serialization import ORJSONResponse, add_compression
+
+# Initialize services
+prioritization_service = PrioritizationService()
+file_service = FileService()
+export_service = ExportService()
+database_service = DatabaseService()
+release_planning_service = ReleasePlanningService()
+pareto_service = ParetoService()
+duplicate_service = DuplicateDetectionService()
+search_service = SearchService()
+clustering_service = ClusteringService()
+scenario_service = ScenarioService()
+llm_config_service = LLMConfigService()
+# AnalysisService instances are cached per LLM config and rebuilt when it changes
+llm_client_registry = LLMClientRegistry(response_cache=LLMResponseCache())
+analysis_job_service = AnalysisJobService(llm_config_service, llm_client_registry)
+# Cached LLM clients are rebuilt whenever any worker changes the LLM config
+llm_config_service.add_listener(llm_client_registry.invalidate)
+
+# Pools, warm caches and background workers shared by all requests
+resources = AppResources(
+    engine=engine,
+    llm_client_registry=llm_client_registry,
+    analysis_job_service=analysis_job_service,
+    export_service=export_service,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared resources on start; drain them on shutdown (SIGTERM)"""
+    await resources.startup()
+    try:
+        yield
+    finally:
+        await resources.shutdown()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,7 +103,8 @@ app = FastAPI(
     contact={
         "name": "ARIA Team",
         "email": "support@aria-app.com"
-    }
+    },
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -56,27 +116,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-prioritization_service = PrioritizationService()
-file_service = FileService()
-export_service = ExportService()
-database_service = DatabaseService()
-llm_config_service = LLMConfigService()
-# AnalysisService will be initialized dynamically with config from DB
-analysis_service = None
+# gzip (or brotli) for large JSON and HTML payloads; see RESPONSE_COMPRESSION
+add_compression(app)
+
+# Record per-route latency histograms (exposed on /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in profiling (admin X-ARIA-Profile header or PROFILE_SAMPLE_RATE), see /admin/profiles
+profile_store = ProfileStore()
+app.add_middleware(ProfilingMiddleware, store=profile_store)
 
 # Initialize logger first
 logger = logging.getLogger("aria.backend")
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Run migrations
-try:
-    from migrations.add_admin_and_llm_config import run_migration
-    run_migration()
-except Exception as e:
-    logger.warning(f"Migration failed (may already be applied): {e}")
+# Schema creation and migrations are a separate one-shot step: `python -m migrations`
 
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
@@ -151,10 +204,40 @@ async def health_check():
         version="1.0.0"
     )
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: route latency, pipeline stage timings and cache hit rates"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # ============================================================================
 # REQUIREMENTS ENDPOINTS
 # ============================================================================
 
+def _check_duplicates(db: Session, user_id: str, session_id: str, requirements) -> Optional[DuplicateReport]:
+    """Flag near-duplicate requirements; detection is best-effort and never fails the upload"""
+    try:
+        findings = duplicate_service.check_upload(db, user_id, session_id, requirements)
+    except Exception:
+        logger.exception("Duplicate detection failed for session %s", session_id)
+        db.rollback()
+        return None
+    return DuplicateReport(
+        clusters=[
+            DuplicateCluster(requirementIds=group.requirement_ids, similarity=group.similarity)
+            for group in findings.clusters
+        ],
+        priorMatches=[
+            PriorDuplicate(
+                requirementId=match.requirement_id,
+                matchSessionId=match.match_session_id,
+                matchRequirementId=match.match_requirement_id,
+                matchTitle=match.match_title,
+                similarity=match.similarity,
+            )
+            for match in findings.prior_matches
+        ],
+    )
+
 @app.post("/requirements/upload", response_model=UploadResponse, tags=["requirements"])
 async def upload_requirements(
     file: UploadFile = File(...),
@@ -162,6 +245,7 @@ async def upload_requirements(
     db: Session = Depends(get_db)
 ):
     """Upload requirements from CSV/Excel file"""
+    timer = StageTimer("upload")
     try:
         # Validate file type
         if not file.filename.lower().endswith(('.csv', '.xlsx', '.xls')):
@@ -177,30 +261,40 @@ async def upload_requirements(
         content = await file.read()
         
         # Parse requirements from file
-        requirements = file_service.parse_requirements(content, file.filename)
+        with timer.stage("parse"):
+            requirements = file_service.parse_records(content, file.filename)
         
         # Validate requirements count
-        if len(requirements) > 100:
-            raise HTTPException(
-                status_code=413,
-                detail=Error(
-                    error="FILE_TOO_LARGE",
-                    message="Maximum 100 requirements allowed"
-                ).dict()
-            )
+        with timer.stage("validate"):
+            if len(requirements) > 100:
+                raise HTTPException(
+                    status_code=413,
+                    detail=Error(
+                        error="FILE_TOO_LARGE",
+                        message="Maximum 100 requirements allowed"
+                    ).dict()
+                )
+            # Unknown prerequisite IDs and dependency cycles are rejected
+            DependencyGraph.from_records(requirements)
         
-        # Create session in database
-        db_session = database_service.create_session(db, current_user.id)
+        with timer.stage("persist"):
+            # Create session in database
+            db_session = database_service.create_session(db, current_user.id)
+            
+            # Save requirements to database
+            database_service.save_requirements(db, db_session.id, requirements)
         
-        # Save requirements to database
-        database_service.save_requirements(db, db_session.id, requirements)
+        with timer.stage("duplicates"):
+            duplicates = _check_duplicates(db, current_user.id, db_session.id, requirements)
         
-        return UploadResponse(
-            sessionId=db_session.id,
-            requirementsCount=len(requirements),
-            message=f"Successfully uploaded {len(requirements)} requirements",
-            requirements=requirements
-        )
+        with timer.stage("serialize"):
+            return ORJSONResponse({
+                "sessionId": db_session.id,
+                "requirementsCount": len(requirements),
+                "message": f"Successfully uploaded {len(requirements)} requirements",
+                "requirements": requirements,
+                "duplicates": duplicates,
+            })
         
     except Exception as e:
         logger.exception("Upload requirements failed")
@@ -219,27 +313,35 @@ async def create_requirements(
     db: Session = Depends(get_db)
 ):
     """Create requirements manually"""
+    timer = StageTimer("create_requirements")
     try:
         # Validate requirements count
-        if len(request.requirements) > 100:
-            raise HTTPException(
-                status_code=400,
-                detail=Error(
-                    error="TOO_MANY_REQUIREMENTS",
-                    message="Maximum 100 requirements allowed"
-                ).dict()
-            )
+        with timer.stage("validate"):
+            if len(request.requirements) > 100:
+                raise HTTPException(
+                    status_code=400,
+                    detail=Error(
+                        error="TOO_MANY_REQUIREMENTS",
+                        message="Maximum 100 requirements allowed"
+                    ).dict()
+                )
+            DependencyGraph.from_records(request.requirements)
         
-        # Create session in database
-        db_session = database_service.create_session(db, current_user.id)
+        with timer.stage("persist"):
+            # Create session in database
+            db_session = database_service.create_session(db, current_user.id)
+            
+            # Save requirements to database
+            database_service.save_requirements(db, db_session.id, request.requirements)
         
-        # Save requirements to database
-        database_service.save_requirements(db, db_session.id, request.requirements)
+        with timer.stage("duplicates"):
+            duplicates = _check_duplicates(db, current_user.id, db_session.id, request.requirements)
         
         return CreateRequirementsResponse(
             sessionId=db_session.id,
             requirementsCount=len(request.requirements),
-            message=f"Successfully created {len(request.requirements)} requirements"
+            message=f"Successfully created {len(request.requirements)} requirements",
+            duplicates=duplicates
         )
         
     except Exception as e:
@@ -270,11 +372,51 @@ async def get_requirements(
             ).dict()
         )
     
-    requirements = database_service.get_requirements(db, sessionId)
-    return RequirementsList(
-        sessionId=sessionId,
-        requirements=requirements
-    )
+    requirements = database_service.get_requirement_records(db, sessionId)
+    return ORJSONResponse({"sessionId": sessionId, "requirements": requirements})
+
+@app.get("/search", response_model=SearchResponse, tags=["requirements"])
+async def search_requirements(
+    q: str,
+    sessionId: Optional[str] = None,
+    page: int = 1,
+    pageSize: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search across all of the user's requirements (ranked, paginated)"""
+    if not q.strip() or page < 1 or not 1 <= pageSize <= 100:
+        raise HTTPException(
+            status_code=400,
+            detail=Error(
+                error="INVALID_SEARCH",
+                message="q must not be empty, page must be at least 1 and pageSize between 1 and 100"
+            ).dict()
+        )
+
+    timer = StageTimer("search")
+    with timer.stage("query"):
+        try:
+            hits, total = search_service.search(db, current_user.id, q, page, pageSize, sessionId)
+        except (OperationalError, ProgrammingError):
+            logger.exception("Requirement search failed")
+            raise HTTPException(
+                status_code=503,
+                detail=Error(
+                    error="SEARCH_UNAVAILABLE",
+                    message="Full-text search is not set up; run `python -m migrations`"
+                ).dict()
+            )
+
+    with timer.stage("serialize"):
+        return ORJSONResponse({
+            "query": q,
+            "results": hits,
+            "total": total,
+            "page": page,
+            "pageSize": pageSize,
+            "processingTimeMs": timer.total_ms,
+        })
 
 # ============================================================================
 # PRIORITIZATION ENDPOINTS
@@ -287,19 +429,21 @@ async def analyze_prioritization(
     db: Session = Depends(get_db)
 ):
     """Analyze and prioritize requirements using AI"""
+    timer = StageTimer("analyze")
     try:
-        # Verify session belongs to user
-        session = database_service.get_session(db, request.sessionId, current_user.id)
-        if not session:
-            raise HTTPException(
-                status_code=404,
-                detail=Error(
-                    error="SESSION_NOT_FOUND",
-                    message="Session not found or access denied"
-                ).dict()
-            )
-        
-        requirements = database_service.get_requirements(db, request.sessionId)
+        with timer.stage("db_read"):
+            # Verify session belongs to user
+            session = database_service.get_session(db, request.sessionId, current_user.id)
+            if not session:
+                raise HTTPException(
+                    status_code=404,
+                    detail=Error(
+                        error="SESSION_NOT_FOUND",
+                        message="Session not found or access denied"
+                    ).dict()
+                )
+            
+            requirements = database_service.get_requirement_records(db, request.sessionId)
         if not requirements:
             raise HTTPException(
                 status_code=400,
@@ -313,26 +457,33 @@ async def analyze_prioritization(
         weights = request.weights if request.weights else Weights()
         
         # Perform prioritization
-        start_time = datetime.now()
-        prioritized_requirements = prioritization_service.prioritize_requirements(
-            requirements, weights
-        )
-        processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+        with timer.stage("score"):
+            prioritized_requirements, ranking_details = prioritization_service.rank_records(
+                requirements, weights, request.method, request.pairwiseComparisons,
+                request.simulations, request.scoreSpread, request.topK, request.includeReasoning,
+            )
         
         # Save results to database
-        database_service.save_prioritized_requirements(db, request.sessionId, prioritized_requirements)
+        with timer.stage("persist"):
+            database_service.save_prioritized_requirements(db, request.sessionId, prioritized_requirements)
         
-        return PrioritizationResponse(
-            sessionId=request.sessionId,
-            prioritizedRequirements=prioritized_requirements,
-            processingTimeMs=processing_time,
-            metadata={
-                "totalRequirements": len(requirements),
-                "averageScore": sum(r.priorityScore for r in prioritized_requirements) / len(prioritized_requirements),
-                "modelVersion": "1.0.0",
-                "weightsUsed": weights.model_dump() if hasattr(weights, 'model_dump') else weights.dict()
-            }
-        )
+        with timer.stage("serialize"):
+            return ORJSONResponse({
+                "sessionId": request.sessionId,
+                "prioritizedRequirements": prioritized_requirements,
+                # Covers DB read, scoring and persistence
+                "processingTimeMs": timer.total_ms,
+                "metadata": {
+                    "totalRequirements": len(requirements),
+                    "averageScore": sum(r.priorityScore for r in prioritized_requirements) / len(prioritized_requirements),
+                    "modelVersion": "1.0.0",
+                    "weightsUsed": weights.model_dump() if hasattr(weights, 'model_dump') else weights.dict(),
+                    **ranking_details,
+                    "stageTimingsMs": {
+                        stage: round(seconds * 1000, 2) for stage, seconds in timer.stages.items()
+                    }
+                }
+            })
         
     except Exception as e:
         raise HTTPException(
@@ -343,15 +494,103 @@ async def analyze_prioritization(
             ).dict()
         )
 
+def _load_prioritized_results(
+    db: Session, session_id: str, user_id: str, timer: StageTimer
+) -> List[PrioritizedRecord]:
+    """Load stored prioritization results for a user's session or raise the matching HTTP error"""
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, session_id, user_id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        prioritized_requirements = database_service.get_prioritized_records(db, session_id)
+    if not prioritized_requirements:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="NO_RESULTS",
+                message="No prioritization results found for this session"
+            ).dict()
+        )
+    return prioritized_requirements
+
 @app.get("/prioritization/{sessionId}", response_model=PrioritizationResponse, tags=["prioritization"])
 async def get_prioritization(
     sessionId: str,
+    includeReasoning: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get prioritization results for a session"""
-    # Verify session belongs to user
-    session = database_service.get_session(db, sessionId, current_user.id)
+    timer = StageTimer("get_prioritization")
+    prioritized_requirements = _load_prioritized_results(db, sessionId, current_user.id, timer)
+    if includeReasoning:
+        with timer.stage("reasoning"):
+            prioritization_service.add_reasoning(prioritized_requirements)
+    
+    with timer.stage("serialize"):
+        return ORJSONResponse({
+            "sessionId": sessionId,
+            "prioritizedRequirements": prioritized_requirements,
+            "processingTimeMs": timer.total_ms,  # Time to load the stored results
+            "metadata": {
+                "totalRequirements": len(prioritized_requirements),
+                "averageScore": sum(r.priorityScore for r in prioritized_requirements) / len(prioritized_requirements),
+                "modelVersion": "1.0.0",
+                "weightsUsed": {}
+            }
+        })
+
+
+@app.post("/prioritization/release-plan", response_model=ReleasePlanResponse, tags=["prioritization"])
+async def plan_releases(
+    request: ReleasePlanRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Select the highest-scoring requirements that fit a cost budget (0/1 knapsack per release)"""
+    timer = StageTimer("release_plan")
+    prioritized_requirements = _load_prioritized_results(db, request.sessionId, current_user.id, timer)
+
+    with timer.stage("solve"):
+        plan = release_planning_service.plan(
+            prioritized_requirements, request.budget, request.releases, request.timeBudgetMs
+        )
+
+    with timer.stage("serialize"):
+        planned_count = sum(len(release.requirements) for release in plan.releases)
+        return ORJSONResponse({
+            "sessionId": request.sessionId,
+            "releases": [
+                {
+                    "release": release.number,
+                    "budget": release.budget,
+                    "totalCost": release.total_cost,
+                    "totalScore": release.total_score,
+                    "solver": release.solver,
+                    "optimal": release.optimal,
+                    "requirements": release.requirements,
+                }
+                for release in plan.releases
+            ],
+            "marginalRequirements": [
+                {"requirement": requirement, "additionalBudget": additional_budget}
+                for requirement, additional_budget in plan.marginal
+            ],
+            "unplannedCount": len(prioritized_requirements) - planned_count,
+            "processingTimeMs": timer.total_ms,
+        })
+
+
+def _load_session_requirements(db: Session, session_id: str, user_id: str) -> List[Requirement]:
+    """Load a user's session requirements or raise the matching HTTP error"""
+    session = database_service.get_session(db, session_id, user_id)
     if not session:
         raise HTTPException(
             status_code=404,
@@ -360,48 +599,154 @@ async def get_prioritization(
                 message="Session not found or access denied"
             ).dict()
         )
-    
-    prioritized_requirements = database_service.get_prioritized_requirements(db, sessionId)
-    if not prioritized_requirements:
+
+    requirements = database_service.get_requirements(db, session_id)
+    if not requirements:
         raise HTTPException(
-            status_code=404,
+            status_code=400,
             detail=Error(
-                error="NO_RESULTS",
-                message="No prioritization results found for this session"
+                error="NO_REQUIREMENTS",
+                message="No requirements found in session"
             ).dict()
         )
-    
-    return PrioritizationResponse(
-        sessionId=sessionId,
-        prioritizedRequirements=prioritized_requirements,
-        processingTimeMs=0,  # Not available for cached results
-        metadata={
-            "totalRequirements": len(prioritized_requirements),
-            "averageScore": sum(r.priorityScore for r in prioritized_requirements) / len(prioritized_requirements),
-            "modelVersion": "1.0.0",
-            "weightsUsed": {}
-        }
+    return requirements
+
+
+def _get_llm_config(db: Session) -> LLMConfigSnapshot:
+    """Return the configured LLM settings"""
+    llm_config = llm_config_service.get_config(db)
+    if not llm_config:
+        raise HTTPException(
+            status_code=400,
+            detail=Error(
+                error="LLM_CONFIG_NOT_SET",
+                message="LLM configuration is not set. Please configure it in admin panel."
+            ).dict()
+        )
+
+    return llm_config
+
+
+def _lease_analysis_service(llm_config: LLMConfigSnapshot):
+    """Lease the pooled AnalysisService for an LLM config; it stays open while leased"""
+    return llm_client_registry.lease(
+        api_key=llm_config.api_key,
+        base_url=llm_config.base_url,
+        model=llm_config.model
     )
 
 
-@app.post("/prioritization/chatgpt", response_model=ChatGPTAnalysisResponse, tags=["prioritization"])
-async def analyze_with_chatgpt(
-    request: ChatGPTAnalysisRequest,
+def _to_analysis_response(analysis: Analysis) -> AnalysisResponse:
+    """Convert a stored analysis into its API representation"""
+    return AnalysisResponse(
+        id=analysis.id,
+        sessionId=analysis.session_id,
+        status=analysis.status,
+        prompt=analysis.prompt,
+        model=analysis.model,
+        summary=analysis.summary,
+        error=analysis.error,
+        createdAt=analysis.created_at,
+        completedAt=analysis.completed_at,
+    )
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _scenarios_response(session_id: str, scenarios: list, titles: Dict[str, str], timer: StageTimer) -> ORJSONResponse:
+    """Side-by-side response for scenarios given as (summary, {requirement ID: (score, rank)})"""
+    with timer.stage("compare"):
+        names = [summary["name"] for summary, _ in scenarios]
+        first = scenarios[0][1]
+        ordered = sorted(first, key=lambda requirement_id: first[requirement_id][1])
+        ordered += sorted(set().union(*(results for _, results in scenarios[1:])).difference(first))
+        rows = []
+        for requirement_id in ordered:
+            present = [(name, results[requirement_id]) for name, (_, results) in zip(names, scenarios) if requirement_id in results]
+            rows.append({
+                "id": requirement_id,
+                "title": titles.get(requirement_id, ""),
+                "ranks": {name: rank for name, (_, rank) in present},
+                "scores": {name: round(score, 2) for name, (score, _) in present},
+            })
+        correlations = scenario_service.correlations([
+            (name, {requirement_id: rank for requirement_id, (_, rank) in results.items()})
+            for name, (_, results) in zip(names, scenarios)
+        ])
+
+    with timer.stage("serialize"):
+        return ORJSONResponse({
+            "sessionId": session_id,
+            "scenarios": [
+                {**summary, "averageScore": sum(score for score, _ in results.values()) / max(len(results), 1)}
+                for summary, results in scenarios
+            ],
+            "requirements": rows,
+            "rankCorrelations": [
+                {"first": first_name, "second": second_name, "kendallTau": None if tau is None else round(tau, 4)}
+                for first_name, second_name, tau in correlations
+            ],
+            "processingTimeMs": timer.total_ms,
+        })
+
+
+@app.post("/prioritization/scenarios", response_model=ScenariosResponse, tags=["prioritization"])
+async def rank_scenarios(
+    request: ScenarioRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Generate prioritization insights using OpenAI ChatGPT."""
-    session = database_service.get_session(db, request.sessionId, current_user.id)
-    if not session:
+    """Rank a session under several weight profiles at once and store the results side by side"""
+    count = len(request.profileIds) + len(request.profiles)
+    if count == 0 or count > MAX_SCENARIOS:
         raise HTTPException(
-            status_code=404,
+            status_code=400,
             detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found or access denied"
+                error="INVALID_SCENARIOS",
+                message=f"Provide between 1 and {MAX_SCENARIOS} profileIds or profiles"
             ).dict()
         )
 
-    requirements = database_service.get_requirements(db, request.sessionId)
+    timer = StageTimer("scenarios")
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, request.sessionId, current_user.id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        scenarios = []
+        for profile_id in request.profileIds:
+            profile = database_service.get_weight_profile(db, profile_id, current_user.id)
+            if not profile:
+                raise HTTPException(
+                    status_code=404,
+                    detail=Error(
+                        error="WEIGHT_PROFILE_NOT_FOUND",
+                        message=f"Weight profile not found: {profile_id}"
+                    ).dict()
+                )
+            scenarios.append((profile.name, Weights(**profile.weights), profile.id))
+        scenarios.extend((profile.name, profile.weights, None) for profile in request.profiles)
+
+        names = [name for name, _, _ in scenarios]
+        if len(set(names)) < len(names):
+            raise HTTPException(
+                status_code=400,
+                detail=Error(
+                    error="DUPLICATE_SCENARIO_NAME",
+                    message="Scenario names must be unique"
+                ).dict()
+            )
+
+        requirements = database_service.get_requirement_records(db, request.sessionId)
     if not requirements:
         raise HTTPException(
             status_code=400,
@@ -411,30 +756,52 @@ async def analyze_with_chatgpt(
             ).dict()
         )
 
+    with timer.stage("score"):
+        rankings = scenario_service.rank(requirements, scenarios)
+
+    with timer.stage("persist"):
+        database_service.save_scenarios(db, request.sessionId, requirements, rankings)
+
+    return _scenarios_response(
+        request.sessionId,
+        [
+            (
+                {"name": ranking.name, "profileId": ranking.profile_id, "weights": ranking.weights.model_dump(), "createdAt": None},
+                {req.id: (score, rank) for req, score, rank in zip(requirements, ranking.scores, ranking.ranks)},
+            )
+            for ranking in rankings
+        ],
+        {req.id: req.title for req in requirements},
+        timer,
+    )
+
+
+@app.post("/prioritization/chatgpt", response_model=ChatGPTAnalysisResponse, tags=["prioritization"])
+async def analyze_with_chatgpt(
+    request: ChatGPTAnalysisRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Generate prioritization insights using OpenAI ChatGPT."""
+    requirements = _load_session_requirements(db, request.sessionId, current_user.id)
+
     try:
-        # Get LLM config from database
-        llm_config = llm_config_service.get_config(db)
-        if not llm_config:
-            raise HTTPException(
-                status_code=400,
-                detail=Error(
-                    error="LLM_CONFIG_NOT_SET",
-                    message="LLM configuration is not set. Please configure it in admin panel."
-                ).dict()
+        llm_config = _get_llm_config(db)
+        async with _lease_analysis_service(llm_config) as service:
+            summary = await service.analyze_requirements(
+                requirements,
+                request.prompt,
+                use_cache=not request.bypassCache,
+                map_reduce=request.mapReduce,
             )
-        
-        # Create AnalysisService with config from DB
-        service = AnalysisService(
-            api_key=llm_config.api_key,
-            base_url=llm_config.base_url,
-            model=llm_config.model
+        analysis = analysis_job_service.create_analysis(
+            db, request.sessionId, current_user.id, request.prompt, llm_config.model, summary=summary
         )
-        
-        summary = await service.analyze_requirements(
-            requirements,
-            request.prompt,
+        return ChatGPTAnalysisResponse(
+            sessionId=request.sessionId,
+            summary=summary,
+            analysisId=analysis.id
         )
-        return ChatGPTAnalysisResponse(sessionId=request.sessionId, summary=summary)
     except HTTPException:
         raise
     except Exception as exc:
@@ -447,45 +814,220 @@ async def analyze_with_chatgpt(
             ).dict()
         )
 
-# ============================================================================
-# EXPORT ENDPOINTS
-# ============================================================================
 
-@app.get("/export/csv/{sessionId}", tags=["export"])
-async def export_csv(
-    sessionId: str,
+@app.post("/prioritization/chatgpt/stream", tags=["prioritization"])
+async def stream_chatgpt_analysis(
+    request: ChatGPTAnalysisRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Export results as CSV"""
-    # Verify session belongs to user
-    session = database_service.get_session(db, sessionId, current_user.id)
-    if not session:
+    """Stream ChatGPT prioritization insights as Server-Sent Events.
+
+    Emits `delta` events with text fragments, then a single `done` event
+    carrying the full summary (or an `error` event if the completion fails).
+    """
+    requirements = _load_session_requirements(db, request.sessionId, current_user.id)
+    llm_config = _get_llm_config(db)
+    user_id = current_user.id
+
+    async def event_stream():
+        parts = []
+        try:
+            # Leased for the whole stream so a config change cannot close the client mid-stream
+            async with _lease_analysis_service(llm_config) as service:
+                async for delta in service.stream_analysis(
+                    requirements,
+                    request.prompt,
+                    use_cache=not request.bypassCache,
+                    map_reduce=request.mapReduce,
+                ):
+                    parts.append(delta)
+                    yield _sse_event("delta", {"text": delta})
+        except Exception as exc:
+            logger.exception("ChatGPT streaming analysis failed")
+            yield _sse_event("error", Error(error="ANALYSIS_FAILED", message=str(exc)).dict())
+            return
+
+        summary = "".join(parts).strip()
+        # The request-scoped DB session may already be closed while streaming
+        persist_db = SessionLocal()
+        try:
+            analysis = analysis_job_service.create_analysis(
+                persist_db, request.sessionId, user_id, request.prompt, llm_config.model, summary=summary
+            )
+            analysis_id = analysis.id
+        finally:
+            persist_db.close()
+
+        yield _sse_event("done", {
+            "sessionId": request.sessionId,
+            "summary": summary,
+            "analysisId": analysis_id,
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post(
+    "/prioritization/chatgpt/jobs",
+    response_model=AnalysisResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["prioritization"]
+)
+async def create_chatgpt_analysis_job(
+    request: ChatGPTAnalysisRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue a ChatGPT analysis to run in the background; poll /analyses/{analysisId} for the result."""
+    requirements = _load_session_requirements(db, request.sessionId, current_user.id)
+    llm_config = _get_llm_config(db)
+
+    # The job leases its LLM client when it runs, with the config current at that time
+    analysis = analysis_job_service.create_analysis(
+        db, request.sessionId, current_user.id, request.prompt, llm_config.model
+    )
+    analysis_job_service.enqueue(
+        analysis.id,
+        requirements,
+        request.prompt,
+        use_cache=not request.bypassCache,
+        map_reduce=request.mapReduce,
+    )
+    return _to_analysis_response(analysis)
+
+
+@app.get("/analyses/{analysisId}", response_model=AnalysisResponse, tags=["prioritization"])
+async def get_analysis(
+    analysisId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status and result of an LLM analysis"""
+    analysis = analysis_job_service.get_analysis(db, analysisId, current_user.id)
+    if not analysis:
         raise HTTPException(
             status_code=404,
             detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found or access denied"
+                error="ANALYSIS_NOT_FOUND",
+                message="Analysis not found or access denied"
             ).dict()
         )
-    
-    prioritized_requirements = database_service.get_prioritized_requirements(db, sessionId)
-    if not prioritized_requirements:
+    return _to_analysis_response(analysis)
+
+# ============================================================================
+# WEIGHT PROFILE ENDPOINTS
+# ============================================================================
+
+def _weight_profile_model(profile) -> WeightProfile:
+    return WeightProfile(
+        id=profile.id,
+        name=profile.name,
+        weights=Weights.model_construct(**profile.weights),
+        createdAt=profile.created_at,
+        updatedAt=profile.updated_at,
+    )
+
+
+def _weight_profile_name_conflict(name: str) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=Error(
+            error="WEIGHT_PROFILE_EXISTS",
+            message=f"A weight profile named '{name}' already exists"
+        ).dict()
+    )
+
+
+def _get_weight_profile_or_404(db: Session, profile_id: str, user_id: str):
+    profile = database_service.get_weight_profile(db, profile_id, user_id)
+    if not profile:
         raise HTTPException(
             status_code=404,
             detail=Error(
-                error="NO_RESULTS",
-                message="No prioritization results found for this session"
+                error="WEIGHT_PROFILE_NOT_FOUND",
+                message="Weight profile not found or access denied"
             ).dict()
         )
+    return profile
+
+
+@app.get("/weight-profiles", response_model=WeightProfilesResponse, tags=["weight profiles"])
+async def list_weight_profiles(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List the current user's saved weight profiles"""
+    profiles = database_service.get_weight_profiles(db, current_user.id)
+    return WeightProfilesResponse(profiles=[_weight_profile_model(profile) for profile in profiles])
+
+
+@app.post("/weight-profiles", response_model=WeightProfile, status_code=201, tags=["weight profiles"])
+async def create_weight_profile(
+    request: WeightProfileRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Save a named set of weights"""
+    if database_service.weight_profile_name_taken(db, current_user.id, request.name):
+        raise _weight_profile_name_conflict(request.name)
+    profile = database_service.save_weight_profile(db, current_user.id, request.name, request.weights.model_dump())
+    return _weight_profile_model(profile)
+
+
+@app.put("/weight-profiles/{profileId}", response_model=WeightProfile, tags=["weight profiles"])
+async def update_weight_profile(
+    profileId: str,
+    request: WeightProfileRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rename a weight profile or change its weights"""
+    profile = _get_weight_profile_or_404(db, profileId, current_user.id)
+    if database_service.weight_profile_name_taken(db, current_user.id, request.name, exclude_id=profileId):
+        raise _weight_profile_name_conflict(request.name)
+    profile = database_service.save_weight_profile(
+        db, current_user.id, request.name, request.weights.model_dump(), profile
+    )
+    return _weight_profile_model(profile)
+
+
+@app.delete("/weight-profiles/{profileId}", tags=["weight profiles"])
+async def delete_weight_profile(
+    profileId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a weight profile (stored scenarios ranked with it are kept)"""
+    profile = _get_weight_profile_or_404(db, profileId, current_user.id)
+    database_service.delete_weight_profile(db, profile)
+    return {"message": "Weight profile deleted successfully"}
+
+# ============================================================================
+# EXPORT ENDPOINTS
+# ============================================================================
+
+@app.get("/export/csv/{sessionId}", tags=["export"])
+async def export_csv(
+    sessionId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Export results as CSV"""
+    timer = StageTimer("export_csv")
+    prioritized_requirements = _load_prioritized_results(db, sessionId, current_user.id, timer)
     
     # Generate CSV file
-    csv_content = export_service.generate_csv(prioritized_requirements)
-    
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-        f.write(csv_content)
-        temp_file = f.name
+    with timer.stage("render"):
+        csv_content = await resources.run_export(export_service.generate_csv, prioritized_requirements)
+        
+        # Create temporary file
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(csv_content)
+            temp_file = f.name
     
     return FileResponse(
         path=temp_file,
@@ -500,29 +1042,14 @@ async def export_html(
     db: Session = Depends(get_db)
 ):
     """Export results as HTML report"""
-    # Verify session belongs to user
-    session = database_service.get_session(db, sessionId, current_user.id)
-    if not session:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found or access denied"
-            ).dict()
-        )
-    
-    prioritized_requirements = database_service.get_prioritized_requirements(db, sessionId)
-    if not prioritized_requirements:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="NO_RESULTS",
-                message="No prioritization results found for this session"
-            ).dict()
-        )
+    timer = StageTimer("export_html")
+    prioritized_requirements = _load_prioritized_results(db, sessionId, current_user.id, timer)
     
     # Generate HTML report
-    html_content = export_service.generate_html(prioritized_requirements, sessionId)
+    with timer.stage("render"):
+        html_content = await resources.run_export(
+            export_service.generate_html, prioritized_requirements, sessionId
+        )
     return HTMLResponse(content=html_content)
 
 @app.get("/export/pdf/{sessionId}", tags=["export"])
@@ -531,31 +1058,18 @@ async def export_pdf(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    session = database_service.get_session(db, sessionId, current_user.id)
-    if not session:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="SESSION_NOT_FOUND",
-                message="Session not found or access denied"
-            ).dict()
-        )
+    """Export results as PDF report"""
+    timer = StageTimer("export_pdf")
+    prioritized_requirements = _load_prioritized_results(db, sessionId, current_user.id, timer)
 
-    prioritized_requirements = database_service.get_prioritized_requirements(db, sessionId)
-    if not prioritized_requirements:
-        raise HTTPException(
-            status_code=404,
-            detail=Error(
-                error="NO_RESULTS",
-                message="No prioritization results found for this session"
-            ).dict()
+    with timer.stage("render"):
+        pdf_content = await resources.run_export(
+            export_service.generate_pdf, prioritized_requirements, sessionId
         )
 
-    pdf_content = export_service.generate_pdf(prioritized_requirements, sessionId)
-
-    with tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False) as f:
-        f.write(pdf_content)
-        temp_file = f.name
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False) as f:
+            f.write(pdf_content)
+            temp_file = f.name
 
     return FileResponse(
         path=temp_file,
@@ -580,10 +1094,13 @@ async def export_pdf_from_payload(
                 ).dict()
             )
 
-    pdf_content = export_service.generate_pdf(
-        request.requirements,
-        request.sessionId or "custom_report"
-    )
+    timer = StageTimer("export_pdf_payload")
+    with timer.stage("render"):
+        pdf_content = await resources.run_export(
+            export_service.generate_pdf,
+            request.requirements,
+            request.sessionId or "custom_report"
+        )
     filename = f"aria_prioritization_{request.sessionId or 'report'}.pdf"
     return Response(
         content=pdf_content,
@@ -622,6 +1139,20 @@ async def get_user_sessions(
     return SessionsResponse(sessions=summaries)
 
 
+def _session_details_response(
+    session, requirements: List[RequirementRecord], prioritized: List[PrioritizedRecord]
+) -> ORJSONResponse:
+    """Serialize a session with its records (shape of SessionDetails)"""
+    return ORJSONResponse({
+        "sessionId": session.id,
+        "name": session.name,
+        "createdAt": session.created_at,
+        "updatedAt": session.updated_at,
+        "requirements": requirements,
+        "prioritizedRequirements": prioritized,
+    })
+
+
 @app.get("/sessions/latest", response_model=SessionDetails, tags=["sessions"])
 async def get_latest_session(
     current_user: User = Depends(get_current_user),
@@ -638,17 +1169,10 @@ async def get_latest_session(
             ).dict()
         )
 
-    requirements = database_service.get_requirements(db, session.id)
-    prioritized = database_service.get_prioritized_requirements(db, session.id)
+    requirements = database_service.get_requirement_records(db, session.id)
+    prioritized = database_service.get_prioritized_records(db, session.id)
 
-    return SessionDetails(
-        sessionId=session.id,
-        name=session.name,
-        createdAt=session.created_at,
-        updatedAt=session.updated_at,
-        requirements=requirements,
-        prioritizedRequirements=prioritized,
-    )
+    return _session_details_response(session, requirements, prioritized)
 
 
 @app.get("/sessions/{sessionId}", response_model=SessionDetails, tags=["sessions"])
@@ -658,6 +1182,241 @@ async def get_session_details(
     db: Session = Depends(get_db)
 ):
     """Get requirements and prioritization results for a specific session"""
+    timer = StageTimer("session_details")
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, sessionId, current_user.id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        requirements = database_service.get_requirement_records(db, sessionId)
+        prioritized = database_service.get_prioritized_records(db, sessionId)
+
+    with timer.stage("serialize"):
+        return _session_details_response(session, requirements, prioritized)
+
+@app.get("/sessions/{sessionId}/pareto", response_model=ParetoResponse, tags=["sessions"])
+async def get_session_pareto(
+    sessionId: str,
+    maxLayers: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the Pareto frontier and dominance layers of a session's requirements"""
+    if maxLayers is not None and maxLayers < 1:
+        raise HTTPException(
+            status_code=400,
+            detail=Error(
+                error="INVALID_MAX_LAYERS",
+                message="maxLayers must be at least 1"
+            ).dict()
+        )
+
+    timer = StageTimer("pareto")
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, sessionId, current_user.id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        requirements = database_service.get_requirement_records(db, sessionId)
+        version = database_service.get_requirements_version(db, sessionId)
+
+    with timer.stage("layers"):
+        layers, cached = pareto_service.get_layers(sessionId, version, requirements)
+
+    with timer.stage("serialize"):
+        return ORJSONResponse({
+            "sessionId": sessionId,
+            "criteria": {field: "max" if field in MAXIMIZE else "min" for field in SCORE_FIELDS},
+            "layers": [
+                {"layer": number, "requirements": members}
+                for number, members in enumerate(layers[:maxLayers], start=1)
+            ],
+            "layerCount": len(layers),
+            "cached": cached,
+            "processingTimeMs": timer.total_ms,
+        })
+
+@app.post("/sessions/{sessionId}/themes", response_model=ThemesResponse, tags=["sessions"])
+async def cluster_session_themes(
+    sessionId: str,
+    request: ThemesRequest = ThemesRequest(),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Group a session's requirements into themes and suggest categories for uncategorized ones"""
+    timer = StageTimer("themes")
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, sessionId, current_user.id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        requirements = database_service.get_requirement_records(db, sessionId)
+    if not requirements:
+        raise HTTPException(
+            status_code=400,
+            detail=Error(
+                error="NO_REQUIREMENTS",
+                message="No requirements found in session"
+            ).dict()
+        )
+
+    with timer.stage("cluster"):
+        clusters, incremental = await resources.run_clustering(
+            clustering_service.cluster, sessionId, requirements, request.clusters
+        )
+
+    suggestions = [
+        {"requirementId": requirements[index].id, "suggestedCategory": cluster.suggested_category, "cluster": number}
+        for number, cluster in enumerate(clusters, start=1)
+        for index in cluster.members
+        if requirements[index].category is None
+    ]
+
+    applied = 0
+    if request.applyCategories and suggestions:
+        with timer.stage("persist"):
+            applied = database_service.fill_missing_categories(
+                db, sessionId, {item["requirementId"]: item["suggestedCategory"] for item in suggestions}
+            )
+
+    with timer.stage("serialize"):
+        return ORJSONResponse({
+            "sessionId": sessionId,
+            "clusters": [
+                {
+                    "cluster": number,
+                    "themes": cluster.themes,
+                    "suggestedCategory": cluster.suggested_category,
+                    "basis": cluster.basis,
+                    "requirementIds": [requirements[index].id for index in cluster.members],
+                }
+                for number, cluster in enumerate(clusters, start=1)
+            ],
+            "suggestions": suggestions,
+            "appliedCount": applied,
+            "incremental": incremental,
+            "processingTimeMs": timer.total_ms,
+        })
+
+
+def _dependencies_response(session_id: str, edges, reranked: bool = False) -> DependenciesResponse:
+    return DependenciesResponse(
+        sessionId=session_id,
+        dependencies=[
+            DependencyEdge(requirementId=requirement_id, dependsOn=depends_on)
+            for requirement_id, depends_on in edges
+        ],
+        reranked=reranked,
+    )
+
+
+def _rerank_stored_results(db: Session, session_id: str) -> bool:
+    """Re-apply dependency constraints to stored prioritization results (scores are kept)"""
+    prioritized = database_service.get_prioritized_records(db, session_id)
+    if not prioritized:
+        return False
+    previous = [req.id for req in prioritized]
+    reranked = prioritization_service.rerank_records(prioritized)
+    if [req.id for req in reranked] == previous:
+        return False
+    database_service.save_prioritized_requirements(db, session_id, reranked)
+    return True
+
+
+@app.get("/sessions/{sessionId}/dependencies", response_model=DependenciesResponse, tags=["sessions"])
+async def get_session_dependencies(
+    sessionId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the dependency edges of a session's requirements"""
+    session = database_service.get_session(db, sessionId, current_user.id)
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="SESSION_NOT_FOUND",
+                message="Session not found or access denied"
+            ).dict()
+        )
+
+    return _dependencies_response(sessionId, database_service.get_dependencies(db, sessionId))
+
+
+@app.post("/sessions/{sessionId}/dependencies", response_model=DependenciesResponse, tags=["sessions"])
+async def add_session_dependency(
+    sessionId: str,
+    edge: DependencyEdge,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add a dependency and re-rank stored results so the prerequisite comes first"""
+    session = database_service.get_session(db, sessionId, current_user.id)
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="SESSION_NOT_FOUND",
+                message="Session not found or access denied"
+            ).dict()
+        )
+
+    requirements = database_service.get_requirement_records(db, sessionId)
+    # The stored graph is already acyclic; only the new edge needs checking
+    graph = DependencyGraph.from_records(requirements, validate=False)
+    try:
+        added = graph.add_edge(edge.requirementId, edge.dependsOn)
+    except DependencyCycleError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=Error(
+                error="DEPENDENCY_CYCLE",
+                message=str(e)
+            ).dict()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="REQUIREMENT_NOT_FOUND",
+                message=str(e)
+            ).dict()
+        )
+
+    reranked = False
+    if added:
+        database_service.add_dependency(db, sessionId, edge.requirementId, edge.dependsOn)
+        reranked = _rerank_stored_results(db, sessionId)
+    return _dependencies_response(sessionId, database_service.get_dependencies(db, sessionId), reranked)
+
+
+@app.delete("/sessions/{sessionId}/dependencies", response_model=DependenciesResponse, tags=["sessions"])
+async def remove_session_dependency(
+    sessionId: str,
+    requirementId: str,
+    dependsOn: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Remove a dependency and re-rank stored results"""
     session = database_service.get_session(db, sessionId, current_user.id)
     if not session:
         raise HTTPException(
@@ -668,16 +1427,82 @@ async def get_session_details(
             ).dict()
         )
 
-    requirements = database_service.get_requirements(db, sessionId)
-    prioritized = database_service.get_prioritized_requirements(db, sessionId)
+    if not database_service.remove_dependency(db, sessionId, requirementId, dependsOn):
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="DEPENDENCY_NOT_FOUND",
+                message=f"{requirementId} does not depend on {dependsOn}"
+            ).dict()
+        )
+
+    reranked = _rerank_stored_results(db, sessionId)
+    return _dependencies_response(sessionId, database_service.get_dependencies(db, sessionId), reranked)
+
+@app.get("/sessions/{sessionId}/scenarios", response_model=ScenariosResponse, tags=["sessions"])
+async def get_session_scenarios(
+    sessionId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get all stored scenario rankings of a session side by side"""
+    timer = StageTimer("get_scenarios")
+    with timer.stage("db_read"):
+        session = database_service.get_session(db, sessionId, current_user.id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="SESSION_NOT_FOUND",
+                    message="Session not found or access denied"
+                ).dict()
+            )
+
+        stored = database_service.get_scenarios(db, sessionId)
+        if not stored:
+            raise HTTPException(
+                status_code=404,
+                detail=Error(
+                    error="NO_SCENARIOS",
+                    message="No scenarios have been ranked for this session"
+                ).dict()
+            )
+        titles = {req.id: req.title for req in database_service.get_requirement_records(db, sessionId)}
+
+    return _scenarios_response(
+        sessionId,
+        [
+            (
+                {"name": scenario.name, "profileId": scenario.profile_id, "weights": scenario.weights, "createdAt": scenario.created_at},
+                {requirement_id: (score, rank) for requirement_id, score, rank in rows},
+            )
+            for scenario, rows in stored
+        ],
+        titles,
+        timer,
+    )
+
+@app.get("/sessions/{sessionId}/analyses", response_model=AnalysisHistoryResponse, tags=["sessions"])
+async def get_session_analyses(
+    sessionId: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the history of LLM analyses for a session"""
+    session = database_service.get_session(db, sessionId, current_user.id)
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="SESSION_NOT_FOUND",
+                message="Session not found or access denied"
+            ).dict()
+        )
 
-    return SessionDetails(
-        sessionId=session.id,
-        name=session.name,
-        createdAt=session.created_at,
-        updatedAt=session.updated_at,
-        requirements=requirements,
-        prioritizedRequirements=prioritized,
+    analyses = analysis_job_service.get_session_analyses(db, sessionId)
+    return AnalysisHistoryResponse(
+        sessionId=sessionId,
+        analyses=[_to_analysis_response(analysis) for analysis in analyses]
     )
 
 # ============================================================================
@@ -756,5 +1581,41 @@ async def delete_llm_config(
     
     return {"message": "LLM configuration deleted successfully"}
 
+@app.get("/admin/profiles", response_model=ProfilesResponse, tags=["admin"])
+async def list_profiles(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """List captured request profiles (admin only)"""
+    return ProfilesResponse(profiles=[ProfileSummary(**meta) for meta in profile_store.list()])
+
+
+@app.get("/admin/profiles/{profileId}", tags=["admin"])
+async def get_profile(
+    profileId: str,
+    view: str = "raw",
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Download a profile artifact, or `view=text` for a cProfile summary (admin only)"""
+    metadata = profile_store.get(profileId)
+    if not metadata:
+        raise HTTPException(
+            status_code=404,
+            detail=Error(
+                error="PROFILE_NOT_FOUND",
+                message="Profile not found"
+            ).dict()
+        )
+
+    path = profile_store.artifact_path(metadata)
+    if view == "text" and metadata["format"] == "prof":
+        return PlainTextResponse(render_pstats(path))
+    if metadata["format"] == "html":
+        return HTMLResponse(content=path.read_text())
+    return FileResponse(
+        path=str(path),
+        filename=f"aria_profile_{profileId}.prof",
+        media_type="application/octet-stream"
+    )
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -0,0 +1,114 @@
+"""
+Prometheus metrics for the ARIA backend.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+
+# Buckets span sub-millisecond cache hits up to slow LLM calls
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+REQUEST_LATENCY = Histogram(
+    "aria_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "aria_stage_duration_seconds",
+    "Time spent in each pipeline stage (parse, validate, db_read, score, persist, serialize, render)",
+    ["endpoint", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "aria_cache_requests_total",
+    "Cache lookups by cache name and result",
+    ["cache", "result"],
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss"""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class StageTimer:
+    """Times the stages of one request and reports them to STAGE_LATENCY"""
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            STAGE_LATENCY.labels(endpoint=self.endpoint, stage=name).observe(elapsed)
+
+    @property
+    def total_ms(self) -> int:
+        """Milliseconds spent in all stages timed so far"""
+        return int(sum(self.stages.values()) * 1000)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template"""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Label by route template, not raw path, to keep cardinality bounded
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(
+                method=scope["method"], route=route_path, status=str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate samples written by every uvicorn/gunicorn worker process
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
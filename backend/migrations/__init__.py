@@ -2,3 +2,32 @@
 Database migrations
 """
 
+import logging
+
+logger = logging.getLogger("aria.migration")
+
+
+def run_all():
+    """Create missing tables and apply pending migrations (one-shot, per deploy)"""
+    from database import Base, engine
+    import database.models  # noqa: F401  (registers all tables on Base.metadata)
+    from migrations.add_admin_and_llm_config import run_migration
+    from migrations.add_requirement_search import run_migration as add_requirement_search
+    from migrations.add_score_contributions import run_migration as add_score_contributions
+    from migrations.add_analysis_heartbeat import run_migration as add_analysis_heartbeat
+
+    Base.metadata.create_all(bind=engine)
+    logger.info("Database tables created")
+
+    # The column/table migrations target existing PostgreSQL deployments;
+    # fresh databases already get the full schema from create_all above.
+    if engine.dialect.name == "postgresql":
+        run_migration()
+
+    # Plain ADD COLUMN works on every supported database
+    add_score_contributions()
+    add_analysis_heartbeat()
+
+    # Full-text search needs database-specific objects (tsvector column or FTS5 table)
+    if engine.dialect.name in ("postgresql", "sqlite"):
+        add_requirement_search()
@@ -0,0 +1,10 @@
+"""
+Run all database migrations: `python -m migrations`
+"""
+import logging
+
+from migrations import run_all
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_all()
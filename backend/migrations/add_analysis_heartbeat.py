@@ -0,0 +1,25 @@
+"""
+Database migration adding the job heartbeat column to analyses
+"""
+from sqlalchemy import inspect, text
+from database.database import engine
+import logging
+
+logger = logging.getLogger("aria.migration")
+
+
+def run_migration():
+    """Run database migration"""
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("analyses")}
+        if "heartbeat_at" not in columns:
+            column_type = "TIMESTAMP WITH TIME ZONE" if engine.dialect.name == "postgresql" else "DATETIME"
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE analyses ADD COLUMN heartbeat_at {column_type}"))
+        logger.info("Analysis heartbeat migration completed successfully")
+    except Exception as e:
+        logger.error(f"Analysis heartbeat migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,107 @@
+"""
+Database migration adding full-text search over requirement titles and descriptions.
+
+PostgreSQL: a generated tsvector column with a GIN index.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+"""
+from sqlalchemy import inspect, text
+from database.database import engine
+import logging
+
+logger = logging.getLogger("aria.migration")
+
+POSTGRES_STATEMENTS = (
+    # Title matches rank above description matches
+    """
+    ALTER TABLE requirements ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_requirements_search_vector ON requirements USING GIN (search_vector)",
+    # Search results are restricted to the user's sessions
+    "CREATE INDEX IF NOT EXISTS ix_requirements_session_id ON requirements (session_id)",
+    "CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions (user_id)",
+)
+
+# requirements has a string primary key and its implicit rowid may change on
+# VACUUM, so FTS rows are keyed by an INTEGER PRIMARY KEY of a mapping table
+# (stable) and read their content through a view joining it to requirements
+SQLITE_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS requirements_fts_keys (
+        fts_rowid INTEGER PRIMARY KEY,
+        requirement_id VARCHAR NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS requirements_fts_content AS
+        SELECT k.fts_rowid, r.title, r.description
+        FROM requirements_fts_keys k JOIN requirements r ON r.id = k.requirement_id
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS requirements_fts USING fts5(
+        title, description, content='requirements_fts_content', content_rowid='fts_rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS requirements_fts_insert AFTER INSERT ON requirements BEGIN
+        INSERT INTO requirements_fts_keys(requirement_id) VALUES (new.id);
+        INSERT INTO requirements_fts(rowid, title, description)
+        VALUES (last_insert_rowid(), new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS requirements_fts_delete AFTER DELETE ON requirements BEGIN
+        INSERT INTO requirements_fts(requirements_fts, rowid, title, description)
+        SELECT 'delete', fts_rowid, old.title, old.description
+        FROM requirements_fts_keys WHERE requirement_id = old.id;
+        DELETE FROM requirements_fts_keys WHERE requirement_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS requirements_fts_update AFTER UPDATE ON requirements BEGIN
+        INSERT INTO requirements_fts(requirements_fts, rowid, title, description)
+        SELECT 'delete', fts_rowid, old.title, old.description
+        FROM requirements_fts_keys WHERE requirement_id = old.id;
+        UPDATE requirements_fts_keys SET requirement_id = new.id WHERE requirement_id = old.id;
+        INSERT INTO requirements_fts(rowid, title, description)
+        SELECT fts_rowid, new.title, new.description
+        FROM requirements_fts_keys WHERE requirement_id = new.id;
+    END
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_requirements_session_id ON requirements (session_id)",
+    "CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions (user_id)",
+)
+
+# Key requirements stored before the triggers existed
+SQLITE_BACKFILL = """
+    INSERT INTO requirements_fts_keys(requirement_id)
+    SELECT id FROM requirements WHERE id NOT IN (SELECT requirement_id FROM requirements_fts_keys)
+"""
+# Reindexes every requirement, so it only runs when rows were keyed above or the index is new
+SQLITE_REBUILD = "INSERT INTO requirements_fts(requirements_fts) VALUES ('rebuild')"
+
+
+def run_migration():
+    """Run database migration"""
+    try:
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                for statement in POSTGRES_STATEMENTS:
+                    conn.execute(text(statement))
+            else:
+                created = not inspect(conn).has_table("requirements_fts")
+                for statement in SQLITE_STATEMENTS:
+                    conn.execute(text(statement))
+                backfilled = conn.execute(text(SQLITE_BACKFILL)).rowcount
+                if created or backfilled:
+                    conn.execute(text(SQLITE_REBUILD))
+        logger.info("Requirement search migration completed successfully")
+    except Exception as e:
+        logger.error(f"Requirement search migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,24 @@
+"""
+Database migration adding the per-criterion score contributions column to prioritized_requirements
+"""
+from sqlalchemy import inspect, text
+from database.database import engine
+import logging
+
+logger = logging.getLogger("aria.migration")
+
+
+def run_migration():
+    """Run database migration"""
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("prioritized_requirements")}
+        if "contributions" not in columns:
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE prioritized_requirements ADD COLUMN contributions JSON"))
+        logger.info("Score contributions migration completed successfully")
+    except Exception as e:
+        logger.error(f"Score contributions migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
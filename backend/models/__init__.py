@@ -1,20 +1,32 @@
 from .requirement import (
     Requirement, PrioritizedRequirement, 
-    RequirementCategory, Weights
+    RequirementCategory, RankingMethod, Weights
 )
+from .compact import RequirementRecord, PrioritizedRecord, to_records, to_models
 from .responses import (
     UploadResponse, CreateRequirementsRequest, CreateRequirementsResponse,
     RequirementsList, PrioritizationRequest, PrioritizationResponse,
     Error, HealthResponse, SessionSummary, SessionsResponse, SessionDetails,
     ChatGPTAnalysisRequest, ChatGPTAnalysisResponse, LLMConfigRequest, LLMConfigResponse,
-    ExportRequest,
+    ExportRequest, AnalysisStatus, AnalysisResponse, AnalysisHistoryResponse,
+    ProfileSummary, ProfilesResponse, ReleasePlanRequest, PlannedRelease,
+    MarginalRequirement, ReleasePlanResponse, ParetoLayer, ParetoResponse,
+    DependencyEdge, DependenciesResponse, DuplicateCluster, PriorDuplicate, DuplicateReport,
+    SearchHit, SearchResponse, ThemesRequest, ThemeCluster, CategorySuggestion, ThemesResponse,
+    WeightProfileRequest, WeightProfile, WeightProfilesResponse, ScenarioRequest, ScenarioSummary,
+    ScenarioRequirement, RankCorrelation, ScenariosResponse,
 )
 
 __all__ = [
     "Requirement",
     "PrioritizedRequirement", 
     "RequirementCategory",
+    "RankingMethod",
     "Weights",
+    "RequirementRecord",
+    "PrioritizedRecord",
+    "to_records",
+    "to_models",
     "UploadResponse",
     "CreateRequirementsRequest",
     "CreateRequirementsResponse",
@@ -31,4 +43,34 @@ __all__ = [
     "LLMConfigRequest",
     "LLMConfigResponse",
     "ExportRequest",
+    "AnalysisStatus",
+    "AnalysisResponse",
+    "AnalysisHistoryResponse",
+    "ProfileSummary",
+    "ProfilesResponse",
+    "ReleasePlanRequest",
+    "PlannedRelease",
+    "MarginalRequirement",
+    "ReleasePlanResponse",
+    "ParetoLayer",
+    "ParetoResponse",
+    "DependencyEdge",
+    "DependenciesResponse",
+    "DuplicateCluster",
+    "PriorDuplicate",
+    "DuplicateReport",
+    "SearchHit",
+    "SearchResponse",
+    "ThemesRequest",
+    "ThemeCluster",
+    "CategorySuggestion",
+    "ThemesResponse",
+    "WeightProfileRequest",
+    "WeightProfile",
+    "WeightProfilesResponse",
+    "ScenarioRequest",
+    "ScenarioSummary",
+    "ScenarioRequirement",
+    "RankCorrelation",
+    "ScenariosResponse",
 ]
@@ -0,0 +1,99 @@
+"""
+Compact internal requirement records.
+
+Parsing, scoring, persistence and export pass these `__slots__` dataclasses
+around instead of Pydantic models; validation happens once at the API boundary
+(or in the vectorized file parser) and responses are built with
+`model_construct`. Attribute names match the Pydantic models so the services
+accept either.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .requirement import Requirement, PrioritizedRequirement, RequirementCategory
+
+SCORE_FIELDS = ("businessValue", "cost", "risk", "urgency", "stakeholderValue")
+CATEGORY_VALUES = frozenset(category.value for category in RequirementCategory)
+
+
+def normalize_category(value) -> Optional[str]:
+    """Return the category string if it is a known category, else None"""
+    if value is None:
+        return None
+    value = getattr(value, "value", value)
+    return value if value in CATEGORY_VALUES else None
+
+
+@dataclass(slots=True)
+class RequirementRecord:
+    id: str
+    title: str
+    description: str
+    businessValue: Optional[float] = None
+    cost: Optional[float] = None
+    risk: Optional[float] = None
+    urgency: Optional[float] = None
+    stakeholderValue: Optional[float] = None
+    category: Optional[str] = None
+    dependsOn: Optional[List[str]] = None
+
+    @classmethod
+    def from_model(cls, req: Requirement) -> "RequirementRecord":
+        return cls(
+            req.id, req.title, req.description, req.businessValue, req.cost,
+            req.risk, req.urgency, req.stakeholderValue, normalize_category(req.category),
+            req.dependsOn or None,
+        )
+
+    def to_model(self) -> Requirement:
+        return Requirement.model_construct(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            businessValue=self.businessValue,
+            cost=self.cost,
+            risk=self.risk,
+            urgency=self.urgency,
+            stakeholderValue=self.stakeholderValue,
+            category=self.category,
+            dependsOn=self.dependsOn,
+        )
+
+
+@dataclass(slots=True)
+class PrioritizedRecord(RequirementRecord):
+    priorityScore: float = 0.0
+    rank: int = 0
+    confidence: Optional[float] = None
+    reasoning: Optional[str] = None
+    contributions: Optional[Dict[str, float]] = None
+
+    def to_model(self) -> PrioritizedRequirement:
+        return PrioritizedRequirement.model_construct(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            businessValue=self.businessValue,
+            cost=self.cost,
+            risk=self.risk,
+            urgency=self.urgency,
+            stakeholderValue=self.stakeholderValue,
+            category=self.category,
+            dependsOn=self.dependsOn,
+            priorityScore=self.priorityScore,
+            rank=self.rank,
+            confidence=self.confidence,
+            reasoning=self.reasoning,
+            contributions=self.contributions,
+        )
+
+
+def to_records(requirements: Iterable[Requirement]) -> List[RequirementRecord]:
+    """Convert validated API models into records"""
+    return [RequirementRecord.from_model(req) for req in requirements]
+
+
+def to_models(records: Iterable[RequirementRecord]) -> list:
+    """Build response models from records without re-running validation"""
+    return [record.to_model() for record in records]
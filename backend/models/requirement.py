@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Optional
 from enum import Enum
 
 
@@ -11,6 +11,13 @@ class RequirementCategory(str, Enum):
     COMPLIANCE = "COMPLIANCE"
 
 
+class RankingMethod(str, Enum):
+    WEIGHTED_SUM = "weighted_sum"
+    TOPSIS = "topsis"
+    WSJF = "wsjf"
+    AHP = "ahp"
+
+
 class Requirement(BaseModel):
     id: str = Field(..., description="Unique identifier for the requirement")
     title: str = Field(..., max_length=200, description="Short title of the requirement")
@@ -23,6 +30,7 @@ class Requirement(BaseModel):
     stakeholderValue: Optional[float] = Field(None, ge=1, le=10, description="Stakeholder importance score (1-10)")
     
     category: Optional[RequirementCategory] = Field(None, description="Requirement category")
+    dependsOn: Optional[List[str]] = Field(None, description="IDs of requirements that must be delivered first")
 
     class Config:
         use_enum_values = True
@@ -33,6 +41,9 @@ class PrioritizedRequirement(Requirement):
     rank: int = Field(..., ge=1, description="Priority ranking (1 = highest priority)")
     confidence: Optional[float] = Field(None, ge=0, le=1, description="ML model confidence score (0-1)")
     reasoning: Optional[str] = Field(None, description="AI-generated explanation for the priority score")
+    contributions: Optional[Dict[str, float]] = Field(
+        None, description="Score points contributed by each criterion and by the category multiplier"
+    )
 
 
 class Weights(BaseModel):
@@ -42,10 +53,10 @@ class Weights(BaseModel):
     urgency: float = Field(0.2, ge=0, le=1, description="Weight for urgency")
     stakeholderValue: float = Field(0.15, ge=0, le=1, description="Weight for stakeholder value")
 
-    @validator('*', pre=True)
-    def validate_weights_sum(cls, v, values):
-        if values:
-            total = sum(values.values()) + v
-            if abs(total - 1.0) > 0.01:
-                raise ValueError("Weights must sum to 1.0")
-        return v
+    @model_validator(mode="after")
+    def validate_weights_sum(self):
+        # Checked once all fields are set (a per-field check rejected any partial sum below 1.0)
+        total = self.businessValue + self.cost + self.risk + self.urgency + self.stakeholderValue
+        if abs(total - 1.0) > 0.01:
+            raise ValueError("Weights must sum to 1.0")
+        return self
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from .requirement import Requirement, PrioritizedRequirement, Weights
+from enum import Enum
+from .requirement import Requirement, PrioritizedRequirement, RequirementCategory, RankingMethod, Weights
 
 
 class Error(BaseModel):
@@ -16,11 +17,30 @@ class HealthResponse(BaseModel):
     version: Optional[str] = Field(None, description="API version")
 
 
+class DuplicateCluster(BaseModel):
+    requirementIds: List[str] = Field(..., description="IDs of requirements that look like the same requirement")
+    similarity: float = Field(..., description="Lowest estimated text similarity (Jaccard) within the cluster")
+
+
+class PriorDuplicate(BaseModel):
+    requirementId: str = Field(..., description="ID of the new requirement")
+    matchSessionId: str = Field(..., description="Earlier session containing a similar requirement")
+    matchRequirementId: str = Field(..., description="ID of the similar requirement")
+    matchTitle: str = Field(..., description="Title of the similar requirement")
+    similarity: float = Field(..., description="Estimated text similarity (Jaccard)")
+
+
+class DuplicateReport(BaseModel):
+    clusters: List[DuplicateCluster] = Field(..., description="Near-duplicate clusters within this session")
+    priorMatches: List[PriorDuplicate] = Field(..., description="Near-duplicates from the user's earlier sessions")
+
+
 class UploadResponse(BaseModel):
     sessionId: str = Field(..., description="Session ID for this upload")
     requirementsCount: int = Field(..., description="Number of requirements parsed from file")
     message: str = Field(..., description="Success message")
     requirements: Optional[List[Requirement]] = Field(None, description="Parsed requirements")
+    duplicates: Optional[DuplicateReport] = Field(None, description="Candidate duplicate requirements")
 
 
 class CreateRequirementsRequest(BaseModel):
@@ -31,6 +51,7 @@ class CreateRequirementsResponse(BaseModel):
     sessionId: str = Field(..., description="Session ID for these requirements")
     requirementsCount: int = Field(..., description="Number of requirements created")
     message: Optional[str] = Field(None, description="Success message")
+    duplicates: Optional[DuplicateReport] = Field(None, description="Candidate duplicate requirements")
 
 
 class RequirementsList(BaseModel):
@@ -66,16 +87,74 @@ class SessionDetails(BaseModel):
 class ChatGPTAnalysisRequest(BaseModel):
     sessionId: str = Field(..., description="Session ID to analyze")
     prompt: Optional[str] = Field(None, description="Optional additional context for ChatGPT")
+    bypassCache: bool = Field(False, description="Skip the response cache and request a fresh completion")
+    mapReduce: Optional[bool] = Field(
+        None,
+        description="Summarize requirements in concurrent chunks before merging; chosen automatically by size when omitted",
+    )
 
 
 class ChatGPTAnalysisResponse(BaseModel):
     sessionId: str = Field(..., description="Session analyzed")
     summary: str = Field(..., description="ChatGPT generated analysis summary")
+    analysisId: Optional[str] = Field(None, description="ID of the stored analysis result")
+
+
+class AnalysisStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisResponse(BaseModel):
+    id: str = Field(..., description="Analysis identifier")
+    sessionId: str = Field(..., description="Session analyzed")
+    status: AnalysisStatus = Field(..., description="Current job status")
+    prompt: Optional[str] = Field(None, description="Additional context supplied for the analysis")
+    model: Optional[str] = Field(None, description="LLM model used")
+    summary: Optional[str] = Field(None, description="Generated summary once the job has completed")
+    error: Optional[str] = Field(None, description="Failure reason if the job failed")
+    createdAt: datetime = Field(..., description="Creation timestamp")
+    completedAt: Optional[datetime] = Field(None, description="Completion timestamp")
+
+    class Config:
+        use_enum_values = True
+
+
+class AnalysisHistoryResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    analyses: List[AnalysisResponse] = Field(..., description="Analyses for the session, newest first")
 
 
 class PrioritizationRequest(BaseModel):
     sessionId: str = Field(..., description="Session ID containing requirements to prioritize")
     weights: Optional[Weights] = Field(None, description="Custom weights for scoring criteria")
+    method: RankingMethod = Field(
+        RankingMethod.WEIGHTED_SUM,
+        description="Ranking method: weighted_sum (default), topsis, wsjf or ahp",
+    )
+    pairwiseComparisons: Optional[List[List[float]]] = Field(
+        None,
+        description=(
+            "AHP only: 5x5 reciprocal comparison matrix (Saaty 1-9 scale) ordered as "
+            "businessValue, cost, risk, urgency, stakeholderValue; derived from weights when omitted"
+        ),
+    )
+    simulations: Optional[int] = Field(
+        None,
+        ge=0,
+        le=10000,
+        description=(
+            "Monte Carlo simulations for rank uncertainty (0 disables; default UNCERTAINTY_SIMULATIONS, "
+            "reduced for large sessions)"
+        ),
+    )
+    scoreSpread: float = Field(1.0, ge=0, le=9, description="Uncertainty of each provided score (+/- on the 1-10 scale)")
+    topK: int = Field(10, ge=1, description="K for the probability of ranking in the top K")
+    includeReasoning: bool = Field(
+        False, description="Also generate reasoning text (per-criterion contributions are always returned)"
+    )
 
 
 class PrioritizationResponse(BaseModel):
@@ -85,6 +164,170 @@ class PrioritizationResponse(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata about the analysis")
 
 
+class ReleasePlanRequest(BaseModel):
+    sessionId: str = Field(..., description="Session with prioritization results to plan")
+    budget: float = Field(..., gt=0, description="Cost budget per release (sum of requirement cost scores)")
+    releases: int = Field(1, ge=1, le=12, description="Number of consecutive releases to fill")
+    timeBudgetMs: Optional[int] = Field(
+        None, ge=10, le=10000, description="Solver time limit; the best plan found so far is returned when reached"
+    )
+
+
+class PlannedRelease(BaseModel):
+    release: int = Field(..., description="Release number (1 = next release)")
+    budget: float = Field(..., description="Cost budget of the release")
+    totalCost: float = Field(..., description="Total cost of the selected requirements")
+    totalScore: float = Field(..., description="Total priority score of the selected requirements")
+    solver: str = Field(..., description="Solver used: all, dynamic_programming, branch_and_bound, branch_and_bound_timeout, dependency_branch_and_bound or dependency_branch_and_bound_timeout")
+    optimal: bool = Field(..., description="Whether the selection is proven optimal")
+    requirements: List[PrioritizedRequirement] = Field(..., description="Selected requirements in priority order")
+
+
+class MarginalRequirement(BaseModel):
+    requirement: PrioritizedRequirement = Field(..., description="Requirement left out of the first release")
+    additionalBudget: float = Field(..., description="Extra budget needed to add it, with its left-out prerequisites, to the first release as planned")
+
+
+class ReleasePlanResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    releases: List[PlannedRelease] = Field(..., description="Planned releases")
+    marginalRequirements: List[MarginalRequirement] = Field(
+        ..., description="Best excluded requirements by score per cost"
+    )
+    unplannedCount: int = Field(..., description="Requirements not assigned to any release")
+    processingTimeMs: int = Field(..., description="Processing time in milliseconds")
+
+
+class WeightProfileRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, description="Profile name, unique per user (e.g. Engineering)")
+    weights: Weights = Field(..., description="Scoring weights of the profile")
+
+
+class WeightProfile(BaseModel):
+    id: str = Field(..., description="Profile ID")
+    name: str = Field(..., description="Profile name")
+    weights: Weights = Field(..., description="Scoring weights")
+    createdAt: Optional[datetime] = Field(None, description="Creation timestamp")
+    updatedAt: Optional[datetime] = Field(None, description="Last update timestamp")
+
+
+class WeightProfilesResponse(BaseModel):
+    profiles: List[WeightProfile] = Field(..., description="The user's weight profiles, by name")
+
+
+class ScenarioRequest(BaseModel):
+    sessionId: str = Field(..., description="Session with requirements to rank")
+    profileIds: List[str] = Field(default_factory=list, description="Saved weight profiles to rank under")
+    profiles: List[WeightProfileRequest] = Field(
+        default_factory=list, description="Ad-hoc weights to rank under (not saved as profiles)"
+    )
+
+
+class ScenarioSummary(BaseModel):
+    name: str = Field(..., description="Scenario name (the profile name)")
+    profileId: Optional[str] = Field(None, description="Weight profile used, if saved")
+    weights: Weights = Field(..., description="Weights used")
+    averageScore: float = Field(..., description="Average priority score")
+    createdAt: Optional[datetime] = Field(None, description="When the scenario was ranked")
+
+
+class ScenarioRequirement(BaseModel):
+    id: str = Field(..., description="Requirement ID")
+    title: str = Field(..., description="Requirement title")
+    ranks: Dict[str, int] = Field(..., description="Rank per scenario name")
+    scores: Dict[str, float] = Field(..., description="Priority score per scenario name")
+
+
+class RankCorrelation(BaseModel):
+    first: str = Field(..., description="Scenario name")
+    second: str = Field(..., description="Scenario name")
+    kendallTau: Optional[float] = Field(
+        None, description="Kendall rank correlation (1 = same order, -1 = reversed; null below two requirements)"
+    )
+
+
+class ScenariosResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    scenarios: List[ScenarioSummary] = Field(..., description="Ranked scenarios")
+    requirements: List[ScenarioRequirement] = Field(
+        ..., description="Requirements side by side, ordered by their rank in the first scenario"
+    )
+    rankCorrelations: List[RankCorrelation] = Field(..., description="Kendall's tau for each pair of scenarios")
+    processingTimeMs: int = Field(..., description="Processing time in milliseconds")
+
+
+class ParetoLayer(BaseModel):
+    layer: int = Field(..., description="Dominance layer (1 = Pareto frontier)")
+    requirements: List[Requirement] = Field(..., description="Requirements in this layer")
+
+
+class ParetoResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    criteria: Dict[str, str] = Field(..., description="Optimization direction per criterion (max or min)")
+    layers: List[ParetoLayer] = Field(..., description="Dominance layers, frontier first")
+    layerCount: int = Field(..., description="Total number of dominance layers")
+    cached: bool = Field(..., description="Whether the layers came from the cache")
+    processingTimeMs: int = Field(..., description="Processing time in milliseconds")
+
+
+class DependencyEdge(BaseModel):
+    requirementId: str = Field(..., description="ID of the dependent requirement")
+    dependsOn: str = Field(..., description="ID of the prerequisite requirement")
+
+
+class DependenciesResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    dependencies: List[DependencyEdge] = Field(..., description="Dependency edges of the session")
+    reranked: bool = Field(False, description="Whether stored prioritization ranks were updated")
+
+
+class SearchHit(BaseModel):
+    requirementId: str = Field(..., description="Requirement ID")
+    title: str = Field(..., description="Requirement title")
+    sessionId: str = Field(..., description="Session containing the requirement")
+    sessionName: Optional[str] = Field(None, description="Session name")
+    sessionCreatedAt: Optional[datetime] = Field(None, description="Session creation timestamp")
+    score: float = Field(..., description="Relevance score (higher = better match)")
+    snippet: str = Field(..., description="HTML-escaped title or description excerpt with matches wrapped in <b> tags")
+
+
+class SearchResponse(BaseModel):
+    query: str = Field(..., description="Search query")
+    results: List[SearchHit] = Field(..., description="Matching requirements, best first")
+    total: int = Field(..., description="Total number of matches")
+    page: int = Field(..., description="Page number (1-based)")
+    pageSize: int = Field(..., description="Results per page")
+    processingTimeMs: int = Field(..., description="Processing time in milliseconds")
+
+
+class ThemesRequest(BaseModel):
+    clusters: Optional[int] = Field(None, ge=1, le=20, description="Number of clusters (default: based on session size)")
+    applyCategories: bool = Field(False, description="Store suggested categories for requirements without one")
+
+
+class ThemeCluster(BaseModel):
+    cluster: int = Field(..., description="Cluster number")
+    themes: List[str] = Field(..., description="Most characteristic terms")
+    suggestedCategory: RequirementCategory = Field(..., description="Category suggested for the cluster")
+    basis: str = Field(..., description="labels (members' categories), keywords or default")
+    requirementIds: List[str] = Field(..., description="Requirements in the cluster")
+
+
+class CategorySuggestion(BaseModel):
+    requirementId: str = Field(..., description="Requirement without a category")
+    suggestedCategory: RequirementCategory = Field(..., description="Suggested category")
+    cluster: int = Field(..., description="Cluster the suggestion comes from")
+
+
+class ThemesResponse(BaseModel):
+    sessionId: str = Field(..., description="Session ID")
+    clusters: List[ThemeCluster] = Field(..., description="Theme clusters")
+    suggestions: List[CategorySuggestion] = Field(..., description="Category suggestions for uncategorized requirements")
+    appliedCount: int = Field(..., description="Categories stored (when applyCategories is set)")
+    incremental: bool = Field(..., description="Whether a cached model was updated instead of built from scratch")
+    processingTimeMs: int = Field(..., description="Processing time in milliseconds")
+
+
 class LLMConfigRequest(BaseModel):
     apiKey: str = Field(..., description="LLM API key")
     baseUrl: str = Field(default="https://api.openai.com/v1", description="LLM API base URL")
@@ -97,6 +340,22 @@ class LLMConfigResponse(BaseModel):
     hasApiKey: bool = Field(..., description="Whether API key is configured (key value is not returned for security)")
 
 
+class ProfileSummary(BaseModel):
+    id: str = Field(..., description="Profile identifier (also returned in the X-ARIA-Profile-Id header)")
+    method: str = Field(..., description="HTTP method of the profiled request")
+    path: str = Field(..., description="Request path")
+    status: int = Field(..., description="Response status code")
+    durationMs: float = Field(..., description="Wall time of the request in milliseconds")
+    trigger: str = Field(..., description="Why the request was profiled: header or sample")
+    profiler: str = Field(..., description="Profiler used (pyinstrument or cProfile)")
+    format: str = Field(..., description="Artifact format: html (pyinstrument) or prof (cProfile)")
+    createdAt: datetime = Field(..., description="When the profile was captured")
+
+
+class ProfilesResponse(BaseModel):
+    profiles: List[ProfileSummary] = Field(..., description="Stored profiles, newest first")
+
+
 class ExportRequest(BaseModel):
     sessionId: Optional[str] = Field(None, description="Session ID of the report (optional)")
     requirements: List[PrioritizedRequirement] = Field(
@@ -0,0 +1,230 @@
+"""
+Opt-in request profiling for diagnosing slow endpoints in production.
+
+A request is profiled when an admin sends the ``X-ARIA-Profile: 1`` header or
+when it is picked by random sampling (``PROFILE_SAMPLE_RATE``, default 0).
+pyinstrument is used when installed (async-aware HTML reports), otherwise
+cProfile. Work offloaded to thread pools (e.g. PDF rendering) shows up as
+time spent waiting on the executor. Both profilers hook the interpreter
+globally, so only one request is profiled at a time; requests triggered
+while a profile is running are served unprofiled.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from auth import AuthService
+from database.database import SessionLocal
+from database.models import User
+
+logger = logging.getLogger("aria.profiling")
+
+PROFILE_HEADER = b"x-aria-profile"
+PROFILE_ID_HEADER = b"x-aria-profile-id"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "aria-profiles")))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# Held while a request is being profiled
+_active_profile = threading.Lock()
+
+
+class ProfileStore:
+    """Stores profile artifacts on disk with a JSON metadata sidecar each"""
+
+    def __init__(self, directory: Path = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES) -> None:
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, profile_id: str, artifact: bytes, extension: str, metadata: Dict) -> None:
+        """Persist a profile artifact and its metadata"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        metadata = dict(metadata, id=profile_id, format=extension)
+        (self.directory / f"{profile_id}.{extension}").write_bytes(artifact)
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(metadata))
+        self._prune()
+
+    def list(self) -> List[Dict]:
+        """Return metadata of stored profiles, newest first"""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                profiles.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda p: p.get("createdAt", ""), reverse=True)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Return metadata for a profile, or None if it does not exist"""
+        if not profile_id.isalnum():
+            return None
+        meta_path = self.directory / f"{profile_id}.json"
+        if not meta_path.exists():
+            return None
+        return json.loads(meta_path.read_text())
+
+    def artifact_path(self, metadata: Dict) -> Path:
+        return self.directory / f"{metadata['id']}.{metadata['format']}"
+
+    def _prune(self) -> None:
+        """Keep only the newest ``max_files`` profiles"""
+        metas = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for meta_path in metas[: max(0, len(metas) - self.max_files)]:
+            for path in self.directory.glob(f"{meta_path.stem}.*"):
+                path.unlink(missing_ok=True)
+
+
+def render_pstats(path: Path, limit: int = 60) -> str:
+    """Render a cProfile artifact as a cumulative-time text report"""
+    output = io.StringIO()
+    stats = pstats.Stats(str(path), stream=output)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return output.getvalue()
+
+
+def _is_admin_token(authorization: str) -> bool:
+    """Check that a bearer token belongs to an admin user"""
+    if not authorization.lower().startswith("bearer "):
+        return False
+    username = AuthService.verify_token(authorization[7:].strip())
+    if not username:
+        return False
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        return bool(user and user.is_admin)
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles selected requests and stores the results"""
+
+    def __init__(self, app, store: Optional[ProfileStore] = None, sample_rate: float = PROFILE_SAMPLE_RATE) -> None:
+        self.app = app
+        self.store = store or ProfileStore()
+        self.sample_rate = sample_rate
+
+    async def _trigger(self, scope) -> Optional[str]:
+        """Decide whether to profile this request; cheap when profiling is off"""
+        requested = False
+        authorization = ""
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = value not in (b"", b"0", b"false")
+            elif name == b"authorization":
+                authorization = value.decode("latin-1")
+        # The admin check queries the database; keep it off the event loop
+        if requested and await run_in_threadpool(_is_admin_token, authorization):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = await self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        if not _active_profile.acquire(blocking=False):
+            logger.info(f"Not profiling {scope['path']}: another profile is running")
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send, trigger)
+        finally:
+            _active_profile.release()
+
+    async def _profile(self, scope, receive, send, trigger: str) -> None:
+        """Run the request under the profiler and store the result"""
+        # Reserve the ID up front so it can be returned in the response headers
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_id.encode())
+                ]
+            await send(message)
+
+        profiler = _Profiler()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            try:
+                artifact, extension = profiler.output()
+                self.store.save(profile_id, artifact, extension, {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "durationMs": round(duration_ms, 2),
+                    "trigger": trigger,
+                    "profiler": profiler.name,
+                    "createdAt": datetime.now(timezone.utc).isoformat(),
+                })
+            except Exception as exc:
+                logger.warning(f"Failed to store profile: {exc}")
+
+
+class _Profiler:
+    """pyinstrument when available, cProfile otherwise"""
+
+    def __init__(self) -> None:
+        try:
+            from pyinstrument import Profiler
+            self.name = "pyinstrument"
+            self._profiler = Profiler(async_mode="enabled")
+        except ImportError:
+            self.name = "cProfile"
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.name == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.name == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def output(self):
+        """Return the artifact bytes and file extension"""
+        if self.name == "pyinstrument":
+            return self._profiler.output_html().encode("utf-8"), "html"
+        with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as f:
+            path = f.name
+        try:
+            self._profiler.dump_stats(path)
+            return Path(path).read_bytes(), "prof"
+        finally:
+            os.unlink(path)
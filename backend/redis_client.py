@@ -23,3 +23,12 @@ def get_redis_client() -> redis.Redis:
         socket_connect_timeout=5,
     )
 
+
+@lru_cache()
+def get_redis_binary_client() -> redis.Redis:
+    """Return a cached Redis client that returns raw bytes (for serialized payloads)."""
+    return redis.Redis.from_url(
+        get_redis_url(),
+        socket_timeout=5,
+        socket_connect_timeout=5,
+    )
@@ -0,0 +1,119 @@
+"""
+Shared application resources managed by the FastAPI lifespan.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from redis_client import get_redis_client
+from services.analysis_job_service import AnalysisJobService
+from services.export_service import ExportService
+from services.llm_client_registry import LLMClientRegistry
+
+logger = logging.getLogger("aria.resources")
+
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "4"))
+CLUSTERING_WORKERS = int(os.getenv("CLUSTERING_WORKERS", "2"))
+DB_WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "2"))
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+
+
+class AppResources:
+    """Container for process-wide resources: warmed up on start, drained on shutdown"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        llm_client_registry: LLMClientRegistry,
+        analysis_job_service: AnalysisJobService,
+        export_service: ExportService,
+    ) -> None:
+        self.engine = engine
+        self.llm_client_registry = llm_client_registry
+        self.analysis_job_service = analysis_job_service
+        self.export_service = export_service
+        self.export_executor: Optional[ThreadPoolExecutor] = None
+        self.clustering_executor: Optional[ThreadPoolExecutor] = None
+
+    async def startup(self) -> None:
+        """Open pools and warm caches before the first request is served"""
+        self.export_executor = ThreadPoolExecutor(
+            max_workers=EXPORT_WORKERS, thread_name_prefix="aria-export"
+        )
+        # numpy releases the GIL in the heavy steps; threads also share the cached theme models
+        self.clustering_executor = ThreadPoolExecutor(
+            max_workers=CLUSTERING_WORKERS, thread_name_prefix="aria-clustering"
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            loop.run_in_executor(self.export_executor, self._warm_database),
+            loop.run_in_executor(self.export_executor, self._warm_redis),
+            loop.run_in_executor(self.export_executor, self.export_service.warm_up),
+        )
+        self.analysis_job_service.start()
+        logger.info("Application resources ready")
+
+    def _warm_database(self) -> None:
+        """Open a few pooled connections so early requests skip the connect handshake"""
+        connections = []
+        try:
+            for _ in range(DB_WARM_CONNECTIONS):
+                connection = self.engine.connect()
+                connection.execute(text("SELECT 1"))
+                connections.append(connection)
+        except Exception as exc:
+            logger.warning(f"Database warm-up failed: {exc}")
+        finally:
+            # Returning the connections keeps them open in the pool
+            for connection in connections:
+                connection.close()
+
+    @staticmethod
+    def _warm_redis() -> None:
+        try:
+            get_redis_client().ping()
+        except RedisError as exc:
+            logger.warning(f"Redis warm-up failed: {exc}")
+
+    async def run_export(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking export in the export pool so it is tracked during shutdown"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.export_executor, partial(func, *args))
+
+    async def run_clustering(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run CPU-bound clustering in its own pool so it cannot starve exports"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.clustering_executor, partial(func, *args))
+
+    async def shutdown(self) -> None:
+        """Let in-flight work finish, then release every pool"""
+        await self.analysis_job_service.drain(SHUTDOWN_GRACE_SECONDS)
+        await self.analysis_job_service.stop()
+
+        if self.export_executor is not None:
+            # Blocks until running exports complete; run it off the event loop
+            await asyncio.to_thread(self.export_executor.shutdown, True)
+            self.export_executor = None
+
+        if self.clustering_executor is not None:
+            await asyncio.to_thread(self.clustering_executor.shutdown, True)
+            self.clustering_executor = None
+
+        await self.llm_client_registry.aclose()
+
+        try:
+            get_redis_client().close()
+        except RedisError:
+            pass
+        get_redis_client.cache_clear()
+
+        self.engine.dispose()
+        logger.info("Application resources released")
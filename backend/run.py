@@ -1,7 +1,10 @@
 import uvicorn
 from main_with_auth import app
+from migrations import run_all
 
 if __name__ == "__main__":
+    # Local development: make sure the schema exists before serving
+    run_all()
     uvicorn.run(
         "main_with_auth:app",
         host="0.0.0.0",
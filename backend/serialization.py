@@ -0,0 +1,54 @@
+"""
+Fast JSON responses and response compression.
+
+Large endpoints return `ORJSONResponse` directly with compact records
+(dataclasses) instead of Pydantic models. FastAPI then skips response-model
+validation and `jsonable_encoder`, and orjson serializes the records natively.
+The declared `response_model` still documents the shape in OpenAPI.
+"""
+
+import logging
+import os
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger("aria.serialization")
+
+# gzip (default), brotli (needs the brotli-asgi package) or off
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "gzip").lower()
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (dataclasses, datetimes and numpy natively)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def add_compression(app) -> None:
+    """Compress responses above COMPRESSION_MIN_SIZE bytes according to RESPONSE_COMPRESSION"""
+    if RESPONSE_COMPRESSION == "off":
+        return
+
+    if RESPONSE_COMPRESSION == "brotli":
+        try:
+            from brotli_asgi import BrotliMiddleware
+        except ImportError:
+            logger.warning("RESPONSE_COMPRESSION=brotli but brotli-asgi is not installed; using gzip")
+        else:
+            # Falls back to gzip for clients that do not accept br
+            app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+            return
+
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
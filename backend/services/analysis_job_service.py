@@ -0,0 +1,273 @@
+"""
+Background execution and persistence of LLM analyses.
+
+Jobs are queued in process memory, so every worker process keeps the
+heartbeat of its queued and running jobs fresh. Pending or running rows
+whose heartbeat went stale belong to a process that crashed or was
+restarted; the next heartbeat of any process marks them as failed.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from database.models import Analysis as DBAnalysis
+from models.requirement import Requirement
+from models.responses import AnalysisStatus
+
+if TYPE_CHECKING:
+    from services.llm_client_registry import LLMClientRegistry
+    from services.llm_config_service import LLMConfigService
+
+logger = logging.getLogger("aria.analysis")
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+HEARTBEAT_SECONDS = float(os.getenv("ANALYSIS_HEARTBEAT_SECONDS", "30"))
+# Unfinished jobs without a heartbeat for this long are considered lost
+ORPHAN_AFTER_SECONDS = float(os.getenv("ANALYSIS_ORPHAN_AFTER_SECONDS", str(4 * HEARTBEAT_SECONDS)))
+
+SHUTDOWN_ERROR = "Analysis was interrupted by a server shutdown"
+ORPHANED_ERROR = "Analysis was lost by a server restart or crash"
+UNFINISHED_STATUSES = (AnalysisStatus.PENDING.value, AnalysisStatus.RUNNING.value)
+
+
+@dataclass
+class _AnalysisJob:
+    analysis_id: str
+    requirements: List[Requirement]
+    prompt: Optional[str]
+    use_cache: bool
+    map_reduce: Optional[bool]
+
+
+class AnalysisJobService:
+    """Queues LLM analyses for an in-process async worker and stores their results.
+
+    The LLM client is resolved when a job runs, not when it is queued, so a
+    job always uses the configuration current at that time.
+    """
+
+    def __init__(
+        self,
+        config_service: "LLMConfigService",
+        client_registry: "LLMClientRegistry",
+        workers: int = ANALYSIS_WORKERS,
+    ) -> None:
+        self._config_service = config_service
+        self._client_registry = client_registry
+        self._worker_count = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Queued and running jobs of this process
+        self._active: Set[str] = set()
+
+    @staticmethod
+    def create_analysis(
+        db: Session,
+        session_id: str,
+        user_id: str,
+        prompt: Optional[str],
+        model: Optional[str],
+        summary: Optional[str] = None,
+    ) -> DBAnalysis:
+        """Create an analysis row; it is stored as completed when a summary is given"""
+        analysis = DBAnalysis(
+            session_id=session_id,
+            user_id=user_id,
+            prompt=prompt,
+            model=model,
+            status=AnalysisStatus.PENDING.value,
+            heartbeat_at=datetime.now(timezone.utc),
+        )
+        if summary is not None:
+            analysis.status = AnalysisStatus.COMPLETED.value
+            analysis.summary = summary
+            analysis.completed_at = datetime.now(timezone.utc)
+        db.add(analysis)
+        db.commit()
+        db.refresh(analysis)
+        return analysis
+
+    @staticmethod
+    def get_analysis(db: Session, analysis_id: str, user_id: str) -> Optional[DBAnalysis]:
+        """Get an analysis owned by a user"""
+        return db.query(DBAnalysis).filter(
+            DBAnalysis.id == analysis_id,
+            DBAnalysis.user_id == user_id
+        ).first()
+
+    @staticmethod
+    def get_session_analyses(db: Session, session_id: str) -> List[DBAnalysis]:
+        """Get all analyses for a session, newest first"""
+        return (
+            db.query(DBAnalysis)
+            .filter(DBAnalysis.session_id == session_id)
+            .order_by(DBAnalysis.created_at.desc())
+            .all()
+        )
+
+    def enqueue(
+        self,
+        analysis_id: str,
+        requirements: List[Requirement],
+        prompt: Optional[str] = None,
+        use_cache: bool = True,
+        map_reduce: Optional[bool] = None,
+    ) -> None:
+        """Schedule a pending analysis for the background workers"""
+        self._ensure_workers()
+        self._active.add(analysis_id)
+        self._queue.put_nowait(
+            _AnalysisJob(analysis_id, requirements, prompt, use_cache, map_reduce)
+        )
+
+    def start(self) -> None:
+        """Start the background workers and the heartbeat, which first fails jobs lost by earlier processes"""
+        self._ensure_workers()
+
+    def _ensure_workers(self) -> None:
+        """Start the worker tasks on the running event loop if needed"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self._worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception:
+                logger.exception(f"Analysis job {job.analysis_id} crashed")
+            finally:
+                self._active.discard(job.analysis_id)
+                self._queue.task_done()
+
+    async def _run(self, job: _AnalysisJob) -> None:
+        try:
+            db = SessionLocal()
+            try:
+                config = self._config_service.get_config(db)
+            finally:
+                db.close()
+            if config is None:
+                raise RuntimeError("LLM configuration is not set")
+
+            self._update(
+                job.analysis_id,
+                status=AnalysisStatus.RUNNING.value,
+                model=config.model,
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+            async with self._client_registry.lease(config.api_key, config.base_url, config.model) as service:
+                summary = await service.analyze_requirements(
+                    job.requirements,
+                    job.prompt,
+                    use_cache=job.use_cache,
+                    map_reduce=job.map_reduce,
+                )
+        except asyncio.CancelledError:
+            self._fail(job.analysis_id, SHUTDOWN_ERROR)
+            raise
+        except Exception as exc:
+            logger.exception(f"Analysis job {job.analysis_id} failed")
+            self._fail(job.analysis_id, str(exc))
+            return
+
+        self._update(
+            job.analysis_id,
+            status=AnalysisStatus.COMPLETED.value,
+            summary=summary,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+    @staticmethod
+    def _update(analysis_id: str, **fields) -> None:
+        """Persist job state changes using a dedicated DB session"""
+        db = SessionLocal()
+        try:
+            db.query(DBAnalysis).filter(DBAnalysis.id == analysis_id).update(fields)
+            db.commit()
+        finally:
+            db.close()
+
+    def _fail(self, analysis_id: str, error: str) -> None:
+        self._update(
+            analysis_id,
+            status=AnalysisStatus.FAILED.value,
+            error=error,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            try:
+                self._beat()
+            except Exception:
+                logger.exception("Analysis heartbeat failed")
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+
+    def _beat(self) -> None:
+        """Refresh this process's jobs, then fail unfinished jobs nobody refreshes any more"""
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            if self._active:
+                db.query(DBAnalysis).filter(DBAnalysis.id.in_(list(self._active))).update(
+                    {DBAnalysis.heartbeat_at: now}, synchronize_session=False
+                )
+            orphaned = db.query(DBAnalysis).filter(
+                DBAnalysis.status.in_(UNFINISHED_STATUSES),
+                func.coalesce(DBAnalysis.heartbeat_at, DBAnalysis.created_at)
+                < now - timedelta(seconds=ORPHAN_AFTER_SECONDS),
+            ).update(
+                {
+                    DBAnalysis.status: AnalysisStatus.FAILED.value,
+                    DBAnalysis.error: ORPHANED_ERROR,
+                    DBAnalysis.completed_at: now,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+        if orphaned:
+            logger.warning(f"Marked {orphaned} orphaned analysis jobs as failed")
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for queued jobs to finish; return True if drained"""
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._queue.qsize()} analysis jobs still queued at shutdown")
+            return False
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks and mark the jobs they did not finish as failed"""
+        tasks = self._workers + ([self._heartbeat_task] if self._heartbeat_task else [])
+        for task in tasks:
+            task.cancel()
+        # Running jobs record their own failure when cancelled
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat_task = None
+
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._fail(job.analysis_id, SHUTDOWN_ERROR)
+            self._queue.task_done()
+        self._active.clear()
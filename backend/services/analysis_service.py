@@ -2,18 +2,57 @@
 Service for leveraging OpenAI ChatGPT to analyze requirement sessions.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple
+import asyncio
 import os
-
-from openai import AsyncOpenAI
+import random
 
 from models.requirement import Requirement
+from services.llm_cache_service import LLMResponseCache
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+MAX_TOKENS = 900
+TEMPERATURE = 0.4
+
+# Map-reduce settings for sessions that do not fit into a single prompt
+CHUNK_TOKEN_BUDGET = int(os.getenv("LLM_CHUNK_TOKEN_BUDGET", "6000"))
+CHUNK_SUMMARY_MAX_TOKENS = 400
+MAX_CONCURRENT_CHUNKS = int(os.getenv("LLM_MAX_CONCURRENT_CHUNKS", "4"))
+MAX_RETRIES = 3
+RETRY_BASE_DELAY_SECONDS = 1.0
+
+ANALYST_PROMPT = (
+    "You are an expert product analyst. Review the provided requirements "
+    "and produce a prioritized list with actionable insights. Highlight "
+    "high-impact requirements, risks, and recommendations."
+)
+CHUNK_PROMPT = (
+    "You are an expert product analyst. The requirements below are one part "
+    "of a larger backlog. Summarize them concisely: list the highest-priority "
+    "requirements by ID with a one-line justification, and note notable risks "
+    "and dependencies."
+)
+MERGE_PROMPT = (
+    "You are an expert product analyst. You are given summaries of consecutive "
+    "parts of one requirements backlog. Combine them into a single prioritized "
+    "list with actionable insights. Highlight high-impact requirements, risks, "
+    "and recommendations."
+)
 
 
 class AnalysisService:
     """Wrapper around OpenAI Chat Completions for requirement analysis."""
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        client: Optional["AsyncOpenAI"] = None,
+        cache: Optional[LLMResponseCache] = None,
+    ) -> None:
         # Use provided config or fall back to environment variables
         self._api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self._api_key:
@@ -23,53 +62,233 @@ class AnalysisService:
 
         self._base_url = base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
         self._model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        
-        self._client = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+
+        # Reuse a shared (pooled) client when one is provided
+        if client is None:
+            # Imported lazily: the OpenAI SDK is slow to import and only needed here
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+        self._client = client
+        self._cache = cache
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.close()
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token for English text)."""
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def _format_requirement(req: Requirement) -> str:
+        return (
+            f"ID: {req.id}\n"
+            f"Title: {req.title}\n"
+            f"Description: {req.description}\n"
+            f"Business Value: {req.businessValue}\n"
+            f"Cost: {req.cost}\n"
+            f"Risk: {req.risk}\n"
+            f"Urgency: {req.urgency}\n"
+            f"Stakeholder Value: {req.stakeholderValue}\n"
+            f"Category: {req.category}"
+        )
+
+    @staticmethod
+    def _with_context(prompt: str, custom_prompt: Optional[str]) -> str:
+        if custom_prompt:
+            return prompt + f"\nUser context: {custom_prompt}"
+        return prompt
+
+    @classmethod
+    def _build_prompts(
+        cls,
+        requirements: List[Requirement],
+        custom_prompt: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Build the system prompt and the requirements summary message."""
+        requirements_summary = "\n\n".join(
+            [cls._format_requirement(req) for req in requirements]
+        )
+        return cls._with_context(ANALYST_PROMPT, custom_prompt), requirements_summary
+
+    @classmethod
+    def _chunk_requirements(cls, requirements: List[Requirement]) -> List[str]:
+        """Pack formatted requirements into chunks that fit the token budget."""
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for req in requirements:
+            block = cls._format_requirement(req)
+            block_tokens = cls._estimate_tokens(block)
+            if current and current_tokens + block_tokens > CHUNK_TOKEN_BUDGET:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(block)
+            current_tokens += block_tokens
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _fingerprint(self, system_prompt: str, requirements_summary: str) -> Optional[str]:
+        """Return the response cache key, or None when caching is disabled."""
+        if self._cache is None:
+            return None
+        return LLMResponseCache.fingerprint(
+            self._model, system_prompt, requirements_summary, TEMPERATURE
+        )
+
+    async def _create_completion(self, **kwargs):
+        """Call the Chat Completions API, retrying transient failures with backoff."""
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        retryable_errors = (RateLimitError, APIConnectionError, InternalServerError)
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await self._client.chat.completions.create(model=self._model, **kwargs)
+            except retryable_errors:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def _summarize_chunks(
+        self,
+        requirements: List[Requirement],
+        custom_prompt: Optional[str],
+    ) -> str:
+        """Map phase: summarize each chunk concurrently and join the summaries."""
+        chunks = self._chunk_requirements(requirements)
+        system_prompt = self._with_context(CHUNK_PROMPT, custom_prompt)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+
+        async def summarize(chunk: str) -> str:
+            async with semaphore:
+                response = await self._create_completion(
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": chunk},
+                    ],
+                    max_tokens=CHUNK_SUMMARY_MAX_TOKENS,
+                    temperature=TEMPERATURE,
+                )
+            message = response.choices[0].message.content
+            return message.strip() if message else ""
+
+        summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+        return "\n\n".join(
+            f"Part {index} of {len(summaries)}:\n{summary}"
+            for index, summary in enumerate(summaries, start=1)
+        )
+
+    async def _prepare(
+        self,
+        requirements: List[Requirement],
+        custom_prompt: Optional[str],
+        use_cache: bool,
+        map_reduce: Optional[bool],
+    ) -> Tuple[Optional[str], Optional[str], List[dict]]:
+        """Resolve the cache key, a cached answer, and the final request messages.
+
+        Large sessions (or an explicit ``map_reduce=True``) are summarized in
+        chunks first; the returned messages then ask the model to merge them.
+        """
+        system_prompt, requirements_summary = self._build_prompts(requirements, custom_prompt)
+        if map_reduce is None:
+            map_reduce = self._estimate_tokens(requirements_summary) > CHUNK_TOKEN_BUDGET
+        if map_reduce:
+            system_prompt = self._with_context(MERGE_PROMPT, custom_prompt)
+
+        fingerprint = self._fingerprint(system_prompt, requirements_summary)
+        if fingerprint is not None and use_cache:
+            cached = self._cache.get(fingerprint)
+            if cached is not None:
+                return fingerprint, cached, []
+
+        user_content = requirements_summary
+        if map_reduce:
+            user_content = await self._summarize_chunks(requirements, custom_prompt)
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content},
+        ]
+        return fingerprint, None, messages
 
     async def analyze_requirements(
         self,
         requirements: List[Requirement],
         custom_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        map_reduce: Optional[bool] = None,
     ) -> str:
         """Generate a prioritization summary using ChatGPT."""
         if not requirements:
             return "No requirements provided for analysis."
 
-        requirements_summary = "\n\n".join(
-            [
-                (
-                    f"ID: {req.id}\n"
-                    f"Title: {req.title}\n"
-                    f"Description: {req.description}\n"
-                    f"Business Value: {req.businessValue}\n"
-                    f"Cost: {req.cost}\n"
-                    f"Risk: {req.risk}\n"
-                    f"Urgency: {req.urgency}\n"
-                    f"Stakeholder Value: {req.stakeholderValue}\n"
-                    f"Category: {req.category}"
-                )
-                for req in requirements
-            ]
+        fingerprint, cached, messages = await self._prepare(
+            requirements, custom_prompt, use_cache, map_reduce
         )
+        if cached is not None:
+            return cached
 
-        system_prompt = (
-            "You are an expert product analyst. Review the provided requirements "
-            "and produce a prioritized list with actionable insights. Highlight "
-            "high-impact requirements, risks, and recommendations."
-        )
-        if custom_prompt:
-            system_prompt += f"\nUser context: {custom_prompt}"
-
-        response = await self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": requirements_summary},
-            ],
-            max_tokens=900,
-            temperature=0.4,
+        response = await self._create_completion(
+            messages=messages,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
         )
 
         message = response.choices[0].message.content
-        return message.strip() if message else "No analysis available."
+        if not message:
+            return "No analysis available."
+
+        summary = message.strip()
+        if fingerprint is not None:
+            self._cache.set(fingerprint, summary)
+        return summary
+
+    async def stream_analysis(
+        self,
+        requirements: List[Requirement],
+        custom_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        map_reduce: Optional[bool] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the prioritization summary incrementally as ChatGPT produces it."""
+        if not requirements:
+            yield "No requirements provided for analysis."
+            return
+
+        fingerprint, cached, messages = await self._prepare(
+            requirements, custom_prompt, use_cache, map_reduce
+        )
+        if cached is not None:
+            yield cached
+            return
+
+        stream = await self._create_completion(
+            messages=messages,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
+            stream=True,
+        )
+
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
 
+        # Persist the complete text so later (streamed or not) requests hit the cache
+        summary = "".join(parts).strip()
+        if not summary:
+            yield "No analysis available."
+        elif fingerprint is not None:
+            self._cache.set(fingerprint, summary)
@@ -0,0 +1,323 @@
+"""
+Offline theme clustering of requirements.
+
+Requirement texts become sparse TF-IDF rows (L2-normalized), which are grouped
+by spherical mini-batch k-means implemented with numpy, so no network, GPU or
+extra dependency is needed. Each cluster gets its top terms as themes and a
+suggested category, taken from the categories its members already have or,
+failing that, from category keywords.
+
+Models are cached per session: tokenized documents are keyed by a hash of
+their text, document frequencies are adjusted only for added or removed
+documents, and k-means is warm-started from the previous centroids, so
+re-clustering after small edits is cheap.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("aria.clustering")
+
+CLUSTER_CACHE_MAX_SESSIONS = int(os.getenv("CLUSTER_CACHE_MAX_SESSIONS", "256"))
+MAX_CLUSTERS = 20
+THEME_TERMS = 5
+BATCH_SIZE = 256
+MAX_ITERATIONS = 100
+WARM_ITERATIONS = 20
+# Share of rows allowed to change cluster between convergence checks
+CONVERGENCE_TOLERANCE = 0.001
+# Iterations between full assignments of every row (the batch alone decides the updates)
+CONVERGENCE_CHECK_INTERVAL = 5
+RANDOM_SEED = 0
+
+_WORD = re.compile(r"[a-z][a-z0-9]{2,}")
+STOP_WORDS = frozenset("""
+    about above after again against all also and any are as be because been before being below between
+    both but can could did does doing down during each few for from further had has have having her here
+    him his how into its itself just more most must need needs not now off once only other our out over
+    own same should some such than that the their them then there these they this those through too under
+    until use used user users using very was way were what when where which while who whom why will with
+    would you your able allow allows ensure new support system
+""".split())
+
+# Keywords that point at a category when a cluster has no labelled members
+CATEGORY_KEYWORDS = {
+    "BUG_FIX": ("bug", "fix", "error", "crash", "broken", "issue", "defect", "incorrect", "fail", "failure"),
+    "COMPLIANCE": ("compliance", "gdpr", "audit", "regulation", "regulatory", "legal", "policy", "privacy", "consent", "hipaa"),
+    "TECHNICAL": ("refactor", "performance", "database", "migration", "infrastructure", "upgrade", "architecture", "scalability", "latency", "debt"),
+    "ENHANCEMENT": ("improve", "improved", "enhance", "enhancement", "better", "optimize", "existing", "extend", "simplify", "faster"),
+    "FEATURE": ("feature", "add", "create", "implement", "introduce", "enable", "build", "integration", "dashboard", "report"),
+}
+DEFAULT_CATEGORY = "FEATURE"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words without stop words, with a plural 's' stripped"""
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if word.endswith("s") and not word.endswith("ss") and len(word) > 4:
+            word = word[:-1]
+        if word not in STOP_WORDS:
+            tokens.append(word)
+    return tokens
+
+
+_CATEGORY_TERMS = {category: set(tokenize(" ".join(words))) for category, words in CATEGORY_KEYWORDS.items()}
+
+
+@dataclass
+class ThemeCluster:
+    themes: List[str]
+    suggested_category: str
+    # "labels" (members' categories), "keywords" or "default"
+    basis: str
+    members: List[int]
+
+
+@dataclass
+class SessionThemeModel:
+    """Cached vocabulary, document statistics and centroids of one session"""
+
+    vocabulary: Dict[str, int] = field(default_factory=dict)
+    terms: List[str] = field(default_factory=list)
+    document_frequency: List[int] = field(default_factory=list)
+    # Term counts per document, keyed by a hash of the document text
+    documents: Dict[str, Counter] = field(default_factory=dict)
+    centroids: Optional[object] = None
+    # Rows each centroid has averaged so far, so warm starts continue the running mean
+    centroid_counts: Optional[object] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ClusteringService:
+    """TF-IDF + spherical mini-batch k-means with an LRU cache of per-session models"""
+
+    def __init__(self, max_sessions: int = CLUSTER_CACHE_MAX_SESSIONS) -> None:
+        self._models: "OrderedDict[str, SessionThemeModel]" = OrderedDict()
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+
+    def _model(self, session_id: str) -> Tuple[SessionThemeModel, bool]:
+        with self._lock:
+            model = self._models.get(session_id)
+            if model is not None:
+                self._models.move_to_end(session_id)
+                return model, True
+            model = SessionThemeModel()
+            self._models[session_id] = model
+            while len(self._models) > self._max_sessions:
+                self._models.popitem(last=False)
+            return model, False
+
+    def cluster(
+        self, session_id: str, records: Sequence, k: Optional[int] = None
+    ) -> Tuple[List[ThemeCluster], bool]:
+        """Cluster a session's requirements; also returns whether a cached model was reused"""
+        model, cached = self._model(session_id)
+        with model.lock:
+            keys = [self._update_documents(model, record) for record in records]
+            self._drop_stale_documents(model, set(keys))
+            rows = self._tfidf(model, keys)
+
+            clusters = k or max(2, round((len(records) / 2) ** 0.5))
+            clusters = max(1, min(clusters, MAX_CLUSTERS, len(records)))
+            labels = self._kmeans(model, rows, clusters, warm=cached)
+
+            # Describe from a snapshot; other requests may grow the model once the lock is released
+            centroids = model.centroids
+            terms = list(model.terms)
+            category_columns = {
+                category: [model.vocabulary[term] for term in category_terms if term in model.vocabulary]
+                for category, category_terms in _CATEGORY_TERMS.items()
+            }
+
+        return self._describe(centroids, terms, category_columns, records, labels), cached
+
+    @staticmethod
+    def _update_documents(model: SessionThemeModel, record) -> str:
+        text = f"{record.title}\n{record.description}"
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        if key not in model.documents:
+            counts = Counter(tokenize(text))
+            for term in counts:
+                index = model.vocabulary.get(term)
+                if index is None:
+                    model.vocabulary[term] = len(model.terms)
+                    model.terms.append(term)
+                    model.document_frequency.append(1)
+                else:
+                    model.document_frequency[index] += 1
+            model.documents[key] = counts
+        return key
+
+    @staticmethod
+    def _drop_stale_documents(model: SessionThemeModel, current: set) -> None:
+        for key in [key for key in model.documents if key not in current]:
+            for term in model.documents.pop(key):
+                model.document_frequency[model.vocabulary[term]] -= 1
+
+    @staticmethod
+    def _tfidf(model: SessionThemeModel, keys: List[str]):
+        """Sparse L2-normalized TF-IDF rows as (row ids, column ids, values, row count)"""
+        # numpy is loaded on first use to keep application start-up fast
+        import numpy as np
+
+        documents = len(set(keys))
+        frequency = np.maximum(np.asarray(model.document_frequency, dtype=float), 1)
+        idf = np.log((1 + documents) / (1 + frequency)) + 1
+
+        row_ids, columns, counts = [], [], []
+        for row, key in enumerate(keys):
+            for term, count in model.documents[key].items():
+                row_ids.append(row)
+                columns.append(model.vocabulary[term])
+                counts.append(count)
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        values = (1 + np.log(np.asarray(counts, dtype=float))) * idf[columns] if counts else np.zeros(0)
+
+        norms = np.sqrt(np.bincount(row_ids, weights=values ** 2, minlength=len(keys)))
+        values = values / np.where(norms > 0, norms, 1)[row_ids]
+        return row_ids, columns, values, len(keys)
+
+    @staticmethod
+    def _similarities(rows, centroids):
+        """Cosine similarity of every sparse row to every (normalized) centroid"""
+        import numpy as np
+
+        row_ids, columns, values, count = rows
+        result = np.zeros((count, len(centroids)))
+        if len(values) == 0:
+            return result
+        # Entries are grouped by row, so each row's dot products are one segment sum
+        starts = np.searchsorted(row_ids, np.arange(count))
+        filled = np.bincount(row_ids, minlength=count) > 0
+        weights = np.ascontiguousarray(centroids.T)[columns]
+        weights *= values[:, None]
+        result[filled] = np.add.reduceat(weights, starts[filled])
+        return result
+
+    def _kmeans(self, model: SessionThemeModel, rows, clusters: int, warm: bool):
+        import numpy as np
+
+        count = rows[3]
+        width = len(model.terms)
+        rng = np.random.default_rng(RANDOM_SEED)
+
+        centroids = model.centroids
+        if warm and centroids is not None and len(centroids) == clusters:
+            # The vocabulary only grows; new terms start at zero weight
+            centroids = np.pad(centroids, ((0, 0), (0, width - centroids.shape[1])))
+            seen = model.centroid_counts.copy()
+            iterations = WARM_ITERATIONS
+        else:
+            centroids = self._initial_centroids(rows, width, clusters, rng)
+            seen = np.zeros(clusters)
+            iterations = MAX_ITERATIONS
+
+        batch_size = min(BATCH_SIZE, count)
+        labels = None
+        for iteration in range(1, iterations + 1):
+            batch = np.sort(rng.choice(count, size=batch_size, replace=False))
+            batch_rows = self._batch_rows(rows, batch)
+            batch_labels = self._similarities(batch_rows, centroids).argmax(axis=1)
+
+            # Mini-batch updates keep nudging borderline rows; stop once assignments settle.
+            # A batch of every row already is the full assignment, otherwise check periodically.
+            if batch_size == count or iteration % CONVERGENCE_CHECK_INTERVAL == 0:
+                current = batch_labels if batch_size == count else self._similarities(rows, centroids).argmax(axis=1)
+                if labels is not None and (current != labels).sum() <= count * CONVERGENCE_TOLERANCE:
+                    break
+                labels = current
+
+            # Per-centre learning rate 1 / (points seen): a running mean of the assigned rows
+            batch_ids, batch_columns, batch_values, _ = batch_rows
+            flat = batch_labels[batch_ids] * width + batch_columns
+            sums = np.bincount(flat, weights=batch_values, minlength=clusters * width).reshape(clusters, width)
+            added = np.bincount(batch_labels, minlength=clusters)
+            total = seen + added
+            active = added > 0
+            centroids[active] = (
+                centroids[active] * (seen[active] / total[active])[:, None]
+                + sums[active] / total[active][:, None]
+            )
+            seen = total
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids = centroids / np.where(norms > 0, norms, 1)
+
+        model.centroids = centroids
+        model.centroid_counts = seen
+        return self._similarities(rows, centroids).argmax(axis=1)
+
+    @staticmethod
+    def _batch_rows(rows, batch):
+        """The sparse rows listed in `batch` (sorted row ids), renumbered from 0"""
+        import numpy as np
+
+        row_ids, columns, values, count = rows
+        position = np.full(count, -1, dtype=np.int64)
+        position[batch] = np.arange(len(batch))
+        entries = position[row_ids] >= 0
+        return position[row_ids[entries]], columns[entries], values[entries], len(batch)
+
+    def _initial_centroids(self, rows, width: int, clusters: int, rng):
+        """k-means++ seeding on cosine distance"""
+        import numpy as np
+
+        row_ids, columns, values, count = rows
+
+        def dense_row(row: int):
+            centre = np.zeros(width)
+            entries = row_ids == row
+            centre[columns[entries]] = values[entries]
+            return centre
+
+        centroids = [dense_row(int(rng.integers(count)))]
+        distance = 1 - self._similarities(rows, centroids[0][None, :])[:, 0]
+        for _ in range(1, clusters):
+            weights = np.clip(distance, 0, None) ** 2
+            if weights.sum() == 0:
+                row = int(rng.integers(count))
+            else:
+                row = int(rng.choice(count, p=weights / weights.sum()))
+            centroids.append(dense_row(row))
+            distance = np.minimum(distance, 1 - self._similarities(rows, centroids[-1][None, :])[:, 0])
+        return np.array(centroids)
+
+    @staticmethod
+    def _describe(
+        centroids, terms: List[str], category_columns: Dict[str, List[int]], records: Sequence, labels
+    ) -> List[ThemeCluster]:
+        import numpy as np
+
+        clusters = []
+        for label in range(len(centroids)):
+            members = np.flatnonzero(labels == label).tolist()
+            if not members:
+                continue
+            centroid = centroids[label]
+            top = [index for index in np.argsort(-centroid)[:THEME_TERMS] if centroid[index] > 0]
+            themes = [terms[index] for index in top]
+
+            known = Counter(record.category for record in (records[i] for i in members) if record.category)
+            if known:
+                category, basis = known.most_common(1)[0][0], "labels"
+            else:
+                weights = {
+                    category: float(centroid[columns].sum())
+                    for category, columns in category_columns.items()
+                }
+                category = max(weights, key=weights.get)
+                if weights[category] > 0:
+                    basis = "keywords"
+                else:
+                    category, basis = DEFAULT_CATEGORY, "default"
+
+            clusters.append(ThemeCluster(themes, category, basis, members))
+        return clusters
@@ -2,13 +2,35 @@
 Database service for requirements and sessions
 """
 
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 from datetime import datetime
 
-from database.models import Session as DBSession, Requirement as DBRequirement, PrioritizedRequirement as DBPrioritizedRequirement
-from models.requirement import Requirement, PrioritizedRequirement, RequirementCategory
+from database.models import (
+    Session as DBSession, Requirement as DBRequirement, PrioritizedRequirement as DBPrioritizedRequirement,
+    RequirementDependency as DBRequirementDependency, WeightProfile as DBWeightProfile,
+    Scenario as DBScenario, ScenarioResult as DBScenarioResult,
+)
+from models.requirement import Requirement, PrioritizedRequirement
+from models.compact import RequirementRecord, PrioritizedRecord, normalize_category, to_models
+
+RequirementLike = Union[Requirement, RequirementRecord]
+PrioritizedLike = Union[PrioritizedRequirement, PrioritizedRecord]
+
+# Column order matches the RequirementRecord fields
+REQUIREMENT_COLUMNS = (
+    DBRequirement.external_id,
+    DBRequirement.title,
+    DBRequirement.description,
+    DBRequirement.business_value,
+    DBRequirement.cost,
+    DBRequirement.risk,
+    DBRequirement.urgency,
+    DBRequirement.stakeholder_value,
+    DBRequirement.category,
+)
 
 
 class DatabaseService:
@@ -27,140 +49,294 @@ class DatabaseService:
         return db_session
     
     @staticmethod
-    def save_requirements(db: Session, session_id: str, requirements: List[Requirement]) -> List[DBRequirement]:
-        """Save requirements to database"""
-        db_requirements = []
-        for req in requirements:
-            category = None
-            if req.category:
-                category = (
-                    req.category.value
-                    if isinstance(req.category, RequirementCategory)
-                    else str(req.category)
-                )
-
-            db_req = DBRequirement(
-                session_id=session_id,
-                external_id=req.id,
-                title=req.title,
-                description=req.description,
-                business_value=req.businessValue,
-                cost=req.cost,
-                risk=req.risk,
-                urgency=req.urgency,
-                stakeholder_value=req.stakeholderValue,
-                category=category
-            )
-            db.add(db_req)
-            db_requirements.append(db_req)
-        
+    def save_requirements(db: Session, session_id: str, requirements: Sequence[RequirementLike]) -> int:
+        """Save requirements to database (single bulk INSERT)"""
+        rows = [
+            {
+                "session_id": session_id,
+                "external_id": req.id,
+                "title": req.title,
+                "description": req.description,
+                "business_value": req.businessValue,
+                "cost": req.cost,
+                "risk": req.risk,
+                "urgency": req.urgency,
+                "stakeholder_value": req.stakeholderValue,
+                "category": normalize_category(req.category),
+            }
+            for req in requirements
+        ]
+        if rows:
+            db.execute(insert(DBRequirement), rows)
+        edges = [
+            {"session_id": session_id, "requirement_id": req.id, "depends_on": prerequisite}
+            for req in requirements
+            for prerequisite in dict.fromkeys(req.dependsOn or ())
+        ]
+        if edges:
+            db.execute(insert(DBRequirementDependency), edges)
         db.commit()
-        for db_req in db_requirements:
-            db.refresh(db_req)
-        
-        return db_requirements
+        return len(rows)
     
     @staticmethod
     def save_prioritized_requirements(
         db: Session, 
         session_id: str, 
-        prioritized_requirements: List[PrioritizedRequirement]
-    ) -> List[DBPrioritizedRequirement]:
-        """Save prioritized requirements to database"""
-        # First, get the requirements from the session
-        db_requirements = db.query(DBRequirement).filter(DBRequirement.session_id == session_id).all()
-        req_map = {req.external_id: req.id for req in db_requirements}
+        prioritized_requirements: Sequence[PrioritizedLike]
+    ) -> int:
+        """Save prioritized requirements to database (single bulk INSERT)"""
+        # Map external IDs to requirement row IDs without loading full ORM objects
+        req_map = dict(
+            db.query(DBRequirement.external_id, DBRequirement.id)
+            .filter(DBRequirement.session_id == session_id)
+            .all()
+        )
         
         # Clear existing prioritized requirements for this session
         db.query(DBPrioritizedRequirement).filter(DBPrioritizedRequirement.session_id == session_id).delete()
         
-        db_prioritized = []
-        for prioritized_req in prioritized_requirements:
-            requirement_id = req_map.get(prioritized_req.id)
-            if requirement_id:
-                db_prioritized_req = DBPrioritizedRequirement(
-                    session_id=session_id,
-                    requirement_id=requirement_id,
-                    priority_score=prioritized_req.priorityScore,
-                    rank=prioritized_req.rank,
-                    confidence=prioritized_req.confidence,
-                    reasoning=prioritized_req.reasoning
-                )
-                db.add(db_prioritized_req)
-                db_prioritized.append(db_prioritized_req)
-        
+        rows = [
+            {
+                "session_id": session_id,
+                "requirement_id": req_map[prioritized_req.id],
+                "priority_score": prioritized_req.priorityScore,
+                "rank": prioritized_req.rank,
+                "confidence": prioritized_req.confidence,
+                "reasoning": prioritized_req.reasoning,
+                "contributions": prioritized_req.contributions,
+            }
+            for prioritized_req in prioritized_requirements
+            if prioritized_req.id in req_map
+        ]
+        if rows:
+            db.execute(insert(DBPrioritizedRequirement), rows)
         db.commit()
-        for db_prioritized_req in db_prioritized:
-            db.refresh(db_prioritized_req)
-        
-        return db_prioritized
+        return len(rows)
     
+    @staticmethod
+    def get_requirement_records(db: Session, session_id: str) -> List[RequirementRecord]:
+        """Get requirements as compact records (column query, no ORM objects)"""
+        rows = db.query(*REQUIREMENT_COLUMNS).filter(DBRequirement.session_id == session_id).all()
+        records = [
+            RequirementRecord(*row[:-1], normalize_category(row[-1]))
+            for row in rows
+        ]
+        return DatabaseService._attach_dependencies(db, session_id, records)
+
+    @staticmethod
+    def get_prioritized_records(db: Session, session_id: str) -> List[PrioritizedRecord]:
+        """Get prioritized requirements as compact records, ordered by rank"""
+        rows = (
+            db.query(
+                *REQUIREMENT_COLUMNS,
+                DBPrioritizedRequirement.priority_score,
+                DBPrioritizedRequirement.rank,
+                DBPrioritizedRequirement.confidence,
+                DBPrioritizedRequirement.reasoning,
+                DBPrioritizedRequirement.contributions,
+            )
+            .join(DBRequirement, DBPrioritizedRequirement.requirement_id == DBRequirement.id)
+            .filter(DBPrioritizedRequirement.session_id == session_id)
+            .order_by(DBPrioritizedRequirement.rank)
+            .all()
+        )
+        records = [
+            PrioritizedRecord(*row[:8], normalize_category(row[8]), None, *row[9:])
+            for row in rows
+        ]
+        return DatabaseService._attach_dependencies(db, session_id, records)
+
+    @staticmethod
+    def fill_missing_categories(db: Session, session_id: str, categories: Dict[str, str]) -> int:
+        """Set categories by external ID where none is stored yet; returns rows updated"""
+        by_category: Dict[str, List[str]] = {}
+        for requirement_id, category in categories.items():
+            by_category.setdefault(category, []).append(requirement_id)
+        updated = 0
+        for category, requirement_ids in by_category.items():
+            updated += (
+                db.query(DBRequirement)
+                .filter(
+                    DBRequirement.session_id == session_id,
+                    DBRequirement.external_id.in_(requirement_ids),
+                    DBRequirement.category.is_(None),
+                )
+                .update({DBRequirement.category: category}, synchronize_session=False)
+            )
+        db.commit()
+        return updated
+
+    @staticmethod
+    def get_dependencies(db: Session, session_id: str) -> List[Tuple[str, str]]:
+        """Get a session's dependency edges as (requirement ID, prerequisite ID)"""
+        return [
+            tuple(row)
+            for row in db.query(DBRequirementDependency.requirement_id, DBRequirementDependency.depends_on)
+            .filter(DBRequirementDependency.session_id == session_id)
+            .order_by(DBRequirementDependency.created_at, DBRequirementDependency.requirement_id, DBRequirementDependency.depends_on)
+            .all()
+        ]
+
+    @staticmethod
+    def add_dependency(db: Session, session_id: str, requirement_id: str, depends_on: str) -> None:
+        """Store a dependency edge"""
+        db.add(DBRequirementDependency(session_id=session_id, requirement_id=requirement_id, depends_on=depends_on))
+        db.commit()
+
+    @staticmethod
+    def remove_dependency(db: Session, session_id: str, requirement_id: str, depends_on: str) -> bool:
+        """Delete a dependency edge; returns False if it did not exist"""
+        deleted = (
+            db.query(DBRequirementDependency)
+            .filter(
+                DBRequirementDependency.session_id == session_id,
+                DBRequirementDependency.requirement_id == requirement_id,
+                DBRequirementDependency.depends_on == depends_on,
+            )
+            .delete()
+        )
+        db.commit()
+        return deleted > 0
+
+    @staticmethod
+    def get_weight_profiles(db: Session, user_id: str) -> List[DBWeightProfile]:
+        """Get a user's weight profiles ordered by name"""
+        return (
+            db.query(DBWeightProfile)
+            .filter(DBWeightProfile.user_id == user_id)
+            .order_by(DBWeightProfile.name)
+            .all()
+        )
+
+    @staticmethod
+    def get_weight_profile(db: Session, profile_id: str, user_id: str) -> Optional[DBWeightProfile]:
+        """Get a weight profile by ID (only if it belongs to the user)"""
+        return (
+            db.query(DBWeightProfile)
+            .filter(DBWeightProfile.id == profile_id, DBWeightProfile.user_id == user_id)
+            .first()
+        )
+
+    @staticmethod
+    def weight_profile_name_taken(db: Session, user_id: str, name: str, exclude_id: Optional[str] = None) -> bool:
+        """Whether the user already has another profile with this name"""
+        query = db.query(DBWeightProfile.id).filter(DBWeightProfile.user_id == user_id, DBWeightProfile.name == name)
+        if exclude_id is not None:
+            query = query.filter(DBWeightProfile.id != exclude_id)
+        return query.first() is not None
+
+    @staticmethod
+    def save_weight_profile(
+        db: Session, user_id: str, name: str, weights: dict, profile: Optional[DBWeightProfile] = None
+    ) -> DBWeightProfile:
+        """Create a weight profile, or update the given one"""
+        if profile is None:
+            profile = DBWeightProfile(user_id=user_id, name=name, weights=weights)
+            db.add(profile)
+        else:
+            profile.name = name
+            profile.weights = weights
+        db.commit()
+        db.refresh(profile)
+        return profile
+
+    @staticmethod
+    def delete_weight_profile(db: Session, profile: DBWeightProfile) -> None:
+        """Delete a weight profile (scenarios ranked with it are kept)"""
+        db.delete(profile)
+        db.commit()
+
+    @staticmethod
+    def save_scenarios(db: Session, session_id: str, records: Sequence, rankings: Sequence) -> None:
+        """Store scenario rankings, replacing earlier scenarios of the same name (bulk INSERTs)"""
+        names = [ranking.name for ranking in rankings]
+        stale = [
+            scenario_id for (scenario_id,) in
+            db.query(DBScenario.id).filter(DBScenario.session_id == session_id, DBScenario.name.in_(names)).all()
+        ]
+        if stale:
+            db.query(DBScenarioResult).filter(DBScenarioResult.scenario_id.in_(stale)).delete(synchronize_session=False)
+            db.query(DBScenario).filter(DBScenario.id.in_(stale)).delete(synchronize_session=False)
+
+        # IDs are assigned here so scenarios and their results go in one INSERT each
+        scenario_ids = [str(uuid.uuid4()) for _ in rankings]
+        db.execute(insert(DBScenario), [
+            {
+                "id": scenario_id,
+                "session_id": session_id,
+                "name": ranking.name,
+                "profile_id": ranking.profile_id,
+                "weights": ranking.weights.model_dump(),
+            }
+            for scenario_id, ranking in zip(scenario_ids, rankings)
+        ])
+        db.execute(insert(DBScenarioResult), [
+            {
+                "scenario_id": scenario_id,
+                "requirement_id": record.id,
+                "priority_score": score,
+                "rank": rank,
+            }
+            for scenario_id, ranking in zip(scenario_ids, rankings)
+            for record, score, rank in zip(records, ranking.scores, ranking.ranks)
+        ])
+        db.commit()
+
+    @staticmethod
+    def get_scenarios(db: Session, session_id: str) -> List[Tuple[DBScenario, List[Tuple[str, float, int]]]]:
+        """Get a session's stored scenarios (oldest first) with their (requirement ID, score, rank) rows"""
+        scenarios = (
+            db.query(DBScenario)
+            .filter(DBScenario.session_id == session_id)
+            .order_by(DBScenario.created_at, DBScenario.name)
+            .all()
+        )
+        if not scenarios:
+            return []
+        rows: Dict[str, List[Tuple[str, float, int]]] = {scenario.id: [] for scenario in scenarios}
+        for scenario_id, requirement_id, score, rank in (
+            db.query(
+                DBScenarioResult.scenario_id,
+                DBScenarioResult.requirement_id,
+                DBScenarioResult.priority_score,
+                DBScenarioResult.rank,
+            )
+            .filter(DBScenarioResult.scenario_id.in_(list(rows)))
+            .all()
+        ):
+            rows[scenario_id].append((requirement_id, score, rank))
+        return [(scenario, rows[scenario.id]) for scenario in scenarios]
+
+    @staticmethod
+    def _attach_dependencies(db: Session, session_id: str, records: List[RequirementRecord]) -> list:
+        """Fill each record's dependsOn from the session's dependency edges"""
+        prerequisites: Dict[str, List[str]] = {}
+        for requirement_id, depends_on in DatabaseService.get_dependencies(db, session_id):
+            prerequisites.setdefault(requirement_id, []).append(depends_on)
+        if prerequisites:
+            for record in records:
+                record.dependsOn = prerequisites.get(record.id)
+        return records
+
+    @staticmethod
+    def get_requirements_version(db: Session, session_id: str) -> str:
+        """Cheap fingerprint of a session's requirements for caching derived results"""
+        count, latest = (
+            db.query(func.count(DBRequirement.id), func.max(DBRequirement.created_at))
+            .filter(DBRequirement.session_id == session_id)
+            .one()
+        )
+        return f"{count}-{latest.timestamp() if latest else 0:.6f}"
+
     @staticmethod
     def get_requirements(db: Session, session_id: str) -> List[Requirement]:
         """Get requirements from database"""
-        db_requirements = db.query(DBRequirement).filter(DBRequirement.session_id == session_id).all()
-        
-        requirements = []
-        for db_req in db_requirements:
-            category = None
-            if db_req.category:
-                try:
-                    category = RequirementCategory(db_req.category)
-                except ValueError:
-                    pass
-            
-            req = Requirement(
-                id=db_req.external_id,
-                title=db_req.title,
-                description=db_req.description,
-                businessValue=db_req.business_value,
-                cost=db_req.cost,
-                risk=db_req.risk,
-                urgency=db_req.urgency,
-                stakeholderValue=db_req.stakeholder_value,
-                category=category
-            )
-            requirements.append(req)
-        
-        return requirements
+        return to_models(DatabaseService.get_requirement_records(db, session_id))
     
     @staticmethod
     def get_prioritized_requirements(db: Session, session_id: str) -> List[PrioritizedRequirement]:
         """Get prioritized requirements from database"""
-        db_prioritized = db.query(DBPrioritizedRequirement).filter(
-            DBPrioritizedRequirement.session_id == session_id
-        ).join(DBRequirement).order_by(DBPrioritizedRequirement.rank).all()
-        
-        prioritized_requirements = []
-        for db_prioritized_req in db_prioritized:
-            # Get the original requirement
-            db_req = db_prioritized_req.requirement
-            
-            category = None
-            if db_req.category:
-                try:
-                    category = RequirementCategory(db_req.category)
-                except ValueError:
-                    pass
-            
-            req = PrioritizedRequirement(
-                id=db_req.external_id,
-                title=db_req.title,
-                description=db_req.description,
-                businessValue=db_req.business_value,
-                cost=db_req.cost,
-                risk=db_req.risk,
-                urgency=db_req.urgency,
-                stakeholderValue=db_req.stakeholder_value,
-                category=category,
-                priorityScore=db_prioritized_req.priority_score,
-                rank=db_prioritized_req.rank,
-                confidence=db_prioritized_req.confidence,
-                reasoning=db_prioritized_req.reasoning
-            )
-            prioritized_requirements.append(req)
-        
-        return prioritized_requirements
+        return to_models(DatabaseService.get_prioritized_records(db, session_id))
     
     @staticmethod
     def get_user_sessions(db: Session, user_id: str) -> List[DBSession]:
@@ -0,0 +1,197 @@
+"""
+Requirement dependency graph.
+
+An edge (requirement, prerequisite) means the prerequisite must be delivered
+first. The graph is kept as adjacency sets in both directions so edges can be
+added and removed incrementally; adding an edge only searches the part of the
+graph reachable from it for a cycle. Edges are persisted per session in the
+requirement_dependencies table.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Edge = Tuple[str, str]
+
+
+class DependencyCycleError(ValueError):
+    """Raised when dependencies would form a cycle"""
+
+    def __init__(self, cycle: List[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+
+
+class DependencyGraph:
+    """Directed graph of requirement IDs (prerequisite -> dependent)"""
+
+    def __init__(self, nodes: Iterable[str] = (), edges: Iterable[Edge] = ()) -> None:
+        self._prerequisites: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        for node in nodes:
+            self.add_node(node)
+        for requirement, prerequisite in edges:
+            self._link(requirement, prerequisite)
+
+    @classmethod
+    def from_records(cls, records: Sequence, validate: bool = True) -> "DependencyGraph":
+        """Build the graph from the records' dependsOn lists
+
+        Stored graphs were validated when their edges were added, so callers
+        may skip the unknown-ID and cycle checks with validate=False.
+        """
+        graph = cls(record.id for record in records)
+        for record in records:
+            for prerequisite in record.dependsOn or ():
+                if validate:
+                    graph._check_nodes(record.id, prerequisite)
+                else:
+                    graph.add_node(prerequisite)
+                graph._link(record.id, prerequisite)
+        if validate:
+            cycle = graph.find_cycle()
+            if cycle:
+                raise DependencyCycleError(cycle)
+        return graph
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(prerequisites) for prerequisites in self._prerequisites.values())
+
+    def add_node(self, node: str) -> None:
+        self._prerequisites.setdefault(node, set())
+        self._dependents.setdefault(node, set())
+
+    def add_edge(self, requirement: str, prerequisite: str) -> bool:
+        """Add a dependency; returns False if it already existed"""
+        self._check_nodes(requirement, prerequisite)
+        if prerequisite in self._prerequisites[requirement]:
+            return False
+        cycle = self._path(requirement, prerequisite)
+        if cycle is not None:
+            raise DependencyCycleError(cycle + [requirement])
+        self._link(requirement, prerequisite)
+        return True
+
+    def topological_order(self) -> List[str]:
+        """Any order with prerequisites first (Kahn's algorithm, O(V + E))"""
+        remaining = {node: len(prerequisites) for node, prerequisites in self._prerequisites.items()}
+        ready = [node for node, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            node = ready.pop()
+            order.append(node)
+            for dependent in self._dependents[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        return order
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Return one cycle (first node repeated at the end), or None if the graph is acyclic"""
+        # Whatever Kahn's algorithm cannot peel off lies on or behind a cycle
+        remaining = set(self._prerequisites).difference(self.topological_order())
+        if not remaining:
+            return None
+
+        # Every leftover node has a leftover prerequisite; walk them until one repeats
+        node = next(iter(remaining))
+        seen: Dict[str, int] = {}
+        walk: List[str] = []
+        while node not in seen:
+            seen[node] = len(walk)
+            walk.append(node)
+            node = next(p for p in self._prerequisites[node] if p in remaining)
+        # Report the cycle in delivery order (prerequisite first)
+        cycle = walk[seen[node]:][::-1]
+        return cycle + [cycle[0]]
+
+    def ranked_order(self, scores: Dict[str, float], tie_order: Sequence[str]) -> List[str]:
+        """Topological order that always delivers the most valuable available requirement next
+
+        A prerequisite inherits the best score of everything that (transitively)
+        depends on it, so a high-value requirement pulls its prerequisites up
+        instead of being pushed down behind them. Inheritance is one reverse
+        topological pass; the ordering is Kahn's algorithm with a max-heap of
+        ready nodes, O((V + E) log V) overall. Ties fall back to the node's own
+        score, then to its position in `tie_order`.
+        """
+        topological = self.topological_order()
+        if len(topological) < len(self._prerequisites):
+            raise DependencyCycleError(self.find_cycle())
+
+        inherited = {node: scores.get(node, 0.0) for node in topological}
+        for node in reversed(topological):
+            for prerequisite in self._prerequisites[node]:
+                if inherited[node] > inherited[prerequisite]:
+                    inherited[prerequisite] = inherited[node]
+
+        position = {node: index for index, node in enumerate(tie_order)}
+
+        def key(node: str):
+            return (-inherited[node], -scores.get(node, 0.0), position.get(node, len(position)), node)
+
+        remaining = {node: len(prerequisites) for node, prerequisites in self._prerequisites.items()}
+        ready = [key(node) for node, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+
+        order = []
+        while ready:
+            node = heapq.heappop(ready)[-1]
+            order.append(node)
+            for dependent in self._dependents[node]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, key(dependent))
+        return order
+
+    def _check_nodes(self, requirement: str, prerequisite: str) -> None:
+        for node in (requirement, prerequisite):
+            if node not in self._prerequisites:
+                raise ValueError(f"Unknown requirement ID in dependency: {node}")
+        if requirement == prerequisite:
+            raise DependencyCycleError([requirement, requirement])
+
+    def _link(self, requirement: str, prerequisite: str) -> None:
+        self._prerequisites[requirement].add(prerequisite)
+        self._dependents[prerequisite].add(requirement)
+
+    def _path(self, start: str, goal: str) -> Optional[List[str]]:
+        """Path from `start` to `goal` along dependent edges (iterative DFS), or None"""
+        parents: Dict[str, Optional[str]] = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for dependent in self._dependents[node]:
+                if dependent not in parents:
+                    parents[dependent] = node
+                    stack.append(dependent)
+        return None
+
+
+def constrained_order(records: Sequence, scores: Sequence[float], score_order: Sequence[int]) -> Tuple[List[int], int]:
+    """Reorder `score_order` (record indices, best first) so prerequisites come first
+
+    Returns the new order and the number of dependency edges applied.
+    """
+    graph = DependencyGraph.from_records(records)
+    if graph.edge_count == 0:
+        return list(score_order), 0
+
+    # Requirements sharing an ID are placed together at their best score
+    best: Dict[str, float] = {}
+    indices: Dict[str, List[int]] = {}
+    for index in score_order:
+        node = records[index].id
+        best.setdefault(node, scores[index])
+        indices.setdefault(node, []).append(index)
+
+    tie_order = list(indices)
+    order = graph.ranked_order(best, tie_order)
+    return [index for node in order for index in indices[node]], graph.edge_count
@@ -0,0 +1,254 @@
+"""
+Near-duplicate requirement detection with MinHash and locality-sensitive hashing.
+
+Each requirement's title + description is reduced to character shingles and a
+MinHash signature whose rows agree with probability equal to the Jaccard
+similarity of the shingle sets. Signatures are split into LSH bands; two
+requirements become candidates only if some band hashes to the same bucket,
+so clustering is sub-quadratic. Candidates are confirmed with the estimated
+similarity. Hashes are derived from fixed digests (not Python's salted
+`hash()`), so signatures persisted in the database stay comparable across
+processes and deploys.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database.models import RequirementSignature, RequirementSignatureBand
+
+logger = logging.getLogger("aria.duplicates")
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Candidate pairs below this estimated Jaccard similarity are discarded
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.6"))
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _permutation_parameters() -> Tuple[List[int], List[int]]:
+    """Fixed (a, b) pairs for the universal hash functions (a*x + b) mod p"""
+    params = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"aria-minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % _MERSENNE_PRIME
+        params.append((a, b))
+    return [a for a, _ in params], [b for _, b in params]
+
+
+_PERM_A, _PERM_B = _permutation_parameters()
+
+
+@dataclass
+class DuplicateGroup:
+    requirement_ids: List[str]
+    # Lowest estimated similarity among the pairs that joined the cluster
+    similarity: float
+
+
+@dataclass
+class PriorMatch:
+    requirement_id: str
+    match_session_id: str
+    match_requirement_id: str
+    match_title: str
+    similarity: float
+
+
+@dataclass
+class DuplicateFindings:
+    clusters: List[DuplicateGroup] = field(default_factory=list)
+    prior_matches: List[PriorMatch] = field(default_factory=list)
+
+
+def shingles(text: str) -> List[str]:
+    """Character shingles of lower-cased text with punctuation collapsed"""
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    if len(normalized) <= SHINGLE_SIZE:
+        return [normalized] if normalized else []
+    return [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+
+
+def _is_blank(signature) -> bool:
+    # Requirements without any text keep the initial maximum in every row
+    return bool((signature == _MAX_HASH).all())
+
+
+class DuplicateDetectionService:
+    """MinHash/LSH near-duplicate detection within an upload and against a user's earlier sessions"""
+
+    def signatures(self, records: Sequence):
+        """MinHash signatures, one uint32 row per record"""
+        # numpy is loaded on first use to keep application start-up fast
+        import numpy as np
+
+        a = np.array(_PERM_A, dtype=np.uint64)
+        b = np.array(_PERM_B, dtype=np.uint64)
+        result = np.full((len(records), NUM_PERM), _MAX_HASH, dtype=np.uint32)
+        for row, record in enumerate(records):
+            tokens = set(shingles(f"{record.title} {record.description}"))
+            if not tokens:
+                continue
+            hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint64, count=len(tokens))
+            # uint64 products wrap around; the result is still a fixed hash family
+            permuted = (hashes[:, None] * a + b) % np.uint64(_MERSENNE_PRIME) & np.uint64(_MAX_HASH)
+            result[row] = permuted.min(axis=0)
+        return result
+
+    @staticmethod
+    def buckets(signature) -> List[str]:
+        """LSH bucket keys, one per band"""
+        return [
+            f"{band}:{hashlib.blake2b(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(BANDS)
+        ]
+
+    @staticmethod
+    def similarity(first, second) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float((first == second).mean())
+
+    def find_clusters(self, records: Sequence, signatures) -> List[DuplicateGroup]:
+        """Group records whose estimated similarity reaches DUPLICATE_THRESHOLD (union-find over LSH candidates)"""
+        by_bucket: Dict[str, List[int]] = {}
+        for index, signature in enumerate(signatures):
+            if _is_blank(signature):
+                continue
+            for bucket in self.buckets(signature):
+                by_bucket.setdefault(bucket, []).append(index)
+
+        parent = list(range(len(records)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        checked = set()
+        weakest: Dict[int, float] = {}
+        for members in by_bucket.values():
+            for position, first in enumerate(members):
+                for second in members[position + 1:]:
+                    if (first, second) in checked:
+                        continue
+                    checked.add((first, second))
+                    score = self.similarity(signatures[first], signatures[second])
+                    if score < DUPLICATE_THRESHOLD:
+                        continue
+                    root_first, root_second = find(first), find(second)
+                    link = min(score, weakest.pop(root_first, 1.0), weakest.pop(root_second, 1.0))
+                    if root_first != root_second:
+                        parent[root_second] = root_first
+                    weakest[root_first] = link
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(records)):
+            groups.setdefault(find(index), []).append(index)
+        return [
+            DuplicateGroup([records[index].id for index in members], round(weakest[root], 3))
+            for root, members in groups.items()
+            if len(members) > 1
+        ]
+
+    def find_prior_matches(
+        self, db: Session, user_id: str, session_id: str, records: Sequence, signatures
+    ) -> List[PriorMatch]:
+        """Best match for each record among the signatures of the user's other sessions"""
+        import numpy as np
+
+        buckets_by_record = [[] if _is_blank(signature) else self.buckets(signature) for signature in signatures]
+        all_buckets = {bucket for buckets in buckets_by_record for bucket in buckets}
+        if not all_buckets:
+            return []
+
+        # One indexed lookup for every band bucket of the upload
+        rows = (
+            db.query(RequirementSignatureBand.bucket, RequirementSignature)
+            .join(RequirementSignature, RequirementSignatureBand.signature_id == RequirementSignature.id)
+            .filter(
+                RequirementSignatureBand.user_id == user_id,
+                RequirementSignatureBand.bucket.in_(all_buckets),
+                RequirementSignature.session_id != session_id,
+            )
+            .all()
+        )
+        candidates: Dict[str, List[RequirementSignature]] = {}
+        for bucket, stored in rows:
+            candidates.setdefault(bucket, []).append(stored)
+
+        matches = []
+        for record, signature, buckets in zip(records, signatures, buckets_by_record):
+            best = None
+            seen = set()
+            for bucket in buckets:
+                for stored in candidates.get(bucket, ()):
+                    if stored.id in seen:
+                        continue
+                    seen.add(stored.id)
+                    stored_signature = np.frombuffer(stored.signature, dtype="<u4")
+                    if len(stored_signature) != NUM_PERM:
+                        continue
+                    score = self.similarity(signature, stored_signature)
+                    if score >= DUPLICATE_THRESHOLD and (best is None or score > best[1]):
+                        best = (stored, score)
+            if best is not None:
+                stored, score = best
+                matches.append(PriorMatch(record.id, stored.session_id, stored.requirement_id, stored.title, round(score, 3)))
+        return matches
+
+    @staticmethod
+    def save_signatures(db: Session, user_id: str, session_id: str, records: Sequence, signatures) -> None:
+        """Persist signatures and their band buckets (bulk INSERTs)"""
+        signature_rows = []
+        band_rows = []
+        for record, signature in zip(records, signatures):
+            if _is_blank(signature):
+                continue
+            signature_id = str(uuid.uuid4())
+            signature_rows.append({
+                "id": signature_id,
+                "user_id": user_id,
+                "session_id": session_id,
+                "requirement_id": record.id,
+                "title": record.title,
+                "signature": signature.astype("<u4").tobytes(),
+            })
+            band_rows.extend(
+                {"id": str(uuid.uuid4()), "signature_id": signature_id, "user_id": user_id, "bucket": bucket}
+                for bucket in DuplicateDetectionService.buckets(signature)
+            )
+        if signature_rows:
+            db.execute(insert(RequirementSignature), signature_rows)
+            db.execute(insert(RequirementSignatureBand), band_rows)
+        db.commit()
+
+    def check_upload(self, db: Session, user_id: str, session_id: str, records: Sequence) -> DuplicateFindings:
+        """Flag duplicates within a new session and against the user's earlier sessions, then store its signatures"""
+        if not records:
+            return DuplicateFindings()
+        signatures = self.signatures(records)
+        findings = DuplicateFindings(
+            clusters=self.find_clusters(records, signatures),
+            prior_matches=self.find_prior_matches(db, user_id, session_id, records, signatures),
+        )
+        self.save_signatures(db, user_id, session_id, records, signatures)
+        if findings.clusters or findings.prior_matches:
+            logger.info(
+                "Session %s: %d duplicate clusters, %d matches in earlier sessions",
+                session_id, len(findings.clusters), len(findings.prior_matches),
+            )
+        return findings
@@ -2,61 +2,10 @@ import csv
 import io
 from typing import List
 
-from jinja2 import Template
 from models.requirement import PrioritizedRequirement
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from services.prioritization_service import generate_reasoning
 
-
-class ExportService:    
-    def generate_csv(self, requirements: List[PrioritizedRequirement]) -> str:        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        headers = [
-            'Rank', 'ID', 'Title', 'Description', 'Category',
-            'Priority Score', 'Confidence', 'Business Value', 'Cost', 
-            'Risk', 'Urgency', 'Stakeholder Value', 'Reasoning'
-        ]
-        writer.writerow(headers)
-        
-        for req in requirements:
-            row = [
-                req.rank,
-                req.id,
-                req.title,
-                req.description,
-                req.category or '',
-                f"{req.priorityScore:.2f}",
-                f"{req.confidence:.2f}" if req.confidence else '',
-                req.businessValue or '',
-                req.cost or '',
-                req.risk or '',
-                req.urgency or '',
-                req.stakeholderValue or '',
-                req.reasoning or ''
-            ]
-            writer.writerow(row)
-        
-        return output.getvalue()
-    
-    def generate_html(self, requirements: List[PrioritizedRequirement], session_id: str) -> str:
-        total_requirements = len(requirements)
-        avg_score = sum(req.priorityScore for req in requirements) / total_requirements if total_requirements > 0 else 0
-        avg_confidence = sum(req.confidence for req in requirements if req.confidence) / total_requirements if total_requirements > 0 else 0
-        
-        categories = {}
-        for req in requirements:
-            category = req.category or 'Uncategorized'
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(req)
-        
-        # HTML template
-        html_template = Template("""
+HTML_REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -247,7 +196,7 @@ class ExportService:
                         -
                         {% endif %}
                     </td>
-                    <td class="reasoning">{{ req.reasoning or '-' }}</td>
+                    <td class="reasoning">{{ req.reasoning or explain(req) }}</td>
                 </tr>
                 {% endfor %}
             </tbody>
@@ -260,21 +209,92 @@ class ExportService:
     </div>
 </body>
 </html>
-        """)
+        """
+
+
+class ExportService:
+    # Compiled once per process; jinja2 is imported on first use to keep start-up fast
+    _html_template = None
+
+    @classmethod
+    def _get_html_template(cls):
+        if cls._html_template is None:
+            from jinja2 import Template
+            cls._html_template = Template(HTML_REPORT_TEMPLATE)
+        return cls._html_template
+
+    def warm_up(self) -> None:
+        """Compile the HTML template and load the PDF toolkit ahead of the first export"""
+        self._get_html_template()
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate  # noqa: F401
+        getSampleStyleSheet()
+
+    def generate_csv(self, requirements: List[PrioritizedRequirement]) -> str:        
+        output = io.StringIO()
+        writer = csv.writer(output)
+        
+        headers = [
+            'Rank', 'ID', 'Title', 'Description', 'Category',
+            'Priority Score', 'Confidence', 'Business Value', 'Cost', 
+            'Risk', 'Urgency', 'Stakeholder Value', 'Reasoning'
+        ]
+        writer.writerow(headers)
         
-        html_content = html_template.render(
+        for req in requirements:
+            row = [
+                req.rank,
+                req.id,
+                req.title,
+                req.description,
+                req.category or '',
+                f"{req.priorityScore:.2f}",
+                f"{req.confidence:.2f}" if req.confidence else '',
+                req.businessValue or '',
+                req.cost or '',
+                req.risk or '',
+                req.urgency or '',
+                req.stakeholderValue or '',
+                # Reasoning is not generated during analysis, only for exports or on request
+                req.reasoning or generate_reasoning(req)
+            ]
+            writer.writerow(row)
+        
+        return output.getvalue()
+    
+    def generate_html(self, requirements: List[PrioritizedRequirement], session_id: str) -> str:
+        total_requirements = len(requirements)
+        avg_score = sum(req.priorityScore for req in requirements) / total_requirements if total_requirements > 0 else 0
+        avg_confidence = sum(req.confidence for req in requirements if req.confidence) / total_requirements if total_requirements > 0 else 0
+        
+        categories = {}
+        for req in requirements:
+            category = req.category or 'Uncategorized'
+            if category not in categories:
+                categories[category] = []
+            categories[category].append(req)
+        
+        
+        html_content = self._get_html_template().render(
             session_id=session_id,
             timestamp=self._get_current_timestamp(),
             requirements=requirements,
             total_requirements=total_requirements,
             avg_score=avg_score,
             avg_confidence=avg_confidence,
-            categories=categories
+            categories=categories,
+            explain=generate_reasoning,
         )
         
         return html_content
     
     def generate_pdf(self, requirements: List[PrioritizedRequirement], session_id: str) -> bytes:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer,
@@ -1,17 +1,33 @@
-import pandas as pd
 import io
+import re
 from typing import List
-from models.requirement import Requirement, RequirementCategory
+from models.requirement import Requirement
+from models.compact import RequirementRecord, SCORE_FIELDS, normalize_category, to_models
+
+# Same limits as the Requirement model; records are validated here instead of per row
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 2000
+# Read as text so numeric IDs are not turned into floats ("3" -> "3.0"), which
+# happens whenever the column has blanks
+TEXT_COLUMNS = {'id': str, 'title': str, 'description': str, 'dependsOn': str}
+DEPENDENCY_SEPARATOR = re.compile(r'\s*[;,]\s*')
 
 
 class FileService:
     
     def parse_requirements(self, content: bytes, filename: str) -> List[Requirement]:
+        return to_models(self.parse_records(content, filename))
+
+    def parse_records(self, content: bytes, filename: str) -> List[RequirementRecord]:
+        """Parse and validate a CSV/Excel upload column-wise into compact records"""
+        # pandas is imported on first use to keep application start-up fast
+        import pandas as pd
+
         try:
             if filename.lower().endswith('.csv'):
-                df = pd.read_csv(io.StringIO(content.decode('utf-8')))
+                df = pd.read_csv(io.StringIO(content.decode('utf-8')), dtype=TEXT_COLUMNS)
             elif filename.lower().endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(io.BytesIO(content))
+                df = pd.read_excel(io.BytesIO(content), dtype=TEXT_COLUMNS)
             else:
                 raise ValueError("Unsupported file format")
             
@@ -19,34 +35,48 @@ class FileService:
             missing_columns = [col for col in required_columns if col not in df.columns]
             if missing_columns:
                 raise ValueError(f"Missing required columns: {missing_columns}")
-            
-            requirements = []
-            for _, row in df.iterrows():
-                def safe_get(key, default=None):
-                    value = row.get(key, default)
-                    return default if pd.isna(value) else value
-                
-                category = None
-                if 'category' in df.columns and not pd.isna(row.get('category')):
-                    try:
-                        category = RequirementCategory(row['category'].upper())
-                    except ValueError:
-                        pass
-                
-                requirement = Requirement(
-                    id=str(safe_get('id', '')),
-                    title=str(safe_get('title', '')),
-                    description=str(safe_get('description', '')),
-                    businessValue=safe_get('businessValue'),
-                    cost=safe_get('cost'),
-                    risk=safe_get('risk'),
-                    urgency=safe_get('urgency'),
-                    stakeholderValue=safe_get('stakeholderValue'),
-                    category=category
-                )
-                requirements.append(requirement)
-            
-            return requirements
+
+            columns = []
+            for column, max_length in (('id', None), ('title', TITLE_MAX_LENGTH), ('description', DESCRIPTION_MAX_LENGTH)):
+                values = df[column].where(df[column].notna(), '').astype(str)
+                if max_length is not None:
+                    too_long = values.str.len() > max_length
+                    if too_long.any():
+                        row = int(too_long.to_numpy().argmax()) + 1
+                        raise ValueError(f"Requirement {row}: {column} must be at most {max_length} characters")
+                columns.append(values.tolist())
+
+            for field in SCORE_FIELDS:
+                if field not in df.columns:
+                    columns.append([None] * len(df))
+                    continue
+                values = pd.to_numeric(df[field], errors='raise').astype(float)
+                out_of_range = values.notna() & ((values < 1) | (values > 10))
+                if out_of_range.any():
+                    row = int(out_of_range.to_numpy().argmax()) + 1
+                    raise ValueError(f"Requirement {row}: {field} must be between 1 and 10")
+                columns.append(values.astype(object).where(values.notna(), None).tolist())
+
+            if 'category' in df.columns:
+                categories = df['category'].where(df['category'].notna(), None).astype(object)
+                columns.append([
+                    normalize_category(value.upper()) if isinstance(value, str) else None
+                    for value in categories.tolist()
+                ])
+            else:
+                columns.append([None] * len(df))
+
+            if 'dependsOn' in df.columns:
+                # Prerequisite IDs separated by ';' or ','
+                depends_on = df['dependsOn'].where(df['dependsOn'].notna(), '').astype(str)
+                columns.append([
+                    [dependency for dependency in DEPENDENCY_SEPARATOR.split(value.strip()) if dependency] or None
+                    for value in depends_on.tolist()
+                ])
+            else:
+                columns.append([None] * len(df))
+
+            return [RequirementRecord(*row) for row in zip(*columns)]
             
         except Exception as e:
             raise ValueError(f"Failed to parse file: {str(e)}")
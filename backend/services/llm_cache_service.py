@@ -0,0 +1,76 @@
+"""
+Redis-backed cache for LLM analysis responses.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from metrics import record_cache
+from redis_client import get_redis_client
+
+
+class LLMResponseCache:
+    """Caches completions by a fingerprint of everything that shapes the prompt."""
+
+    _KEY_PREFIX = "aria:llm:response:"
+    _INDEX_KEY = "aria:llm:response:index"
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        self._ttl_seconds = ttl_seconds or int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+        self._max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+    @staticmethod
+    def fingerprint(model: str, system_prompt: str, requirements_summary: str, temperature: float) -> str:
+        """Hash the inputs that determine the completion."""
+        payload = json.dumps(
+            [model, system_prompt, requirements_summary, temperature],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _key(self, fingerprint: str) -> str:
+        return f"{self._KEY_PREFIX}{fingerprint}"
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Return a cached completion and mark it as recently used."""
+        try:
+            client = get_redis_client()
+            value = client.get(self._key(fingerprint))
+            if value is not None:
+                client.zadd(self._INDEX_KEY, {fingerprint: time.time()}, xx=True)
+            record_cache("llm_response", value is not None)
+            return value
+        except RedisError:
+            record_cache("llm_response", False)
+            return None
+
+    def set(self, fingerprint: str, summary: str) -> None:
+        """Store a completion, evicting expired and least recently used entries."""
+        now = time.time()
+        try:
+            client = get_redis_client()
+            pipe = client.pipeline()
+            pipe.setex(self._key(fingerprint), self._ttl_seconds, summary)
+            pipe.zadd(self._INDEX_KEY, {fingerprint: now})
+            # Index entries older than the TTL point at keys Redis already expired
+            pipe.zremrangebyscore(self._INDEX_KEY, "-inf", now - self._ttl_seconds)
+            pipe.zcard(self._INDEX_KEY)
+            size = pipe.execute()[-1]
+
+            overflow = size - self._max_entries
+            if overflow > 0:
+                evicted = client.zrange(self._INDEX_KEY, 0, overflow - 1)
+                if evicted:
+                    pipe = client.pipeline()
+                    pipe.delete(*[self._key(fp) for fp in evicted])
+                    pipe.zrem(self._INDEX_KEY, *evicted)
+                    pipe.execute()
+        except RedisError:
+            # Caching is best-effort; never fail an analysis because of Redis
+            pass
@@ -0,0 +1,146 @@
+"""
+Process-wide registry of pooled LLM clients.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from services.analysis_service import AnalysisService
+from services.llm_cache_service import LLMResponseCache
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger("aria.llm")
+
+# HTTP connection pool settings shared by every cached client
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120"))
+
+ClientKey = Tuple[str, str, str]
+
+
+class LLMClientRegistry:
+    """Keeps one AnalysisService per LLM configuration so HTTP connections are reused."""
+
+    def __init__(self, response_cache: Optional[LLMResponseCache] = None) -> None:
+        self._response_cache = response_cache
+        self._services: Dict[ClientKey, AnalysisService] = {}
+        # Active leases per service (by id) and invalidated services still leased
+        self._leases: Dict[int, int] = {}
+        self._retired: Dict[int, AnalysisService] = {}
+        self._lock = threading.Lock()
+        self._pending_closes: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(api_key: str, base_url: str, model: str) -> ClientKey:
+        """Build the registry key; the API key is only kept as a hash."""
+        api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        return (base_url, api_key_hash, model)
+
+    @staticmethod
+    def _build_client(api_key: str, base_url: str) -> "AsyncOpenAI":
+        """Create an OpenAI client backed by a keep-alive connection pool."""
+        import httpx
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=10.0),
+        )
+        return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+    def _acquire(self, api_key: str, base_url: str, model: str) -> AnalysisService:
+        """Return the cached AnalysisService for a configuration with one more lease on it."""
+        key = self._key(api_key, base_url, model)
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                service = AnalysisService(
+                    api_key=api_key,
+                    base_url=base_url,
+                    model=model,
+                    client=self._build_client(api_key, base_url),
+                    cache=self._response_cache,
+                )
+                self._services[key] = service
+                logger.info(f"Created pooled LLM client for {base_url} ({model})")
+            self._leases[id(service)] = self._leases.get(id(service), 0) + 1
+        return service
+
+    def _release(self, service: AnalysisService) -> bool:
+        """Drop one lease; return True if the service was invalidated and is now unused."""
+        with self._lock:
+            remaining = self._leases[id(service)] - 1
+            if remaining:
+                self._leases[id(service)] = remaining
+                return False
+            del self._leases[id(service)]
+            return self._retired.pop(id(service), None) is not None
+
+    @asynccontextmanager
+    async def lease(self, api_key: str, base_url: str, model: str) -> AsyncIterator[AnalysisService]:
+        """Use the pooled AnalysisService for a configuration.
+
+        The service stays open until every lease on it is released, even if
+        the configuration changes meanwhile.
+        """
+        service = self._acquire(api_key, base_url, model)
+        try:
+            yield service
+        finally:
+            if self._release(service):
+                await self._close_services([service])
+
+    def invalidate(self) -> None:
+        """Drop every cached client; leased ones are closed when their last lease is released."""
+        with self._lock:
+            idle = []
+            for service in self._services.values():
+                if self._leases.get(id(service)):
+                    self._retired[id(service)] = service
+                else:
+                    idle.append(service)
+            self._services.clear()
+
+        if not idle:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (e.g. called from a script): nothing can be in flight
+            asyncio.run(self._close_services(idle))
+            return
+
+        task = loop.create_task(self._close_services(idle))
+        self._pending_closes.add(task)
+        task.add_done_callback(self._pending_closes.discard)
+
+    async def aclose(self) -> None:
+        """Close every cached client immediately, leased or not."""
+        with self._lock:
+            services = list(self._services.values()) + list(self._retired.values())
+            self._services.clear()
+            self._retired.clear()
+        await self._close_services(services)
+
+    @staticmethod
+    async def _close_services(services: List[AnalysisService]) -> None:
+        """Close the given services."""
+        for service in services:
+            try:
+                await service.aclose()
+            except Exception as exc:
+                logger.warning(f"Failed to close LLM client: {exc}")
@@ -2,19 +2,131 @@
 Service for managing LLM configuration
 """
 
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
+
 from database.models import LLMConfig
+from metrics import record_cache
+from redis_client import get_redis_client
 import uuid
 
+logger = logging.getLogger("aria.llm")
+
+# Maximum delay before a worker notices a config change made elsewhere
+CONFIG_CHECK_INTERVAL_SECONDS = float(os.getenv("LLM_CONFIG_CHECK_INTERVAL_SECONDS", "2"))
+
+
+@dataclass(frozen=True)
+class LLMConfigSnapshot:
+    """Detached, immutable copy of the LLM configuration"""
+    api_key: str
+    base_url: str
+    model: str
+
 
 class LLMConfigService:
     """Service for managing LLM configuration"""
 
+    _VERSION_KEY = "aria:llm:config:version"
+
+    # Per-process cache of the configuration, refreshed when the version changes
+    _lock = threading.Lock()
+    _loaded = False
+    _cached: Optional[LLMConfigSnapshot] = None
+    _cached_version: Optional[int] = None
+    _checked_at = 0.0
+    _listeners: List[Callable[[], None]] = []
+
+    @staticmethod
+    def add_listener(callback: Callable[[], None]) -> None:
+        """Register a callback invoked whenever the configuration changes"""
+        LLMConfigService._listeners.append(callback)
+
     @staticmethod
-    def get_config(db: Session) -> LLMConfig | None:
-        """Get the current LLM configuration (there should be only one)"""
+    def _notify() -> None:
+        for callback in LLMConfigService._listeners:
+            try:
+                callback()
+            except Exception as exc:
+                logger.warning(f"LLM config listener failed: {exc}")
+
+    @staticmethod
+    def _read_version() -> Optional[int]:
+        """Read the shared config version counter from Redis"""
+        try:
+            value = get_redis_client().get(LLMConfigService._VERSION_KEY)
+            return int(value) if value is not None else 0
+        except RedisError:
+            return None
+
+    @staticmethod
+    def _bump_version() -> None:
+        """Signal every worker that the configuration changed"""
+        try:
+            get_redis_client().incr(LLMConfigService._VERSION_KEY)
+        except RedisError:
+            # Other workers fall back to re-reading the DB every check interval
+            pass
+
+    @staticmethod
+    def _load_config(db: Session) -> LLMConfig | None:
+        """Load the LLM configuration row (there should be only one)"""
         return db.query(LLMConfig).first()
 
+    @staticmethod
+    def get_config(db: Session) -> LLMConfigSnapshot | None:
+        """Get the current LLM configuration from the in-process cache.
+
+        The DB is only queried when the shared version counter changed (checked
+        at most every CONFIG_CHECK_INTERVAL_SECONDS) or Redis is unavailable.
+        """
+        cls = LLMConfigService
+        now = time.monotonic()
+        if cls._loaded and now - cls._checked_at < CONFIG_CHECK_INTERVAL_SECONDS:
+            record_cache("llm_config", True)
+            return cls._cached
+
+        with cls._lock:
+            if cls._loaded and now - cls._checked_at < CONFIG_CHECK_INTERVAL_SECONDS:
+                record_cache("llm_config", True)
+                return cls._cached
+
+            version = cls._read_version()
+            changed = False
+            reloaded = not cls._loaded or version is None or version != cls._cached_version
+            if reloaded:
+                config = cls._load_config(db)
+                snapshot = (
+                    LLMConfigSnapshot(config.api_key, config.base_url, config.model)
+                    if config else None
+                )
+                changed = cls._loaded and snapshot != cls._cached
+                cls._cached = snapshot
+                cls._cached_version = version
+                cls._loaded = True
+            cls._checked_at = now
+        record_cache("llm_config", not reloaded)
+
+        if changed:
+            cls._notify()
+        return cls._cached
+
+    @staticmethod
+    def _invalidate() -> None:
+        """Drop the local cache and broadcast the change"""
+        with LLMConfigService._lock:
+            LLMConfigService._loaded = False
+            LLMConfigService._cached = None
+        LLMConfigService._bump_version()
+        LLMConfigService._notify()
+
     @staticmethod
     def create_or_update_config(
         db: Session,
@@ -23,7 +135,7 @@ class LLMConfigService:
         model: str = "gpt-4o-mini",
     ) -> LLMConfig:
         """Create or update LLM configuration"""
-        config = LLMConfigService.get_config(db)
+        config = LLMConfigService._load_config(db)
         
         if config:
             # Update existing config
@@ -42,15 +154,16 @@ class LLMConfigService:
         
         db.commit()
         db.refresh(config)
+        LLMConfigService._invalidate()
         return config
 
     @staticmethod
     def delete_config(db: Session) -> bool:
         """Delete LLM configuration"""
-        config = LLMConfigService.get_config(db)
+        config = LLMConfigService._load_config(db)
         if config:
             db.delete(config)
             db.commit()
+            LLMConfigService._invalidate()
             return True
         return False
-
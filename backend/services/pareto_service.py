@@ -0,0 +1,222 @@
+"""
+Pareto frontier (skyline) and dominance layers over requirement criteria.
+"""
+
+import json
+import math
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from metrics import record_cache
+from models.compact import RequirementRecord, SCORE_FIELDS
+from redis_client import get_redis_client
+
+NEUTRAL_SCORE = 5.0
+# Business value, urgency and stakeholder value are maximized; cost and risk minimized
+MAXIMIZE = ("businessValue", "urgency", "stakeholderValue")
+# Largest rank grid (product of distinct values per criterion) for the grid algorithm
+GRID_MAX_CELLS = int(os.getenv("PARETO_GRID_MAX_CELLS", "4000000"))
+# Subproblem sizes below which divide and conquer compares points pairwise
+SOLVE_LEAF_POINTS = 128
+CROSS_LEAF_PAIRS = 1 << 16
+
+
+class ParetoService:
+    """Dominance layers (grid DP or divide and conquer) cached per session version in Redis"""
+
+    _KEY_PREFIX = "aria:pareto:"
+
+    def __init__(self, ttl_seconds: Optional[int] = None) -> None:
+        self._ttl_seconds = ttl_seconds or int(os.getenv("PARETO_CACHE_TTL_SECONDS", "3600"))
+
+    @staticmethod
+    def dominance_layers(records: Sequence[RequirementRecord]) -> List[int]:
+        """Return the dominance layer of every record (1 = Pareto-optimal)"""
+        # numpy is loaded on first use to keep application start-up fast
+        import numpy as np
+
+        if not records:
+            return []
+
+        raw = np.array([[getattr(req, field) for field in SCORE_FIELDS] for req in records], dtype=float)
+        points = np.where(np.isnan(raw), NEUTRAL_SCORE, raw)
+        # Work in "lower is better" space for every criterion
+        points[:, [SCORE_FIELDS.index(field) for field in MAXIMIZE]] *= -1
+
+        # Dominance only depends on the order within each criterion, so replace
+        # values by their rank; scores on the usual 1-10 scale give a small grid
+        ranks = []
+        shape = []
+        for column in points.T:
+            distinct, inverse = np.unique(column, return_inverse=True)
+            ranks.append(inverse.reshape(-1))
+            shape.append(len(distinct))
+        ranks = np.stack(ranks, axis=1)
+
+        if math.prod(shape) <= GRID_MAX_CELLS:
+            return ParetoService._grid_layers(ranks, tuple(shape)).tolist()
+        return ParetoService._divide_conquer_layers(ranks)
+
+    @staticmethod
+    def _grid_layers(ranks, shape):
+        """Dynamic programming over the rank grid, one anti-diagonal at a time"""
+        import numpy as np
+
+        size = math.prod(shape)
+        occupied = np.zeros(size, dtype=bool)
+        cell_of_point = np.ravel_multi_index(tuple(ranks.T), shape)
+        occupied[cell_of_point] = True
+
+        coords = np.indices(shape).reshape(len(shape), -1)
+        strides = [math.prod(shape[d + 1:]) for d in range(len(shape))]
+        # best[c] = deepest layer among occupied cells <= c (componentwise)
+        best = np.zeros(size, dtype=np.int32)
+        layer = np.zeros(size, dtype=np.int32)
+
+        levels = coords.sum(axis=0)
+        by_level = np.argsort(levels, kind="stable")
+        boundaries = np.searchsorted(levels[by_level], np.arange(levels.max() + 2))
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            cells = by_level[start:end]
+            # Strict dominators of c all lie below c - e_d for some criterion d
+            deepest = np.zeros(len(cells), dtype=np.int32)
+            for d, stride in enumerate(strides):
+                has_lower = coords[d, cells] > 0
+                below = cells[has_lower] - stride
+                deepest[has_lower] = np.maximum(deepest[has_lower], best[below])
+            own = np.where(occupied[cells], deepest + 1, 0)
+            layer[cells] = own
+            best[cells] = np.maximum(deepest, own)
+
+        return layer[cell_of_point]
+
+    @staticmethod
+    def _divide_conquer_layers(ranks) -> List[int]:
+        """Divide-and-conquer non-dominated sorting (for fine-grained, continuous scores)
+
+        Points are split at the median of one criterion; the lower half is
+        solved first, its layers raise the floor of the upper-half points it
+        dominates, then the upper half is solved. That cross step is itself
+        split by median with one criterion less per level, bottoming out in a
+        sorted prefix maximum, so the cost is O(n log^(d-1) n) rather than
+        O(n * layer size). Small subproblems are compared pairwise.
+        """
+        import numpy as np
+
+        columns = [np.ascontiguousarray(column) for column in ranks.T]
+        layers = np.zeros(len(ranks), dtype=np.int64)
+        # Lowest layer each point can take given the dominators placed so far
+        floor = np.ones(len(ranks), dtype=np.int64)
+
+        def lower_half(values):
+            median = np.partition(values, len(values) // 2)[len(values) // 2]
+            low = values < median
+            return low if low.any() else values <= median
+
+        def solve(points, axes):
+            # Points agree on every criterion not in axes
+            if not axes:
+                layers[points] = floor[points]
+                return
+            if len(points) <= SOLVE_LEAF_POINTS:
+                no_worse = np.ones((len(points), len(points)), dtype=bool)
+                better = np.zeros((len(points), len(points)), dtype=bool)
+                for axis in axes:
+                    values = columns[axis][points]
+                    no_worse &= values[:, None] <= values[None, :]
+                    better |= values[:, None] < values[None, :]
+                dominates = no_worse & better
+                base = floor[points]
+                current = base
+                # Longest dominance chain; converges after (longest chain in the leaf) rounds
+                while True:
+                    relaxed = np.maximum(base, np.where(dominates, current[:, None] + 1, 0).max(axis=0))
+                    if np.array_equal(relaxed, current):
+                        break
+                    current = relaxed
+                layers[points] = current
+                return
+            low = lower_half(columns[axes[0]][points])
+            if low.all():
+                solve(points, axes[1:])
+                return
+            lower, upper = points[low], points[~low]
+            solve(lower, axes)
+            # Lower points are strictly better on axes[0]; the other axes decide
+            cross(lower, upper, axes[1:])
+            solve(upper, axes)
+
+        def cross(sources, targets, axes):
+            """Raise the floor of targets dominated by solved sources (no worse on every axis)"""
+            if not len(sources) or not len(targets):
+                return
+            if not axes:
+                floor[targets] = np.maximum(floor[targets], layers[sources].max() + 1)
+                return
+            if len(axes) == 1:
+                values = columns[axes[0]][sources]
+                order = np.argsort(values, kind="stable")
+                deepest = np.maximum.accumulate(layers[sources][order])
+                found = np.searchsorted(values[order], columns[axes[0]][targets], side="right")
+                hit = found > 0
+                floor[targets[hit]] = np.maximum(floor[targets[hit]], deepest[found[hit] - 1] + 1)
+                return
+            if len(sources) * len(targets) <= CROSS_LEAF_PAIRS:
+                no_worse = np.ones((len(sources), len(targets)), dtype=bool)
+                for axis in axes:
+                    no_worse &= columns[axis][sources][:, None] <= columns[axis][targets][None, :]
+                deepest = np.where(no_worse, layers[sources][:, None] + 1, 0).max(axis=0)
+                floor[targets] = np.maximum(floor[targets], deepest)
+                return
+            source_values, target_values = columns[axes[0]][sources], columns[axes[0]][targets]
+            low = lower_half(np.concatenate([source_values, target_values]))
+            if low.all():
+                cross(sources, targets, axes[1:])
+                return
+            low_sources, low_targets = low[:len(sources)], low[len(sources):]
+            cross(sources[low_sources], targets[low_targets], axes)
+            cross(sources[~low_sources], targets[~low_targets], axes)
+            cross(sources[low_sources], targets[~low_targets], axes[1:])
+
+        solve(np.arange(len(ranks)), list(range(ranks.shape[1])))
+        return layers.tolist()
+
+    def _key(self, session_id: str, version: str) -> str:
+        return f"{self._KEY_PREFIX}{session_id}:{version}"
+
+    def get_layers(
+        self, session_id: str, version: str, records: Sequence[RequirementRecord]
+    ) -> Tuple[List[List[RequirementRecord]], bool]:
+        """Group records by dominance layer; layers are cached per session version"""
+        key = self._key(session_id, version)
+        ids = [record.id for record in records]
+        # Layers are cached by requirement ID; duplicate IDs are simply not cached
+        cacheable = len(set(ids)) == len(ids)
+
+        layer_by_id = None
+        if cacheable:
+            try:
+                cached = get_redis_client().get(key)
+                if cached is not None:
+                    layer_by_id = json.loads(cached)
+            except RedisError:
+                pass
+            record_cache("pareto", layer_by_id is not None)
+
+        if layer_by_id is not None:
+            layer_of = [layer_by_id[record_id] for record_id in ids]
+        else:
+            layer_of = self.dominance_layers(records)
+            if cacheable:
+                try:
+                    get_redis_client().setex(key, self._ttl_seconds, json.dumps(dict(zip(ids, layer_of))))
+                except RedisError:
+                    # Caching is best-effort
+                    pass
+
+        grouped: List[List[RequirementRecord]] = [[] for _ in range(max(layer_of, default=0))]
+        for record, layer in zip(records, layer_of):
+            grouped[layer - 1].append(record)
+        return grouped, layer_by_id is not None
@@ -1,7 +1,7 @@
-import random
-import math
-from typing import List
-from models.requirement import Requirement, PrioritizedRequirement, Weights
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from models.requirement import Requirement, PrioritizedRequirement, RankingMethod, Weights
+from models.compact import RequirementRecord, PrioritizedRecord, to_records, to_models
+from services.dependency_graph import constrained_order
 
 
 class PrioritizationService:
@@ -12,138 +12,182 @@ class PrioritizationService:
     def prioritize_requirements(
         self, 
         requirements: List[Requirement], 
-        weights: Weights = None
+        weights: Weights = None,
+        method: RankingMethod = RankingMethod.WEIGHTED_SUM,
+        pairwise: Optional[List[List[float]]] = None
     ) -> List[PrioritizedRequirement]:
-        
-        if not requirements:
-            return []
+        prioritized, _ = self.rank_records(to_records(requirements), weights, method, pairwise)
+        return to_models(prioritized)
+
+    def prioritize_records(
+        self,
+        records: Sequence[RequirementRecord],
+        weights: Weights = None,
+        method: RankingMethod = RankingMethod.WEIGHTED_SUM,
+        pairwise: Optional[List[List[float]]] = None
+    ) -> List[PrioritizedRecord]:
+        """Score and rank compact records (no per-row validation or dict copies)"""
+        prioritized, _ = self.rank_records(records, weights, method, pairwise)
+        return prioritized
+
+    def rank_records(
+        self,
+        records: Sequence[RequirementRecord],
+        weights: Weights = None,
+        method: RankingMethod = RankingMethod.WEIGHTED_SUM,
+        pairwise: Optional[List[List[float]]] = None,
+        simulations: Optional[int] = None,
+        score_spread: float = 1.0,
+        top_k: int = 10,
+        include_reasoning: bool = False,
+    ) -> Tuple[List[PrioritizedRecord], Dict[str, Any]]:
+        """Rank records with the selected engine; also returns engine details for the response metadata
+
+        Confidence comes from a Monte Carlo analysis of the ranking (see
+        services.uncertainty_service); its rank distribution is returned under
+        details["uncertainty"]. simulations=0 skips it. Each record gets its
+        per-criterion score contributions; reasoning text only when asked for.
+        """
+        if not records:
+            return [], {}
         
         if weights is None:
             weights = self.default_weights
-        
+
+        # numpy is loaded on first use to keep application start-up fast
+        import numpy as np
+        from services.ranking_engines import CONTRIBUTION_FIELDS, CriteriaMatrix, get_engine
+        from services.uncertainty_service import simulate_ranks, simulation_count
+
+        rng = np.random.default_rng()
+        matrix = CriteriaMatrix(records)
+        engine = get_engine(method, pairwise)
+        scores, details = engine.score(matrix, weights, rng)
+        contributions = np.round(engine.contributions(matrix, weights, scores), 2).tolist()
+
+        simulations = simulation_count(simulations, len(records))
+        uncertainty = None
+        if simulations:
+            uncertainty = simulate_ranks(matrix, engine, weights, rng, simulations, score_spread, top_k)
+            confidences = uncertainty.confidence
+        else:
+            confidences = self._calculate_confidence(matrix)
+
+        # Stable sort keeps input order for ties
+        order = np.argsort(-scores, kind="stable").tolist()
+        scores = scores.tolist()
+        if any(req.dependsOn for req in records):
+            # Prerequisites are ranked before the requirements that depend on them
+            order, edge_count = constrained_order(records, scores, order)
+            details["dependencyEdges"] = edge_count
+        confidences = confidences.tolist()
+        if uncertainty is not None:
+            details["uncertainty"] = {
+                **uncertainty.summary(),
+                "requirements": self._rank_distributions(records, order, uncertainty),
+            }
         prioritized = []
-        for i, req in enumerate(requirements):
-            priority_score = self._calculate_priority_score(req, weights)
-            confidence = self._calculate_confidence(req)
-            reasoning = self._generate_reasoning(req, priority_score, weights)
-            
-            prioritized_req = PrioritizedRequirement(
-                **req.dict(),
-                priorityScore=priority_score,
-                rank=1,
-                confidence=confidence,
-                reasoning=reasoning
-            )
-            prioritized.append(prioritized_req)
-        
-        prioritized.sort(key=lambda x: x.priorityScore, reverse=True)
-        for i, req in enumerate(prioritized):
-            req.rank = i + 1
-        
+        for rank, index in enumerate(order, start=1):
+            req = records[index]
+            prioritized.append(PrioritizedRecord(
+                req.id, req.title, req.description, req.businessValue, req.cost,
+                req.risk, req.urgency, req.stakeholderValue, req.category, req.dependsOn,
+                scores[index], rank, confidences[index], None,
+                dict(zip(CONTRIBUTION_FIELDS, contributions[index])),
+            ))
+        if include_reasoning:
+            self.add_reasoning(prioritized)
+        
+        return prioritized, {"method": RankingMethod(method).value, **details}
+
+    @staticmethod
+    def add_reasoning(prioritized: Sequence) -> Sequence:
+        """Fill in reasoning text where it is missing (in place)"""
+        for req in prioritized:
+            if req.reasoning is None:
+                req.reasoning = generate_reasoning(req)
         return prioritized
     
-    def _calculate_priority_score(self, req: Requirement, weights: Weights) -> float:
-        business_value = req.businessValue or 5.0
-        cost = req.cost or 5.0
-        risk = req.risk or 5.0
-        urgency = req.urgency or 5.0
-        stakeholder_value = req.stakeholderValue or 5.0
-        
-        norm_business = (business_value - 1) / 9
-        norm_cost = (cost - 1) / 9
-        norm_risk = (risk - 1) / 9
-        norm_urgency = (urgency - 1) / 9
-        norm_stakeholder = (stakeholder_value - 1) / 9
-        
-        # Calculate weighted score
-        # For cost and risk, lower values are better, so we invert them
-        weighted_score = (
-            norm_business * weights.businessValue +
-            (1 - norm_cost) * weights.cost +  # Inverted: lower cost = higher priority
-            (1 - norm_risk) * weights.risk +  # Inverted: lower risk = higher priority
-            norm_urgency * weights.urgency +
-            norm_stakeholder * weights.stakeholderValue
-        )
-        
-        category_multiplier = self._get_category_multiplier(req.category)
-        weighted_score *= category_multiplier
-        
-        noise = random.uniform(-0.05, 0.05)
-        weighted_score += noise
-        
-        return max(0, min(100, weighted_score * 100))
+    def rerank_records(self, prioritized: Sequence[PrioritizedRecord]) -> List[PrioritizedRecord]:
+        """Re-apply dependency constraints to stored results without re-scoring"""
+        score_order = sorted(range(len(prioritized)), key=lambda index: (-prioritized[index].priorityScore, prioritized[index].rank))
+        order, _ = constrained_order(prioritized, [req.priorityScore for req in prioritized], score_order)
+        reranked = [prioritized[index] for index in order]
+        for rank, req in enumerate(reranked, start=1):
+            req.rank = rank
+        return reranked
+
+    def _calculate_confidence(self, matrix):
+        # Without simulations: share of scoring fields provided
+        return matrix.provided.mean(axis=1)
+
+    @staticmethod
+    def _rank_distributions(records, order, uncertainty) -> List[Dict[str, Any]]:
+        """Per-requirement rank percentiles and top-K probability, in final rank order"""
+        low, median, high = uncertainty.rank_low.tolist(), uncertainty.rank_median.tolist(), uncertainty.rank_high.tolist()
+        top_k = uncertainty.top_k_probability.tolist()
+        return [
+            {
+                "id": records[index].id,
+                "rankP5": low[index],
+                "rankMedian": median[index],
+                "rankP95": high[index],
+                "probabilityTopK": round(top_k[index], 4),
+            }
+            for index in order
+        ]
+
+
+def generate_reasoning(req) -> str:
+    """Readable explanation of a prioritized requirement's score (built on demand, not during ranking)"""
+    score = req.priorityScore
+    reasons = []
+    
+    if req.businessValue:
+        if req.businessValue >= 8:
+            reasons.append(f"High business value ({req.businessValue}/10)")
+        elif req.businessValue <= 3:
+            reasons.append(f"Low business value ({req.businessValue}/10)")
+    
+    if req.cost:
+        if req.cost <= 3:
+            reasons.append(f"Low implementation cost ({req.cost}/10)")
+        elif req.cost >= 8:
+            reasons.append(f"High implementation cost ({req.cost}/10)")
+    
+    if req.risk:
+        if req.risk <= 3:
+            reasons.append(f"Low implementation risk ({req.risk}/10)")
+        elif req.risk >= 8:
+            reasons.append(f"High implementation risk ({req.risk}/10)")
     
-    def _get_category_multiplier(self, category) -> float:
-        multipliers = {
-            "BUG_FIX": 1.2,      # Bug fixes get priority boost
-            "COMPLIANCE": 1.1,   # Compliance requirements slightly higher
-            "FEATURE": 1.0,      # Features are baseline
-            "ENHANCEMENT": 0.9,  # Enhancements slightly lower
-            "TECHNICAL": 0.8,    # Technical debt lowest
-            None: 1.0            # Default for no category
+    if req.urgency:
+        if req.urgency >= 8:
+            reasons.append(f"High urgency ({req.urgency}/10)")
+        elif req.urgency <= 3:
+            reasons.append(f"Low urgency ({req.urgency}/10)")
+    
+    if req.stakeholderValue:
+        if req.stakeholderValue >= 8:
+            reasons.append(f"High stakeholder value ({req.stakeholderValue}/10)")
+        elif req.stakeholderValue <= 3:
+            reasons.append(f"Low stakeholder value ({req.stakeholderValue}/10)")
+    
+    if req.category:
+        category_reasons = {
+            "BUG_FIX": "Bug fix requirements typically have high priority",
+            "COMPLIANCE": "Compliance requirements are important for regulatory adherence",
+            "FEATURE": "New feature for user value",
+            "ENHANCEMENT": "Enhancement to existing functionality",
+            "TECHNICAL": "Technical improvement or refactoring"
         }
-        return multipliers.get(category, 1.0)
+        if req.category in category_reasons:
+            reasons.append(category_reasons[req.category])
     
-    def _calculate_confidence(self, req: Requirement) -> float:        
-        scoring_fields = ['businessValue', 'cost', 'risk', 'urgency', 'stakeholderValue']
-        provided_fields = sum(1 for field in scoring_fields if getattr(req, field) is not None)
-        
-        base_confidence = provided_fields / len(scoring_fields)
-        
-        noise = random.uniform(-0.1, 0.1)
-        confidence = base_confidence + noise
-        
-        # Ensure confidence is between 0 and 1
-        return max(0.0, min(1.0, confidence))
+    if not reasons:
+        return f"Priority score of {score:.1f} based on weighted analysis of available criteria."
     
-    def _generate_reasoning(self, req: Requirement, score: float, weights: Weights) -> str:        
-        reasons = []
-        
-        if req.businessValue:
-            if req.businessValue >= 8:
-                reasons.append(f"High business value ({req.businessValue}/10)")
-            elif req.businessValue <= 3:
-                reasons.append(f"Low business value ({req.businessValue}/10)")
-        
-        if req.cost:
-            if req.cost <= 3:
-                reasons.append(f"Low implementation cost ({req.cost}/10)")
-            elif req.cost >= 8:
-                reasons.append(f"High implementation cost ({req.cost}/10)")
-        
-        if req.risk:
-            if req.risk <= 3:
-                reasons.append(f"Low implementation risk ({req.risk}/10)")
-            elif req.risk >= 8:
-                reasons.append(f"High implementation risk ({req.risk}/10)")
-        
-        if req.urgency:
-            if req.urgency >= 8:
-                reasons.append(f"High urgency ({req.urgency}/10)")
-            elif req.urgency <= 3:
-                reasons.append(f"Low urgency ({req.urgency}/10)")
-        
-        if req.stakeholderValue:
-            if req.stakeholderValue >= 8:
-                reasons.append(f"High stakeholder value ({req.stakeholderValue}/10)")
-            elif req.stakeholderValue <= 3:
-                reasons.append(f"Low stakeholder value ({req.stakeholderValue}/10)")
-        
-        if req.category:
-            category_reasons = {
-                "BUG_FIX": "Bug fix requirements typically have high priority",
-                "COMPLIANCE": "Compliance requirements are important for regulatory adherence",
-                "FEATURE": "New feature for user value",
-                "ENHANCEMENT": "Enhancement to existing functionality",
-                "TECHNICAL": "Technical improvement or refactoring"
-            }
-            if req.category in category_reasons:
-                reasons.append(category_reasons[req.category])
-        
-        if not reasons:
-            return f"Priority score of {score:.1f} based on weighted analysis of available criteria."
-        
-        if len(reasons) == 1:
-            return f"Priority score of {score:.1f} due to {reasons[0]}."
-        else:
-            return f"Priority score of {score:.1f} based on: {', '.join(reasons)}."
+    if len(reasons) == 1:
+        return f"Priority score of {score:.1f} due to {reasons[0]}."
+    else:
+        return f"Priority score of {score:.1f} based on: {', '.join(reasons)}."
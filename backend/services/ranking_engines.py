@@ -0,0 +1,230 @@
+"""
+Multi-criteria ranking engines.
+
+Every engine scores the same criteria matrix: one row per requirement and one
+column per criterion in SCORE_FIELDS order (businessValue, cost, risk, urgency,
+stakeholderValue), with missing scores filled with the neutral value 5.
+Scores are returned on a 0-100 scale (higher = more important). Engines also
+break scores down into per-criterion contributions (CONTRIBUTION_FIELDS), one
+matrix operation for the whole set.
+
+Engines also accept a stack of matrices (shape simulations x requirements x
+criteria), which the uncertainty analysis uses to score every simulation in
+one pass; criteria are always the last axis and requirements the one before.
+"""
+
+from abc import ABC, abstractmethod
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.compact import SCORE_FIELDS
+from models.requirement import RankingMethod, Weights
+
+NEUTRAL_SCORE = 5.0
+# Lower cost and risk are better; the other criteria are benefits
+BENEFIT_CRITERIA = np.array([True, False, False, True, True])
+CATEGORY_MULTIPLIERS = {
+    "BUG_FIX": 1.2,      # Bug fixes get priority boost
+    "COMPLIANCE": 1.1,   # Compliance requirements slightly higher
+    "FEATURE": 1.0,      # Features are baseline
+    "ENHANCEMENT": 0.9,  # Enhancements slightly lower
+    "TECHNICAL": 0.8,    # Technical debt lowest
+}
+# Saaty's random consistency index by matrix size
+RANDOM_INDEX = {1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45}
+MAX_CONSISTENCY_RATIO = 0.1
+CONTRIBUTION_FIELDS = SCORE_FIELDS + ("categoryMultiplier",)
+
+
+class CriteriaMatrix:
+    """Scores of a requirement set as arrays (rows follow the input order)"""
+
+    def __init__(self, records: Sequence) -> None:
+        # None becomes NaN under dtype=float
+        raw = np.array(
+            list(map(attrgetter(*SCORE_FIELDS), records)), dtype=float
+        ).reshape(len(records), len(SCORE_FIELDS))
+        self.provided = ~np.isnan(raw)
+        self.values = np.where(self.provided, raw, NEUTRAL_SCORE)
+        self.categories: List[Optional[str]] = [req.category for req in records]
+
+    @classmethod
+    def with_values(cls, matrix: "CriteriaMatrix", values: np.ndarray) -> "CriteriaMatrix":
+        """Same requirements with other (e.g. simulated) scores, possibly stacked"""
+        copy = cls.__new__(cls)
+        copy.provided = matrix.provided
+        copy.values = values
+        copy.categories = matrix.categories
+        return copy
+
+    def __len__(self) -> int:
+        return self.values.shape[-2]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Score shape: (requirements,) or (simulations, requirements)"""
+        return self.values.shape[:-1]
+
+    def normalized(self) -> np.ndarray:
+        """Scale scores to 0-1 with cost and risk inverted so higher is always better"""
+        scaled = (self.values - 1) / 9
+        return np.where(BENEFIT_CRITERIA, scaled, 1 - scaled)
+
+    def category_multipliers(self) -> np.ndarray:
+        return np.array([CATEGORY_MULTIPLIERS.get(category, 1.0) for category in self.categories])
+
+
+def weight_vector(weights: Weights) -> np.ndarray:
+    return np.array([getattr(weights, field) for field in SCORE_FIELDS], dtype=float)
+
+
+class RankingEngine(ABC):
+    """Scores a criteria matrix; returns scores (0-100) and engine details for the response metadata"""
+
+    method: RankingMethod
+
+    @abstractmethod
+    def score(
+        self, matrix: CriteriaMatrix, weights: Weights, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        ...
+
+    def contributions(self, matrix: CriteriaMatrix, weights: Weights, scores: np.ndarray) -> np.ndarray:
+        """Score points per criterion, with the category multiplier's effect as the last column
+
+        Default for engines whose score is not a weighted sum: the score is
+        apportioned by each criterion's weighted normalized value.
+        """
+        parts = matrix.normalized() * weight_vector(weights)
+        totals = parts.sum(axis=1, keepdims=True)
+        shares = np.divide(parts, totals, out=np.full_like(parts, 1 / len(SCORE_FIELDS)), where=totals > 0)
+        return np.column_stack([shares * scores[:, None], np.zeros(len(matrix))])
+
+
+class WeightedSumEngine(RankingEngine):
+    """Original ARIA scoring: weighted sum x category multiplier, with a little noise"""
+
+    method = RankingMethod.WEIGHTED_SUM
+
+    def score(self, matrix, weights, rng):
+        scores = matrix.normalized() @ weight_vector(weights)
+        scores *= matrix.category_multipliers()
+        scores += rng.uniform(-0.05, 0.05, matrix.shape)
+        return np.clip(scores * 100, 0, 100), {}
+
+    def contributions(self, matrix, weights, scores):
+        # Exact up to the noise and clipping: criteria points, then what the multiplier adds or removes
+        parts = matrix.normalized() * weight_vector(weights) * 100
+        return np.column_stack([parts, parts.sum(axis=1) * (matrix.category_multipliers() - 1)])
+
+
+class TOPSISEngine(RankingEngine):
+    """Closeness to the ideal solution relative to the anti-ideal one"""
+
+    method = RankingMethod.TOPSIS
+
+    def score(self, matrix, weights, rng):
+        values = matrix.values
+        norms = np.sqrt((values ** 2).sum(axis=-2, keepdims=True))
+        weighted = values / norms * weight_vector(weights).astype(values.dtype)
+
+        best, worst = weighted.max(axis=-2, keepdims=True), weighted.min(axis=-2, keepdims=True)
+        ideal = np.where(BENEFIT_CRITERIA, best, worst)
+        anti_ideal = np.where(BENEFIT_CRITERIA, worst, best)
+        # Row sums as a matrix product: much faster than sum(axis=-1) over five columns
+        ones = np.ones(len(SCORE_FIELDS), dtype=values.dtype)
+        to_ideal = np.sqrt(((weighted - ideal) ** 2) @ ones)
+        to_anti_ideal = np.sqrt(((weighted - anti_ideal) ** 2) @ ones)
+
+        total = to_ideal + to_anti_ideal
+        # All requirements identical on every weighted criterion: rank them equally
+        closeness = np.divide(to_anti_ideal, total, out=np.full(matrix.shape, 0.5), where=total > 0)
+        return closeness * 100, {}
+
+
+class WSJFEngine(RankingEngine):
+    """Weighted Shortest Job First: cost of delay (value, urgency, stakeholder value) / cost"""
+
+    method = RankingMethod.WSJF
+
+    COST_OF_DELAY = [SCORE_FIELDS.index(field) for field in ("businessValue", "urgency", "stakeholderValue")]
+    JOB_SIZE = SCORE_FIELDS.index("cost")
+
+    def score(self, matrix, weights, rng):
+        components = weight_vector(weights)[self.COST_OF_DELAY]
+        if components.sum() == 0:
+            components = np.ones(len(self.COST_OF_DELAY))
+        # Weighted average keeps the cost of delay on the 1-10 scale
+        cost_of_delay = matrix.values[..., self.COST_OF_DELAY] @ components / components.sum()
+        wsjf = cost_of_delay / matrix.values[..., self.JOB_SIZE]
+        # WSJF ranges from 0.1 (value 1, cost 10) to 10 (value 10, cost 1)
+        return np.clip(wsjf * 10, 0, 100), {}
+
+
+class AHPEngine(RankingEngine):
+    """Analytic Hierarchy Process: criteria weights from a pairwise comparison matrix"""
+
+    method = RankingMethod.AHP
+
+    def __init__(self, pairwise: Optional[Sequence[Sequence[float]]] = None) -> None:
+        self.pairwise = pairwise
+
+    @staticmethod
+    def derive_weights(pairwise: Sequence[Sequence[float]]) -> Tuple[np.ndarray, float]:
+        """Principal eigenvector weights and Saaty's consistency ratio"""
+        comparisons = np.asarray(pairwise, dtype=float)
+        size = len(SCORE_FIELDS)
+        if comparisons.shape != (size, size):
+            raise ValueError(f"Pairwise comparisons must be a {size}x{size} matrix ordered as {', '.join(SCORE_FIELDS)}")
+        if (comparisons <= 0).any():
+            raise ValueError("Pairwise comparisons must be positive")
+        if not np.allclose(comparisons * comparisons.T, 1, rtol=1e-2):
+            raise ValueError("Pairwise comparisons must be reciprocal (a[j][i] = 1 / a[i][j])")
+
+        eigenvalues, eigenvectors = np.linalg.eig(comparisons)
+        principal = int(np.argmax(eigenvalues.real))
+        weights = np.abs(eigenvectors[:, principal].real)
+        weights /= weights.sum()
+
+        consistency_index = (eigenvalues[principal].real - size) / (size - 1)
+        consistency_ratio = max(0.0, consistency_index / RANDOM_INDEX[size])
+        return weights, consistency_ratio
+
+    def _criteria_weights(self, weights: Weights) -> Tuple[np.ndarray, float]:
+        if self.pairwise is None:
+            # Without explicit judgements, compare criteria by the ratio of their weights
+            vector = weight_vector(weights)
+            return vector / vector.sum(), 0.0
+        derived, consistency_ratio = self.derive_weights(self.pairwise)
+        if consistency_ratio > MAX_CONSISTENCY_RATIO:
+            raise ValueError(
+                f"Pairwise comparisons are inconsistent (consistency ratio {consistency_ratio:.3f} > {MAX_CONSISTENCY_RATIO})"
+            )
+        return derived, consistency_ratio
+
+    def score(self, matrix, weights, rng):
+        derived, consistency_ratio = self._criteria_weights(weights)
+        scores = matrix.normalized() @ derived
+        return scores * 100, {
+            "derivedWeights": dict(zip(SCORE_FIELDS, np.round(derived, 4).tolist())),
+            "consistencyRatio": round(float(consistency_ratio), 4),
+        }
+
+    def contributions(self, matrix, weights, scores):
+        derived, _ = self._criteria_weights(weights)
+        return np.column_stack([matrix.normalized() * derived * 100, np.zeros(len(matrix))])
+
+
+def get_engine(method: RankingMethod, pairwise: Optional[Sequence[Sequence[float]]] = None) -> RankingEngine:
+    """Return the engine for a ranking method"""
+    method = RankingMethod(method)
+    if method == RankingMethod.AHP:
+        return AHPEngine(pairwise)
+    engines = {
+        RankingMethod.WEIGHTED_SUM: WeightedSumEngine,
+        RankingMethod.TOPSIS: TOPSISEngine,
+        RankingMethod.WSJF: WSJFEngine,
+    }
+    return engines[method]()
@@ -0,0 +1,322 @@
+"""
+Release planning: pick the requirements that maximize total priority score
+within a cost budget (0/1 knapsack), optionally over several releases.
+
+A requirement can only be planned together with, or after, its
+prerequisites. When a release's candidates depend on each other, the plain
+knapsack is the relaxation of a best-first branch and bound: a selection
+that takes a requirement without its prerequisite is split into "leave the
+requirement (and its dependents) out" and "force the prerequisite (and its
+own prerequisites) in".
+"""
+
+import heapq
+import math
+import os
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate, count
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from models.compact import PrioritizedRecord
+
+# Costs are scored 1-10 with up to one decimal place; scaling them to integers
+# keeps the DP exact for typical inputs (finer costs are rounded up)
+COST_SCALE = 10
+DEFAULT_COST = 5.0
+# Largest DP table (items x capacity cells) before switching to branch-and-bound
+DP_MAX_CELLS = int(os.getenv("RELEASE_PLAN_DP_MAX_CELLS", "5000000"))
+DEFAULT_TIME_BUDGET_MS = int(os.getenv("RELEASE_PLAN_TIME_BUDGET_MS", "500"))
+MARGINAL_LIMIT = 5
+
+
+@dataclass
+class Release:
+    number: int
+    budget: float
+    requirements: List[PrioritizedRecord]
+    total_cost: float
+    total_score: float
+    solver: str
+    optimal: bool
+
+
+@dataclass
+class ReleasePlan:
+    releases: List[Release]
+    # (requirement, extra budget needed to add it to the first release)
+    marginal: List[Tuple[PrioritizedRecord, float]] = field(default_factory=list)
+
+
+def _cost(req: PrioritizedRecord) -> float:
+    return req.cost if req.cost is not None else DEFAULT_COST
+
+
+def _prerequisite_indices(requirements: Sequence[PrioritizedRecord]) -> List[List[int]]:
+    """Indices of each requirement's prerequisites among `requirements`
+
+    Prerequisites that are not listed (planned in an earlier release) are met.
+    """
+    by_id: Dict[str, List[int]] = {}
+    for index, req in enumerate(requirements):
+        by_id.setdefault(req.id, []).append(index)
+    return [
+        [index for prerequisite in dict.fromkeys(req.dependsOn or ()) for index in by_id.get(prerequisite, ())]
+        for req in requirements
+    ]
+
+
+def _closure(start: Iterable[int], edges: Sequence[Sequence[int]]) -> Set[int]:
+    """`start` plus everything reachable from it along `edges`"""
+    seen = set(start)
+    stack = list(seen)
+    while stack:
+        for neighbor in edges[stack.pop()]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return seen
+
+
+class ReleasePlanningService:
+    """0/1 knapsack over priority score vs. cost"""
+
+    def plan(
+        self,
+        requirements: Sequence[PrioritizedRecord],
+        budget: float,
+        releases: int = 1,
+        time_budget_ms: Optional[int] = None,
+    ) -> ReleasePlan:
+        """Fill `releases` consecutive releases of `budget` each, highest value first"""
+        # The time budget is shared evenly between releases
+        release_seconds = (time_budget_ms or DEFAULT_TIME_BUDGET_MS) / 1000 / releases
+        remaining = list(requirements)
+        planned: List[Release] = []
+        left_out: List[PrioritizedRecord] = []
+
+        for number in range(1, releases + 1):
+            deadline = time.perf_counter() + release_seconds
+            selected, solver, optimal = self.solve_with_dependencies(remaining, budget, deadline)
+            chosen = set(selected)
+            picked = [remaining[i] for i in sorted(selected)]
+            planned.append(Release(
+                number=number,
+                budget=budget,
+                requirements=picked,
+                total_cost=sum(_cost(req) for req in picked),
+                total_score=sum(req.priorityScore for req in picked),
+                solver=solver,
+                optimal=optimal,
+            ))
+            remaining = [req for i, req in enumerate(remaining) if i not in chosen]
+            if number == 1:
+                left_out = remaining
+            if not remaining:
+                break
+
+        return ReleasePlan(releases=planned, marginal=self._marginal(planned[0], left_out))
+
+    def solve(
+        self, requirements: Sequence[PrioritizedRecord], budget: float, deadline: float
+    ) -> Tuple[List[int], str, bool]:
+        """Return (selected indices, solver name, proven optimal), ignoring dependencies"""
+        costs, values, capacity = self._scale(requirements, budget)
+        return self._solve_scaled(values, costs, capacity, deadline)
+
+    def solve_with_dependencies(
+        self, requirements: Sequence[PrioritizedRecord], budget: float, deadline: float
+    ) -> Tuple[List[int], str, bool]:
+        """Like solve(), but a requirement is only selected together with its listed prerequisites"""
+        prerequisites = _prerequisite_indices(requirements)
+        if not any(prerequisites):
+            return self.solve(requirements, budget, deadline)
+
+        costs, values, capacity = self._scale(requirements, budget)
+        dependents: List[List[int]] = [[] for _ in requirements]
+        for index, required in enumerate(prerequisites):
+            for prerequisite in required:
+                dependents[prerequisite].append(index)
+
+        def value_of(items: Iterable[int]) -> float:
+            return sum(values[i] for i in items)
+
+        best_value, best_selected = 0.0, []
+        exact = True
+        tiebreak = count()
+        # Best-first on the parent's relaxed value: (-bound, tiebreak, forced in, forced out)
+        queue: List[Tuple[float, int, FrozenSet[int], FrozenSet[int]]] = [
+            (-math.inf, next(tiebreak), frozenset(), frozenset())
+        ]
+        while queue:
+            if time.perf_counter() > deadline:
+                exact = False
+                break
+            negative_bound, _, forced_in, forced_out = heapq.heappop(queue)
+            if -negative_bound <= best_value:
+                break
+
+            room = capacity - sum(costs[i] for i in forced_in)
+            free = [i for i in range(len(requirements)) if i not in forced_in and i not in forced_out]
+            chosen, _, optimal = self._solve_scaled(
+                [values[i] for i in free], [costs[i] for i in free], room, deadline
+            )
+            exact = exact and optimal
+            selected = forced_in.union(free[j] for j in chosen)
+            bound = value_of(selected)
+            if bound <= best_value:
+                continue
+
+            violation = next(
+                ((index, prerequisite) for index in sorted(selected) for prerequisite in prerequisites[index]
+                 if prerequisite not in selected),
+                None,
+            )
+            if violation is None:
+                best_value, best_selected = bound, sorted(selected)
+                continue
+
+            # Dropping requirements with unmet prerequisites gives a feasible plan to beat
+            feasible = set(selected)
+            while True:
+                unmet = {i for i in feasible if any(p not in feasible for p in prerequisites[i])}
+                if not unmet:
+                    break
+                feasible -= unmet
+            if value_of(feasible) > best_value:
+                best_value, best_selected = value_of(feasible), sorted(feasible)
+
+            index, prerequisite = violation
+            without = _closure([index], dependents)
+            if not without & forced_in:
+                heapq.heappush(queue, (-bound, next(tiebreak), forced_in, forced_out | without))
+            with_prerequisite = _closure([prerequisite], prerequisites)
+            if not with_prerequisite & forced_out and sum(costs[i] for i in forced_in | with_prerequisite) <= capacity:
+                heapq.heappush(queue, (-bound, next(tiebreak), forced_in | with_prerequisite, forced_out))
+
+        solver = "dependency_branch_and_bound" if exact else "dependency_branch_and_bound_timeout"
+        return best_selected, solver, exact
+
+    @staticmethod
+    def _scale(requirements: Sequence[PrioritizedRecord], budget: float) -> Tuple[List[int], List[float], int]:
+        """Integer costs, values and integer capacity for the solvers"""
+        costs = [math.ceil(_cost(req) * COST_SCALE - 1e-9) for req in requirements]
+        values = [req.priorityScore for req in requirements]
+        capacity = int(math.floor(budget * COST_SCALE + 1e-9))
+        return costs, values, capacity
+
+    def _solve_scaled(
+        self, values: List[float], costs: List[int], capacity: int, deadline: float
+    ) -> Tuple[List[int], str, bool]:
+        if sum(costs) <= capacity:
+            return list(range(len(values))), "all", True
+        if len(values) * (capacity + 1) <= DP_MAX_CELLS:
+            return self._solve_dp(values, costs, capacity), "dynamic_programming", True
+        selected, optimal = self._solve_branch_and_bound(values, costs, capacity, deadline)
+        return selected, "branch_and_bound" if optimal else "branch_and_bound_timeout", optimal
+
+    @staticmethod
+    def _solve_dp(values: List[float], costs: List[int], capacity: int) -> List[int]:
+        # numpy is loaded on first use to keep application start-up fast
+        import numpy as np
+
+        best = np.zeros(capacity + 1)
+        keep = np.zeros((len(values), capacity + 1), dtype=bool)
+        for i, (value, cost) in enumerate(zip(values, costs)):
+            if cost > capacity:
+                continue
+            # Value of taking item i at every capacity w >= cost, from the previous row
+            candidate = best[:capacity + 1 - cost] + value
+            improved = candidate > best[cost:]
+            keep[i, cost:] = improved
+            best[cost:] = np.where(improved, candidate, best[cost:])
+
+        selected = []
+        w = capacity
+        for i in range(len(values) - 1, -1, -1):
+            if keep[i, w]:
+                selected.append(i)
+                w -= costs[i]
+        return selected
+
+    @staticmethod
+    def _solve_branch_and_bound(
+        values: List[float], costs: List[int], capacity: int, deadline: float
+    ) -> Tuple[List[int], bool]:
+        """Depth-first branch and bound with the fractional (LP) bound, seeded by greedy"""
+        order = sorted(
+            (i for i in range(len(values)) if costs[i] <= capacity),
+            key=lambda i: values[i] / costs[i],
+            reverse=True,
+        )
+        v = [values[i] for i in order]
+        c = [costs[i] for i in order]
+        n = len(order)
+        # Prefix sums turn the LP bound into a binary search
+        cost_prefix = list(accumulate(c, initial=0))
+        value_prefix = list(accumulate(v, initial=0.0))
+
+        def taken_items(path) -> List[int]:
+            items = []
+            while path:
+                level, path = path
+                items.append(level)
+            return items
+
+        # Greedy by value density is the starting incumbent
+        best_value, best_taken, room = 0.0, [], capacity
+        for j in range(n):
+            if c[j] <= room:
+                room -= c[j]
+                best_value += v[j]
+                best_taken.append(j)
+
+        # Stack of (level, value, room, taken items as a linked list)
+        stack = [(0, 0.0, capacity, None)]
+        nodes = 0
+        while stack:
+            nodes += 1
+            if nodes % 1024 == 0 and time.perf_counter() > deadline:
+                return [order[j] for j in best_taken], False
+            level, value, room, path = stack.pop()
+
+            # Items level..k-1 fit whole; item k (if any) is the fractional one
+            k = bisect_right(cost_prefix, cost_prefix[level] + room, lo=level) - 1
+            greedy_value = value + value_prefix[k] - value_prefix[level]
+            if k == n:
+                # Everything left fits: this branch is solved exactly
+                if greedy_value > best_value:
+                    best_value = greedy_value
+                    best_taken = taken_items(path) + list(range(level, n))
+                continue
+            fill = room - (cost_prefix[k] - cost_prefix[level])
+            if greedy_value + v[k] * fill / c[k] <= best_value:
+                continue
+
+            # Explore "skip" after "take" (stack is LIFO)
+            stack.append((level + 1, value, room, path))
+            if c[level] <= room:
+                stack.append((level + 1, value + v[level], room - c[level], (level, path)))
+
+        return [order[j] for j in best_taken], True
+
+    @staticmethod
+    def _marginal(first: Release, remaining: Sequence[PrioritizedRecord]) -> List[Tuple[PrioritizedRecord, float]]:
+        """Best excluded requirements by score per cost, with the extra budget each would need
+
+        A requirement's cost includes its prerequisites that were left out too.
+        """
+        spare = first.budget - first.total_cost
+        prerequisites = _prerequisite_indices(remaining)
+        costs = [
+            sum(_cost(remaining[i]) for i in _closure([index], prerequisites))
+            for index in range(len(remaining))
+        ]
+        candidates = sorted(
+            range(len(remaining)), key=lambda i: remaining[i].priorityScore / costs[i], reverse=True
+        )
+        return [
+            (remaining[i], round(max(0.0, costs[i] - spare), 2))
+            for i in candidates[:MARGINAL_LIMIT]
+        ]
@@ -0,0 +1,109 @@
+"""
+Scenario ranking: one session ranked under several sets of weights at once.
+
+The weighted-sum scores of every scenario come from a single matrix product
+of the normalized criteria matrix (requirements x criteria) with the stacked
+weight vectors (criteria x scenarios), scaled by the category multipliers.
+Unlike /prioritization/analyze no tie-breaking noise is added, so scenarios
+can be compared directly. Kendall's tau between each pair of rankings
+summarizes how much the scenarios disagree.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.requirement import Weights
+from services.dependency_graph import constrained_order
+
+MAX_SCENARIOS = 20
+
+
+@dataclass
+class ScenarioRanking:
+    name: str
+    weights: Weights
+    profile_id: Optional[str]
+    # Input order of the records
+    scores: List[float]
+    ranks: List[int]
+
+
+def kendall_tau(first: Sequence[float], second: Sequence[float]) -> Optional[float]:
+    """Kendall's tau of two rankings of the same items (None for fewer than two items)
+
+    Both rankings are turned into permutations, so the coefficient is
+    1 - 4 * discordant pairs / (n * (n - 1)). Discordant pairs are counted as
+    inversions with a bottom-up merge sort, vectorized per level:
+    O(n log^2 n) without a Python loop over items.
+    """
+    # numpy is loaded on first use to keep application start-up fast
+    import numpy as np
+
+    count = len(first)
+    if count < 2:
+        return None
+    # Position of each item in the second ranking, listed in order of the first
+    by_first = np.argsort(np.asarray(first), kind="stable")
+    second_positions = np.empty(count, dtype=np.int64)
+    second_positions[np.argsort(np.asarray(second), kind="stable")] = np.arange(count)
+    values = second_positions[by_first]
+
+    positions = np.arange(count)
+    discordant = 0
+    width = 1
+    while width < count:
+        # Runs of `width` are sorted; offsetting each merge pair keeps the pairs apart in one sorted array
+        pair = positions // (2 * width)
+        keyed = values + pair * count
+        is_right = (positions // width) % 2 == 1
+        left, right = keyed[~is_right], keyed[is_right]
+        not_greater = np.searchsorted(left, right, side="right")
+        pair_end = np.searchsorted(left, (pair[is_right] + 1) * count, side="left")
+        discordant += int((pair_end - not_greater).sum())
+        values = np.sort(keyed) - pair * count
+        width *= 2
+
+    return 1.0 - 4.0 * discordant / (count * (count - 1))
+
+
+class ScenarioService:
+    """Rank requirements under several weight sets in one pass and compare the rankings"""
+
+    def rank(
+        self, records: Sequence, scenarios: Sequence[Tuple[str, Weights, Optional[str]]]
+    ) -> List[ScenarioRanking]:
+        """Rank records under each (name, weights, profile ID) scenario"""
+        import numpy as np
+        from services.ranking_engines import CriteriaMatrix, weight_vector
+
+        matrix = CriteriaMatrix(records)
+        stacked = np.column_stack([weight_vector(weights) for _, weights, _ in scenarios])
+        scores = matrix.normalized() @ stacked
+        scores *= matrix.category_multipliers()[:, None]
+        scores = np.clip(scores * 100, 0, 100)
+
+        constrained = any(record.dependsOn for record in records)
+        rankings = []
+        for column, (name, weights, profile_id) in enumerate(scenarios):
+            column_scores = scores[:, column]
+            order = np.argsort(-column_scores, kind="stable").tolist()
+            column_scores = column_scores.tolist()
+            if constrained:
+                # Same precedence rules as /prioritization/analyze
+                order, _ = constrained_order(records, column_scores, order)
+            ranks = [0] * len(records)
+            for rank, index in enumerate(order, start=1):
+                ranks[index] = rank
+            rankings.append(ScenarioRanking(name, weights, profile_id, column_scores, ranks))
+        return rankings
+
+    @staticmethod
+    def correlations(ranks: Sequence[Tuple[str, Dict[str, int]]]) -> List[Tuple[str, str, Optional[float]]]:
+        """Kendall's tau for every pair of (scenario name, {requirement ID: rank}), over their common requirements"""
+        result = []
+        for (first_name, first), (second_name, second) in combinations(ranks, 2):
+            common = [requirement_id for requirement_id in first if requirement_id in second]
+            tau = kendall_tau([first[key] for key in common], [second[key] for key in common])
+            result.append((first_name, second_name, tau))
+        return result
@@ -0,0 +1,156 @@
+"""
+Full-text search over a user's requirements.
+
+PostgreSQL uses the generated `requirements.search_vector` column (GIN index);
+SQLite uses the `requirements_fts` FTS5 table. Both are created by
+`migrations.add_requirement_search`.
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+SNIPPET_WORDS = 16
+# Private-use characters mark matches so the text around them can be HTML-escaped
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+
+POSTGRES_SEARCH = """
+    SELECT r.external_id, r.title, r.session_id, s.name, s.created_at,
+           ts_rank_cd(r.search_vector, query) AS score,
+           ts_headline('english', concat_ws(' ', r.title, r.description), query, :headline_options) AS snippet
+    FROM requirements r
+    JOIN sessions s ON s.id = r.session_id,
+         websearch_to_tsquery('english', :query) AS query
+    WHERE r.search_vector @@ query
+      AND s.user_id = :user_id
+      {session_filter}
+    ORDER BY score DESC, r.created_at DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+POSTGRES_COUNT = """
+    SELECT count(*)
+    FROM requirements r
+    JOIN sessions s ON s.id = r.session_id
+    WHERE r.search_vector @@ websearch_to_tsquery('english', :query)
+      AND s.user_id = :user_id
+      {session_filter}
+"""
+
+SQLITE_SEARCH = """
+    SELECT r.external_id, r.title, r.session_id, s.name, s.created_at,
+           -bm25(requirements_fts, 2.0, 1.0) AS score,
+           snippet(requirements_fts, -1, :match_start, :match_end, '...', {words}) AS snippet
+    FROM requirements_fts
+    JOIN requirements_fts_keys k ON k.fts_rowid = requirements_fts.rowid
+    JOIN requirements r ON r.id = k.requirement_id
+    JOIN sessions s ON s.id = r.session_id
+    WHERE requirements_fts MATCH :query
+      AND s.user_id = :user_id
+      {session_filter}
+    ORDER BY score DESC, r.created_at DESC
+    LIMIT :limit OFFSET :offset
+""".replace("{words}", str(SNIPPET_WORDS))
+
+SQLITE_COUNT = """
+    SELECT count(*)
+    FROM requirements_fts
+    JOIN requirements_fts_keys k ON k.fts_rowid = requirements_fts.rowid
+    JOIN requirements r ON r.id = k.requirement_id
+    JOIN sessions s ON s.id = r.session_id
+    WHERE requirements_fts MATCH :query
+      AND s.user_id = :user_id
+      {session_filter}
+"""
+
+
+@dataclass(slots=True)
+class SearchHit:
+    requirementId: str
+    title: str
+    sessionId: str
+    sessionName: Optional[str]
+    sessionCreatedAt: Optional[datetime]
+    score: float
+    snippet: str
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet and turn the match markers into <b> tags"""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MATCH_START, "<b>").replace(MATCH_END, "</b>")
+
+
+def fts5_query(query: str) -> str:
+    """Quote each word so user input cannot use FTS5 query syntax (all words must match)"""
+    return " ".join(f'"{token}"' for token in _TOKEN.findall(query))
+
+
+class SearchService:
+    """Ranked, paginated full-text search restricted to one user's sessions"""
+
+    def search(
+        self,
+        db: Session,
+        user_id: str,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        session_id: Optional[str] = None,
+    ) -> Tuple[List[SearchHit], int]:
+        """Return one page of hits (best first) and the total number of matches"""
+        if db.get_bind().dialect.name == "postgresql":
+            search_sql, count_sql = POSTGRES_SEARCH, POSTGRES_COUNT
+        else:
+            search_sql, count_sql = SQLITE_SEARCH, SQLITE_COUNT
+            query = fts5_query(query)
+            if not query:
+                return [], 0
+
+        session_filter = "AND r.session_id = :session_id" if session_id else ""
+        params = {
+            "query": query,
+            "user_id": user_id,
+            "session_id": session_id,
+            "limit": page_size,
+            "offset": (page - 1) * page_size,
+            "match_start": MATCH_START,
+            "match_end": MATCH_END,
+            "headline_options": (
+                f"MaxWords={SNIPPET_WORDS}, MinWords=5, StartSel={MATCH_START}, StopSel={MATCH_END}"
+            ),
+        }
+        rows = db.execute(text(search_sql.replace("{session_filter}", session_filter)), params).all()
+        if len(rows) < page_size and (rows or page == 1):
+            # Last page: the total is known without counting
+            total = params["offset"] + len(rows)
+        else:
+            total = db.execute(text(count_sql.replace("{session_filter}", session_filter)), params).scalar() or 0
+
+        hits = [
+            SearchHit(
+                requirementId=row.external_id,
+                title=row.title,
+                sessionId=row.session_id,
+                sessionName=row.name,
+                sessionCreatedAt=_as_datetime(row.created_at),
+                score=round(float(row.score), 4),
+                snippet=highlight(row.snippet),
+            )
+            for row in rows
+        ]
+        return hits, total
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    # SQLite returns timestamps from raw SQL as strings
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
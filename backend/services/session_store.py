@@ -0,0 +1,169 @@
+"""
+Session storage for the unauthenticated API (main.py)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from models.requirement import Requirement, PrioritizedRequirement
+
+logger = logging.getLogger("aria.sessions")
+
+SESSION_STORE_BACKEND = os.getenv("ARIA_SESSION_STORE", "memory")
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+
+REQUIREMENT_FIELDS = (
+    "id", "title", "description", "businessValue", "cost",
+    "risk", "urgency", "stakeholderValue", "category", "dependsOn",
+)
+# Later additions go at the end so sessions stored before them still decode
+PRIORITIZED_FIELDS = REQUIREMENT_FIELDS[:-1] + (
+    "priorityScore", "rank", "confidence", "reasoning", "dependsOn", "contributions",
+)
+
+
+@dataclass
+class SessionData:
+    """Requirements and results of one anonymous session"""
+    requirements: List[Requirement]
+    prioritized_requirements: Optional[List[PrioritizedRequirement]] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+class SessionStore(ABC):
+    """Bounded storage for anonymous sessions"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionData]:
+        """Return the session, or None if it is unknown or expired"""
+
+    @abstractmethod
+    def save(self, session_id: str, session: SessionData) -> None:
+        """Create or replace a session"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove a session if present"""
+
+
+class InMemorySessionStore(SessionStore):
+    """Per-process LRU store with a sliding TTL"""
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl_seconds: int = SESSION_TTL_SECONDS) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, Tuple[float, SessionData]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[SessionData]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            expires_at, session = entry
+            if expires_at < time.monotonic():
+                del self._sessions[session_id]
+                return None
+            self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, session)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session_id: str, session: SessionData) -> None:
+        with self._lock:
+            self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, session)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_entries:
+                evicted, _ = self._sessions.popitem(last=False)
+                logger.debug(f"Evicted session {evicted}")
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def _pack_rows(items, fields) -> list:
+    return [[getattr(item, name) for name in fields] for item in items]
+
+
+def _unpack_rows(model, fields, rows) -> list:
+    # Rows were validated when the session was created, so skip re-validation
+    return [model.model_construct(**dict(zip(fields, row))) for row in rows]
+
+
+def serialize_session(session: SessionData) -> bytes:
+    """Encode a session as zlib-compressed JSON rows (field names stored once)"""
+    payload = {
+        "createdAt": session.created_at.isoformat(),
+        "requirements": _pack_rows(session.requirements, REQUIREMENT_FIELDS),
+        "prioritized": (
+            _pack_rows(session.prioritized_requirements, PRIORITIZED_FIELDS)
+            if session.prioritized_requirements is not None
+            else None
+        ),
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def deserialize_session(data: bytes) -> SessionData:
+    """Decode a session written by serialize_session"""
+    payload = json.loads(zlib.decompress(data))
+    prioritized = payload["prioritized"]
+    return SessionData(
+        requirements=_unpack_rows(Requirement, REQUIREMENT_FIELDS, payload["requirements"]),
+        prioritized_requirements=(
+            _unpack_rows(PrioritizedRequirement, PRIORITIZED_FIELDS, prioritized)
+            if prioritized is not None
+            else None
+        ),
+        created_at=datetime.fromisoformat(payload["createdAt"]),
+    )
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions shared by all workers, compactly serialized with a sliding TTL"""
+
+    KEY_PREFIX = "aria:session:"
+
+    def __init__(self, client=None, ttl_seconds: int = SESSION_TTL_SECONDS) -> None:
+        if client is None:
+            from redis_client import get_redis_binary_client
+            client = get_redis_binary_client()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+
+    def get(self, session_id: str) -> Optional[SessionData]:
+        data = self.client.getex(self._key(session_id), ex=self.ttl_seconds)
+        if data is None:
+            return None
+        return deserialize_session(data)
+
+    def save(self, session_id: str, session: SessionData) -> None:
+        self.client.setex(self._key(session_id), self.ttl_seconds, serialize_session(session))
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+
+def create_session_store(backend: str = SESSION_STORE_BACKEND) -> SessionStore:
+    """Build the store selected by ARIA_SESSION_STORE (memory or redis)"""
+    if backend == "redis":
+        return RedisSessionStore()
+    if backend == "memory":
+        return InMemorySessionStore()
+    raise ValueError(f"Unknown session store backend: {backend}")
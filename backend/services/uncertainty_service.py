@@ -0,0 +1,114 @@
+"""
+Monte Carlo uncertainty analysis of rankings.
+
+Every criterion score is treated as a distribution rather than a point
+estimate: a provided score is uniform within +/- `spread` of the estimate and
+a missing score (filled with the neutral 5) is uniform over the whole 1-10
+scale. Simulated matrices are stacked and scored by the ranking engine in one
+vectorized call per chunk, then ranked per simulation. The result is each
+requirement's rank distribution (5th/50th/95th percentile), its probability
+of landing in the top K, and a confidence derived from how narrow its rank
+interval is.
+
+Simulations are chunked so memory stays bounded, and the total work
+(simulations x requirements) is capped by UNCERTAINTY_MAX_CELLS so large
+sessions can still be analyzed on every call.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from models.requirement import Weights
+from services.ranking_engines import CriteriaMatrix, RankingEngine
+
+DEFAULT_SIMULATIONS = int(os.getenv("UNCERTAINTY_SIMULATIONS", "1000"))
+# Upper bound on simulations x requirements per analysis
+MAX_CELLS = int(os.getenv("UNCERTAINTY_MAX_CELLS", "2000000"))
+MIN_SIMULATIONS = 100
+# Simulations x requirements scored per engine call
+CHUNK_CELLS = 100_000
+DEFAULT_SPREAD = 1.0
+# A missing score could be anywhere on the 1-10 scale
+MISSING_SPREAD = 4.5
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class RankUncertainty:
+    simulations: int
+    spread: float
+    top_k: int
+    # Rank percentiles per requirement (input order, 1 = best)
+    rank_low: np.ndarray
+    rank_median: np.ndarray
+    rank_high: np.ndarray
+    top_k_probability: np.ndarray
+    confidence: np.ndarray
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "simulations": self.simulations,
+            "scoreSpread": self.spread,
+            "topK": self.top_k,
+            "rankPercentiles": list(PERCENTILES),
+        }
+
+
+def simulation_count(requested: Optional[int], requirements: int) -> int:
+    """Requested (or default) simulations, reduced for large sessions to respect MAX_CELLS"""
+    simulations = DEFAULT_SIMULATIONS if requested is None else requested
+    if simulations <= 0:
+        return 0
+    affordable = max(MIN_SIMULATIONS, MAX_CELLS // max(requirements, 1))
+    return min(simulations, affordable)
+
+
+def simulate_ranks(
+    matrix: CriteriaMatrix,
+    engine: RankingEngine,
+    weights: Weights,
+    rng: np.random.Generator,
+    simulations: int,
+    spread: float = DEFAULT_SPREAD,
+    top_k: int = 10,
+) -> RankUncertainty:
+    """Rank distribution of every requirement under perturbed criteria scores"""
+    count = len(matrix)
+    top_k = max(1, min(top_k, count))
+    # float32 halves the memory traffic; score resolution is far below the noise anyway
+    base = matrix.values.astype(np.float32)
+    half_width = np.where(matrix.provided, spread, MISSING_SPREAD).astype(np.float32)
+
+    ranks = np.empty((simulations, count), dtype=np.int32)
+    chunk = max(1, CHUNK_CELLS // count)
+    positions = np.arange(1, count + 1, dtype=np.int32)
+    for start in range(0, simulations, chunk):
+        stop = min(start + chunk, simulations)
+        noise = rng.random((stop - start, *base.shape), dtype=np.float32)
+        noise = noise * 2 - 1
+        noise *= half_width
+        noise += base
+        values = np.clip(noise, 1.0, 10.0, out=noise)
+        scores, _ = engine.score(CriteriaMatrix.with_values(matrix, values), weights, rng)
+        # Rank = position in the descending sort, scattered back to the requirement
+        order = np.argsort(-scores, axis=1)
+        np.put_along_axis(ranks[start:stop], order, np.broadcast_to(positions, order.shape), axis=1)
+
+    # Nearest-rank percentiles from one sort along the simulation axis
+    ranks.sort(axis=0)
+    low, median, high = (ranks[round(p / 100 * (simulations - 1))] for p in PERCENTILES)
+    # The narrower the 90% rank interval relative to the whole ranking, the more certain the rank
+    confidence = 1.0 - (high - low) / max(count - 1, 1)
+    return RankUncertainty(
+        simulations=simulations,
+        spread=spread,
+        top_k=top_k,
+        rank_low=low,
+        rank_median=median,
+        rank_high=high,
+        top_k_probability=(ranks <= top_k).mean(axis=0),
+        confidence=confidence,
+    )
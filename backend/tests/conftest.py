@@ -0,0 +1,19 @@
+"""
+Shared test setup: import the backend packages from the source tree, and use
+an in-memory SQLite database so modules that import the models load without
+a database server.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+
+@pytest.fixture
+def anyio_backend():
+    """Async tests (marked anyio) run on asyncio, like the application"""
+    return "asyncio"
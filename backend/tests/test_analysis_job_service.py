@@ -0,0 +1,194 @@
+"""Background analysis jobs: completion, cancellation and orphan detection"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base
+from database.models import Analysis
+from services import analysis_job_service
+from services.analysis_job_service import (
+    ORPHAN_AFTER_SECONDS,
+    ORPHANED_ERROR,
+    SHUTDOWN_ERROR,
+    AnalysisJobService,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeAnalysisService:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.error = None
+
+    async def analyze_requirements(self, requirements, prompt, use_cache=True, map_reduce=None):
+        self.started.set()
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"summary of {len(requirements)}"
+
+
+class FakeRegistry:
+    def __init__(self, service):
+        self.service = service
+        self.leased = 0
+
+    @asynccontextmanager
+    async def lease(self, api_key, base_url, model):
+        self.leased += 1
+        try:
+            yield self.service
+        finally:
+            self.leased -= 1
+
+
+class FakeConfigService:
+    def __init__(self, config=SimpleNamespace(api_key="key", base_url="http://llm", model="test-model")):
+        self.config = config
+
+    def get_config(self, db):
+        return self.config
+
+
+@pytest.fixture
+def db_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(analysis_job_service, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def llm():
+    return FakeAnalysisService()
+
+
+@pytest.fixture
+async def jobs(llm):
+    service = AnalysisJobService(FakeConfigService(), FakeRegistry(llm), workers=1)
+    yield service
+    llm.release.set()
+    await service.stop()
+
+
+def add_analysis(db_factory, status="pending", heartbeat_age=0.0, **fields):
+    db = db_factory()
+    analysis = Analysis(
+        session_id="s1",
+        user_id="u1",
+        status=status,
+        heartbeat_at=None if heartbeat_age is None else datetime.now(timezone.utc) - timedelta(seconds=heartbeat_age),
+        **fields,
+    )
+    db.add(analysis)
+    db.commit()
+    analysis_id = analysis.id
+    db.close()
+    return analysis_id
+
+
+def load(db_factory, analysis_id):
+    db = db_factory()
+    analysis = db.get(Analysis, analysis_id)
+    db.close()
+    return analysis
+
+
+async def test_completed_job_stores_summary(db_factory, jobs, llm):
+    analysis_id = add_analysis(db_factory)
+    jobs.enqueue(analysis_id, ["a", "b"])
+    await llm.started.wait()
+    assert load(db_factory, analysis_id).status == "running"
+
+    llm.release.set()
+    assert await jobs.drain(5)
+    analysis = load(db_factory, analysis_id)
+    assert (analysis.status, analysis.summary, analysis.model, analysis.error) == (
+        "completed", "summary of 2", "test-model", None
+    )
+    assert analysis.completed_at is not None
+    assert jobs._client_registry.leased == 0
+    assert jobs._active == set()
+
+
+async def test_failed_job_stores_error(db_factory, jobs, llm):
+    analysis_id = add_analysis(db_factory)
+    llm.error = RuntimeError("model unavailable")
+    llm.release.set()
+    jobs.enqueue(analysis_id, ["a"])
+    assert await jobs.drain(5)
+    analysis = load(db_factory, analysis_id)
+    assert (analysis.status, analysis.error) == ("failed", "model unavailable")
+
+
+async def test_missing_configuration_fails_the_job(db_factory, llm):
+    jobs = AnalysisJobService(FakeConfigService(config=None), FakeRegistry(llm), workers=1)
+    analysis_id = add_analysis(db_factory)
+    jobs.enqueue(analysis_id, ["a"])
+    assert await jobs.drain(5)
+    await jobs.stop()
+    assert (load(db_factory, analysis_id).status, load(db_factory, analysis_id).error) == (
+        "failed", "LLM configuration is not set"
+    )
+
+
+async def test_stop_fails_running_and_queued_jobs(db_factory, jobs, llm):
+    running = add_analysis(db_factory)
+    queued = add_analysis(db_factory)
+    jobs.enqueue(running, ["a"])
+    jobs.enqueue(queued, ["b"])
+    await llm.started.wait()
+
+    await jobs.stop()
+    for analysis_id in (running, queued):
+        analysis = load(db_factory, analysis_id)
+        assert (analysis.status, analysis.error) == ("failed", SHUTDOWN_ERROR)
+        assert analysis.completed_at is not None
+    assert jobs._client_registry.leased == 0
+    assert jobs._active == set()
+
+
+async def test_start_fails_jobs_with_a_stale_heartbeat(db_factory, jobs):
+    stale = ORPHAN_AFTER_SECONDS + 60
+    orphaned_pending = add_analysis(db_factory, heartbeat_age=stale)
+    orphaned_running = add_analysis(db_factory, status="running", heartbeat_age=stale)
+    # Rows from before the heartbeat column fall back to created_at
+    orphaned_legacy = add_analysis(
+        db_factory, heartbeat_age=None, created_at=datetime.now(timezone.utc) - timedelta(seconds=stale)
+    )
+    fresh = add_analysis(db_factory, status="running", heartbeat_age=ORPHAN_AFTER_SECONDS / 2)
+    finished = add_analysis(db_factory, status="completed", heartbeat_age=stale)
+
+    jobs.start()
+    await asyncio.sleep(0.05)
+
+    for analysis_id in (orphaned_pending, orphaned_running, orphaned_legacy):
+        analysis = load(db_factory, analysis_id)
+        assert (analysis.status, analysis.error) == ("failed", ORPHANED_ERROR)
+    assert load(db_factory, fresh).status == "running"
+    assert load(db_factory, finished).status == "completed"
+
+
+async def test_heartbeat_keeps_queued_jobs_alive(db_factory, jobs, llm):
+    running = add_analysis(db_factory)
+    # Waits behind the running job (one worker), so only the heartbeat refreshes it
+    queued = add_analysis(db_factory, heartbeat_age=ORPHAN_AFTER_SECONDS + 60)
+    jobs.enqueue(running, ["a"])
+    jobs.enqueue(queued, ["b"])
+    await llm.started.wait()
+    jobs._beat()
+
+    analysis = load(db_factory, queued)
+    assert analysis.status == "pending"
+    heartbeat = analysis.heartbeat_at.replace(tzinfo=analysis.heartbeat_at.tzinfo or timezone.utc)
+    assert datetime.now(timezone.utc) - heartbeat < timedelta(seconds=5)
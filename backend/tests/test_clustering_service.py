@@ -0,0 +1,126 @@
+"""Theme clustering: separated topics, incremental document statistics and category suggestions"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from models.compact import RequirementRecord
+from services.clustering_service import ClusteringService, tokenize
+
+TOPICS = [
+    "invoice billing payment refund currency checkout",
+    "upload photo gallery album thumbnail camera",
+    "calendar meeting schedule reminder agenda timezone",
+]
+
+
+def topic_records(rng, per_topic, category=None):
+    records = []
+    for topic, words in enumerate(TOPICS):
+        vocabulary = words.split()
+        for _ in range(per_topic):
+            index = len(records)
+            records.append(RequirementRecord(
+                id=f"R{index}",
+                title=" ".join(rng.sample(vocabulary, 3)),
+                description=" ".join(rng.sample(vocabulary, 4)),
+                category=category,
+            ))
+    return records
+
+
+def groups(clusters, records):
+    return sorted(sorted(records[i].id for i in cluster.members) for cluster in clusters)
+
+
+def recount(model):
+    frequency = Counter(term for counts in model.documents.values() for term in counts)
+    return {term: frequency[term] for term in model.terms}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_separated_topics_are_recovered(seed):
+    rng = random.Random(seed)
+    records = topic_records(rng, 8)
+    rng.shuffle(records)
+    expected = sorted(
+        sorted(record.id for record in records if set(tokenize(record.title)) <= set(words.split()))
+        for words in TOPICS
+    )
+
+    clusters, cached = ClusteringService().cluster("s", records, k=3)
+    assert not cached
+    assert groups(clusters, records) == expected
+    # Same input, same clusters
+    again, _ = ClusteringService().cluster("s", records, k=3)
+    assert [(c.themes, c.members) for c in again] == [(c.themes, c.members) for c in clusters]
+
+
+def test_warm_start_keeps_clusters_and_counts():
+    service = ClusteringService()
+    records = topic_records(random.Random(1), 10)
+    first, _ = service.cluster("s", records, k=3)
+    counts = service._models["s"].centroid_counts.copy()
+
+    records[0] = RequirementRecord(id="R0", title="refund invoice", description="payment currency refund")
+    second, cached = service.cluster("s", records, k=3)
+    assert cached
+    assert groups(second, records) == groups(first, records)
+    assert (service._models["s"].centroid_counts >= counts).all()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_document_frequency_matches_recount_after_edits(seed):
+    rng = random.Random(seed)
+    service = ClusteringService()
+    records = topic_records(rng, 6)
+    service.cluster("s", records)
+    for _ in range(5):
+        # Edit some records, remove some, add some, duplicate one
+        for _ in range(rng.randint(0, 4)):
+            index = rng.randrange(len(records))
+            words = rng.sample(rng.choice(TOPICS).split() + ["extra", "wording", "changed"], 4)
+            records[index] = RequirementRecord(id=records[index].id, title=" ".join(words), description="")
+        for _ in range(rng.randint(0, 3)):
+            if len(records) > 2:
+                records.pop(rng.randrange(len(records)))
+        records += topic_records(rng, 1)[: rng.randint(0, 3)]
+        records.append(records[0])
+        service.cluster("s", records)
+
+        model = service._models["s"]
+        assert dict(zip(model.terms, model.document_frequency)) == recount(model)
+        assert len(model.documents) == len({(r.title, r.description) for r in records})
+
+
+def test_category_from_member_labels():
+    records = topic_records(random.Random(2), 4, category="COMPLIANCE")
+    records[0].category = "BUG_FIX"
+    clusters, _ = ClusteringService().cluster("s", records, k=1)
+    assert [(c.suggested_category, c.basis) for c in clusters] == [("COMPLIANCE", "labels")]
+
+
+def test_category_from_keywords():
+    records = [
+        RequirementRecord(id="A", title="Checkout crash", description="Fix the crash error on checkout"),
+        RequirementRecord(id="B", title="Checkout bug", description="Broken checkout after error"),
+    ]
+    clusters, _ = ClusteringService().cluster("s", records, k=1)
+    assert [(c.suggested_category, c.basis) for c in clusters] == [("BUG_FIX", "keywords")]
+
+
+def test_category_default_without_labels_or_keywords():
+    records = [
+        RequirementRecord(id="A", title="Gallery thumbnail", description="Photo album thumbnail"),
+        RequirementRecord(id="B", title="Album photo", description="Gallery photo camera"),
+    ]
+    clusters, _ = ClusteringService().cluster("s", records, k=1)
+    assert [(c.suggested_category, c.basis) for c in clusters] == [("FEATURE", "default")]
+
+
+def test_records_without_text():
+    records = [RequirementRecord(id=f"R{i}", title="", description="") for i in range(3)]
+    clusters, _ = ClusteringService().cluster("s", records)
+    assert sorted(i for c in clusters for i in c.members) == [0, 1, 2]
+    assert all(c.themes == [] for c in clusters)
@@ -0,0 +1,153 @@
+"""Dependency-constrained ordering against a naive reimplementation"""
+
+import random
+
+import pytest
+
+from models.compact import RequirementRecord
+from services.dependency_graph import DependencyCycleError, DependencyGraph, constrained_order
+
+
+def random_dag(rng, count, edge_probability):
+    """Node IDs and (requirement, prerequisite) edges along a random delivery order"""
+    nodes = [f"R{i}" for i in range(count)]
+    delivery = nodes[:]
+    rng.shuffle(delivery)
+    edges = [
+        (delivery[later], delivery[earlier])
+        for later in range(count) for earlier in range(later) if rng.random() < edge_probability
+    ]
+    return nodes, edges
+
+
+def records_for(nodes, edges):
+    prerequisites = {node: [] for node in nodes}
+    for requirement, prerequisite in edges:
+        prerequisites[requirement].append(prerequisite)
+    return [
+        RequirementRecord(id=node, title=node, description="", dependsOn=prerequisites[node] or None)
+        for node in nodes
+    ]
+
+
+def brute_force(nodes, edges, scores, tie_order):
+    """Repeatedly deliver the available node whose best transitive dependent scores highest"""
+    dependents = {node: set() for node in nodes}
+    prerequisites = {node: set() for node in nodes}
+    for requirement, prerequisite in edges:
+        dependents[prerequisite].add(requirement)
+        prerequisites[requirement].add(prerequisite)
+
+    def reachable(node):
+        seen, stack = {node}, [node]
+        while stack:
+            for dependent in dependents[stack.pop()]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    inherited = {node: max(scores.get(other, 0.0) for other in reachable(node)) for node in nodes}
+    position = {node: index for index, node in enumerate(tie_order)}
+    order, done = [], set()
+    while len(order) < len(nodes):
+        available = [node for node in nodes if node not in done and prerequisites[node] <= done]
+        node = min(available, key=lambda n: (-inherited[n], -scores.get(n, 0.0), position.get(n, len(position)), n))
+        order.append(node)
+        done.add(node)
+    return order
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_ranked_order_matches_brute_force(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_dag(rng, rng.randint(1, 25), rng.choice([0.05, 0.2, 0.5]))
+    # Few distinct scores so ties are common
+    scores = {node: float(rng.randint(0, 4)) for node in nodes}
+    tie_order = nodes[:]
+    rng.shuffle(tie_order)
+    graph = DependencyGraph(nodes, edges)
+    assert graph.ranked_order(scores, tie_order) == brute_force(nodes, edges, scores, tie_order)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_topological_order_puts_prerequisites_first(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_dag(rng, 30, 0.2)
+    order = DependencyGraph(nodes, edges).topological_order()
+    position = {node: index for index, node in enumerate(order)}
+    assert sorted(order) == sorted(nodes)
+    assert all(position[prerequisite] < position[requirement] for requirement, prerequisite in edges)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_constrained_order_keeps_score_order_without_dependencies(seed):
+    rng = random.Random(seed)
+    records = records_for([f"R{i}" for i in range(15)], [])
+    scores = [rng.random() for _ in records]
+    order = sorted(range(len(records)), key=lambda i: -scores[i])
+    assert constrained_order(records, scores, order) == (order, 0)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_constrained_order_matches_brute_force(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_dag(rng, 15, 0.2)
+    records = records_for(nodes, edges)
+    scores = [float(rng.randint(0, 4)) for _ in records]
+    score_order = sorted(range(len(records)), key=lambda i: -scores[i])
+    order, applied = constrained_order(records, scores, score_order)
+    tie_order = [nodes[i] for i in score_order]
+    expected = brute_force(nodes, edges, dict(zip(nodes, scores)), tie_order)
+    assert [nodes[i] for i in order] == expected
+    assert applied == len(edges)
+
+
+def test_empty_graph():
+    graph = DependencyGraph.from_records([])
+    assert graph.topological_order() == []
+    assert graph.ranked_order({}, []) == []
+    assert graph.find_cycle() is None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cycle_is_rejected_and_reported(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_dag(rng, 12, 0.2)
+    # Close a loop through a few random nodes on top of the acyclic edges
+    loop = rng.sample(nodes, rng.randint(2, 5))
+    edges += [(loop[i], loop[i - 1]) for i in range(len(loop))]
+
+    with pytest.raises(DependencyCycleError) as error:
+        DependencyGraph.from_records(records_for(nodes, edges))
+    cycle = error.value.cycle
+    assert cycle[0] == cycle[-1]
+    edge_set = set(edges)
+    # Each node is a prerequisite of the next one
+    assert all((after, before) in edge_set for before, after in zip(cycle, cycle[1:]))
+
+
+def test_add_edge_rejects_cycles_and_keeps_the_graph():
+    graph = DependencyGraph(["A", "B", "C"], [("B", "A"), ("C", "B")])
+    with pytest.raises(DependencyCycleError):
+        graph.add_edge("A", "C")
+    with pytest.raises(DependencyCycleError):
+        graph.add_edge("A", "A")
+    assert graph.edge_count == 2
+    assert graph.add_edge("C", "A") is True
+    assert graph.add_edge("C", "A") is False
+
+
+def test_ranked_order_raises_on_cycle():
+    graph = DependencyGraph.from_records(
+        [RequirementRecord(id="A", title="", description="", dependsOn=["B"]),
+         RequirementRecord(id="B", title="", description="", dependsOn=["A"])],
+        validate=False,
+    )
+    with pytest.raises(DependencyCycleError):
+        graph.ranked_order({"A": 1.0, "B": 2.0}, ["A", "B"])
+
+
+def test_unknown_prerequisite_is_rejected():
+    with pytest.raises(ValueError, match="Unknown requirement ID"):
+        DependencyGraph.from_records([RequirementRecord(id="A", title="", description="", dependsOn=["Z"])])
@@ -0,0 +1,145 @@
+"""MinHash/LSH duplicate detection against exact Jaccard similarity"""
+
+import random
+import string
+from itertools import combinations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base
+from database.models import RequirementSignature, RequirementSignatureBand
+from models.compact import RequirementRecord
+from services.duplicate_service import DUPLICATE_THRESHOLD, DuplicateDetectionService, shingles
+
+
+def random_words(rng, count):
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(count)]
+
+
+def record(index, text):
+    return RequirementRecord(id=f"R{index}", title=text, description="")
+
+
+def jaccard(first, second):
+    a, b = set(shingles(first)), set(shingles(second))
+    return len(a & b) / len(a | b)
+
+
+def near_duplicate_records(rng):
+    """Groups of texts differing in one word, unrelated across groups"""
+    texts = []
+    for _ in range(rng.randint(1, 6)):
+        words = random_words(rng, 30)
+        for _ in range(rng.randint(1, 4)):
+            variant = words[:]
+            variant[rng.randrange(len(variant))] = random_words(rng, 1)[0]
+            texts.append(' '.join(variant))
+    rng.shuffle(texts)
+    return [record(index, text) for index, text in enumerate(texts)]
+
+
+def brute_force_clusters(records, signatures, service):
+    """Connected components over every pair whose estimated similarity reaches the threshold"""
+    component = list(range(len(records)))
+    weakest = {}
+    for first, second in combinations(range(len(records)), 2):
+        score = service.similarity(signatures[first], signatures[second])
+        if score < DUPLICATE_THRESHOLD:
+            continue
+        old, new = component[second], component[first]
+        component = [new if c == old else c for c in component]
+        weakest[new] = min(score, weakest.pop(old, 1.0), weakest.get(new, 1.0))
+    groups = {}
+    for index, c in enumerate(component):
+        groups.setdefault(c, []).append(records[index].id)
+    return sorted(
+        (sorted(members), round(weakest[c], 3)) for c, members in groups.items() if len(members) > 1
+    )
+
+
+def test_shingles():
+    assert shingles("Hello, World!") == ["hello", "ello ", "llo w", "lo wo", "o wor", " worl", "world"]
+    assert shingles("  Hi! ") == ["hi"]
+    assert shingles("...") == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_signature_estimates_jaccard(seed):
+    rng = random.Random(seed)
+    words = random_words(rng, 20)
+    other = words[:]
+    for position in rng.sample(range(len(words)), rng.randint(0, 20)):
+        other[position] = random_words(rng, 1)[0]
+    first, second = ' '.join(words), ' '.join(other)
+    service = DuplicateDetectionService()
+    signatures = service.signatures([record(0, first), record(1, second)])
+    # Standard error of a 128-row estimate is at most 0.045
+    assert service.similarity(signatures[0], signatures[1]) == pytest.approx(jaccard(first, second), abs=0.2)
+
+
+def test_signatures_are_stable():
+    service = DuplicateDetectionService()
+    records = [record(0, "Export the monthly report as PDF")]
+    assert (service.signatures(records) == service.signatures(records)).all()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_clusters_match_brute_force(seed):
+    rng = random.Random(seed)
+    records = near_duplicate_records(rng)
+    service = DuplicateDetectionService()
+    signatures = service.signatures(records)
+    found = sorted((sorted(group.requirement_ids), group.similarity) for group in service.find_clusters(records, signatures))
+    assert found == brute_force_clusters(records, signatures, service)
+
+
+def test_identical_records_form_one_cluster():
+    records = [record(i, "Users can reset their password by email") for i in range(5)]
+    service = DuplicateDetectionService()
+    groups = service.find_clusters(records, service.signatures(records))
+    assert [(sorted(group.requirement_ids), group.similarity) for group in groups] == [
+        ([f"R{i}" for i in range(5)], 1.0)
+    ]
+
+
+def test_blank_records_are_never_duplicates():
+    records = [record(0, ""), record(1, "!!!"), record(2, "")]
+    service = DuplicateDetectionService()
+    assert service.find_clusters(records, service.signatures(records)) == []
+
+
+def test_empty_input():
+    service = DuplicateDetectionService()
+    assert service.find_clusters([], service.signatures([])) == []
+    findings = service.check_upload(None, "user", "session", [])
+    assert findings.clusters == [] and findings.prior_matches == []
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[RequirementSignature.__table__, RequirementSignatureBand.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_prior_matches_across_sessions(db):
+    rng = random.Random(5)
+    words = random_words(rng, 30)
+    original = ' '.join(words)
+    words[3] = "changed"
+    service = DuplicateDetectionService()
+
+    service.check_upload(db, "alice", "first", [record(0, original), record(1, ' '.join(random_words(rng, 30)))])
+    findings = service.check_upload(db, "alice", "second", [record(7, ' '.join(words))])
+    assert [(m.requirement_id, m.match_session_id, m.match_requirement_id) for m in findings.prior_matches] == [
+        ("R7", "first", "R0")
+    ]
+    assert findings.prior_matches[0].similarity >= DUPLICATE_THRESHOLD
+
+    # Other users' sessions are never matched
+    assert service.check_upload(db, "bob", "third", [record(8, original)]).prior_matches == []
@@ -0,0 +1,102 @@
+"""Lease counting of pooled LLM clients across configuration changes"""
+
+import asyncio
+
+import pytest
+
+from services import llm_client_registry
+from services.llm_client_registry import LLMClientRegistry
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeService:
+    def __init__(self, api_key, base_url, model, client, cache):
+        self.model = model
+        self.closed = 0
+
+    async def aclose(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(llm_client_registry, "AnalysisService", FakeService)
+    monkeypatch.setattr(LLMClientRegistry, "_build_client", staticmethod(lambda api_key, base_url: None))
+    return LLMClientRegistry()
+
+
+async def settle():
+    """Let close tasks scheduled by invalidate() run"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_same_configuration_shares_one_service(registry):
+    async with registry.lease("key", "http://llm", "m") as first:
+        async with registry.lease("key", "http://llm", "m") as second:
+            assert first is second
+        async with registry.lease("other-key", "http://llm", "m") as third:
+            assert third is not first
+    assert first.closed == 0
+
+
+async def test_leased_service_is_closed_after_its_last_lease(registry):
+    async with registry.lease("key", "http://llm", "m") as service:
+        async with registry.lease("key", "http://llm", "m"):
+            registry.invalidate()
+            await settle()
+            assert service.closed == 0
+        await settle()
+        assert service.closed == 0
+        # New leases get a fresh service while the retired one is still in use
+        async with registry.lease("key", "http://llm", "m") as replacement:
+            assert replacement is not service
+    assert service.closed == 1
+    assert replacement.closed == 0
+    assert registry._leases == {} and registry._retired == {}
+
+
+async def test_idle_service_is_closed_on_invalidate(registry):
+    async with registry.lease("key", "http://llm", "m") as service:
+        pass
+    registry.invalidate()
+    await settle()
+    assert service.closed == 1
+    # Releasing later leases of other services does not close it again
+    async with registry.lease("key", "http://llm", "m"):
+        pass
+    assert service.closed == 1
+
+
+async def test_lease_is_released_when_the_body_raises(registry):
+    with pytest.raises(RuntimeError):
+        async with registry.lease("key", "http://llm", "m") as service:
+            registry.invalidate()
+            raise RuntimeError("request failed")
+    assert service.closed == 1
+    assert registry._leases == {}
+
+
+async def test_aclose_closes_live_and_retired_services(registry):
+    async with registry.lease("key", "http://llm", "old") as retired:
+        registry.invalidate()
+        async with registry.lease("key", "http://llm", "new") as live:
+            await registry.aclose()
+            assert (retired.closed, live.closed) == (1, 1)
+    # The leases ending afterwards must not close them a second time
+    assert (retired.closed, live.closed) == (1, 1)
+
+
+def test_invalidate_without_event_loop(monkeypatch):
+    monkeypatch.setattr(llm_client_registry, "AnalysisService", FakeService)
+    monkeypatch.setattr(LLMClientRegistry, "_build_client", staticmethod(lambda api_key, base_url: None))
+    registry = LLMClientRegistry()
+
+    async def use():
+        async with registry.lease("key", "http://llm", "m") as service:
+            return service
+
+    service = asyncio.run(use())
+    registry.invalidate()
+    assert service.closed == 1
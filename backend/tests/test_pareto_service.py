@@ -0,0 +1,98 @@
+"""Dominance layers against repeated peeling of the non-dominated set"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models.compact import RequirementRecord, SCORE_FIELDS
+from services import pareto_service
+from services.pareto_service import MAXIMIZE, NEUTRAL_SCORE, ParetoService
+
+
+def make_records(rng, count, levels):
+    records = []
+    for index in range(count):
+        scores = {
+            field: None if rng.random() < 0.1 else float(rng.randint(1, levels)) for field in SCORE_FIELDS
+        }
+        records.append(RequirementRecord(id=f"R{index}", title="", description="", **scores))
+    return records
+
+
+def brute_force(records):
+    """Peel off the non-dominated records one layer at a time"""
+    points = []
+    for record in records:
+        point = []
+        for field in SCORE_FIELDS:
+            value = getattr(record, field)
+            value = NEUTRAL_SCORE if value is None else value
+            point.append(-value if field in MAXIMIZE else value)
+        points.append(point)
+
+    def dominates(a, b):
+        return all(x <= y for x, y in zip(a, b)) and a != b
+
+    layers = [0] * len(points)
+    remaining = set(range(len(points)))
+    layer = 0
+    while remaining:
+        layer += 1
+        front = {i for i in remaining if not any(dominates(points[j], points[i]) for j in remaining)}
+        for i in front:
+            layers[i] = layer
+        remaining -= front
+    return layers
+
+
+def rank_matrix(records):
+    raw = np.array([[getattr(r, field) for field in SCORE_FIELDS] for r in records], dtype=float)
+    points = np.where(np.isnan(raw), NEUTRAL_SCORE, raw)
+    points[:, [SCORE_FIELDS.index(field) for field in MAXIMIZE]] *= -1
+    return np.stack([np.unique(column, return_inverse=True)[1].reshape(-1) for column in points.T], axis=1)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_grid_matches_brute_force(seed):
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(1, 60), levels=rng.choice([2, 4, 10]))
+    assert ParetoService.dominance_layers(records) == brute_force(records)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_divide_and_conquer_matches_brute_force(seed, monkeypatch):
+    # Tiny leaves so small inputs go through the median splits and the cross step
+    monkeypatch.setattr(pareto_service, "SOLVE_LEAF_POINTS", 2)
+    monkeypatch.setattr(pareto_service, "CROSS_LEAF_PAIRS", 1)
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(1, 60), levels=rng.choice([2, 4, 10, 1000]))
+    assert ParetoService._divide_conquer_layers(rank_matrix(records)) == brute_force(records)
+
+
+def test_divide_and_conquer_used_when_grid_is_too_large(monkeypatch):
+    monkeypatch.setattr(pareto_service, "GRID_MAX_CELLS", 0)
+    records = make_records(random.Random(1), 80, levels=1000)
+    assert ParetoService.dominance_layers(records) == brute_force(records)
+
+
+def test_empty_input():
+    assert ParetoService.dominance_layers([]) == []
+
+
+@pytest.mark.parametrize("grid_max_cells", [pareto_service.GRID_MAX_CELLS, 0])
+def test_all_ties_share_the_first_layer(grid_max_cells, monkeypatch):
+    monkeypatch.setattr(pareto_service, "GRID_MAX_CELLS", grid_max_cells)
+    records = [
+        RequirementRecord(id=f"R{i}", title="", description="", businessValue=7.0, cost=3.0)
+        for i in range(20)
+    ]
+    assert ParetoService.dominance_layers(records) == [1] * 20
+
+
+def test_chain_gives_one_layer_per_record():
+    records = [
+        RequirementRecord(id=f"R{i}", title="", description="", businessValue=float(10 - i), cost=float(i + 1))
+        for i in range(10)
+    ]
+    assert ParetoService.dominance_layers(records) == list(range(1, 11))
@@ -0,0 +1,129 @@
+"""Release planning solvers against exhaustive search over every subset"""
+
+import random
+import time
+from itertools import combinations
+
+import pytest
+
+from models.compact import PrioritizedRecord
+from services import release_planning_service
+from services.release_planning_service import ReleasePlanningService
+
+
+def make_records(rng, count, dependency_probability=0.0):
+    records = []
+    for index in range(count):
+        depends_on = [
+            f"R{prerequisite}" for prerequisite in range(index) if rng.random() < dependency_probability
+        ]
+        records.append(PrioritizedRecord(
+            id=f"R{index}",
+            title=f"Requirement {index}",
+            description="",
+            category="FEATURE",
+            cost=float(rng.randint(1, 10)),
+            priorityScore=float(rng.randint(0, 100)),
+            dependsOn=depends_on or None,
+        ))
+    return records
+
+
+def brute_force(records, budget):
+    """Best total score over all subsets within budget that include their prerequisites"""
+    ids = {record.id: index for index, record in enumerate(records)}
+    best = 0.0
+    for size in range(len(records) + 1):
+        for subset in combinations(range(len(records)), size):
+            chosen = set(subset)
+            if sum(records[i].cost for i in chosen) > budget:
+                continue
+            if any(ids[p] not in chosen for i in chosen for p in records[i].dependsOn or ()):
+                continue
+            best = max(best, sum(records[i].priorityScore for i in chosen))
+    return best
+
+
+def check(records, budget, selected):
+    chosen = set(selected)
+    assert len(chosen) == len(selected)
+    assert sum(records[i].cost for i in chosen) <= budget
+    ids = {record.id: index for index, record in enumerate(records)}
+    for i in chosen:
+        for prerequisite in records[i].dependsOn or ():
+            assert ids[prerequisite] in chosen
+    return sum(records[i].priorityScore for i in chosen)
+
+
+def deadline():
+    return time.perf_counter() + 60
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dynamic_programming_matches_brute_force(seed):
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(1, 10))
+    budget = rng.randint(0, 40)
+    selected, solver, optimal = ReleasePlanningService().solve(records, budget, deadline())
+    assert solver in ("all", "dynamic_programming")
+    assert optimal
+    assert check(records, budget, selected) == pytest.approx(brute_force(records, budget))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_branch_and_bound_matches_brute_force(seed, monkeypatch):
+    monkeypatch.setattr(release_planning_service, "DP_MAX_CELLS", 0)
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(1, 10))
+    budget = rng.randint(1, 40)
+    selected, solver, optimal = ReleasePlanningService().solve(records, budget, deadline())
+    assert solver in ("all", "branch_and_bound")
+    assert optimal
+    assert check(records, budget, selected) == pytest.approx(brute_force(records, budget))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_dependencies_match_brute_force(seed):
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(2, 10), dependency_probability=0.3)
+    budget = rng.randint(0, 40)
+    selected, solver, optimal = ReleasePlanningService().solve_with_dependencies(records, budget, deadline())
+    assert optimal
+    assert check(records, budget, selected) == pytest.approx(brute_force(records, budget))
+
+
+def test_empty_input():
+    plan = ReleasePlanningService().plan([], budget=10)
+    assert len(plan.releases) == 1
+    assert plan.releases[0].requirements == []
+    assert plan.marginal == []
+
+
+@pytest.mark.parametrize("dependency_probability", [0.0, 0.5])
+def test_capacity_zero_selects_nothing(dependency_probability):
+    records = make_records(random.Random(7), 8, dependency_probability)
+    selected, _, optimal = ReleasePlanningService().solve_with_dependencies(records, 0, deadline())
+    assert selected == []
+    assert optimal
+
+
+def test_prerequisite_outside_the_candidates_is_met():
+    records = [
+        PrioritizedRecord(id="A", title="A", description="", category="FEATURE", cost=2.0, priorityScore=50.0,
+                          dependsOn=["SHIPPED"]),
+        PrioritizedRecord(id="B", title="B", description="", category="FEATURE", cost=2.0, priorityScore=10.0),
+    ]
+    selected, _, _ = ReleasePlanningService().solve_with_dependencies(records, 2, deadline())
+    assert selected == [0]
+
+
+def test_later_releases_respect_earlier_prerequisites():
+    rng = random.Random(3)
+    records = make_records(rng, 10, dependency_probability=0.3)
+    plan = ReleasePlanningService().plan(records, budget=15, releases=3)
+    delivered = set()
+    for release in plan.releases:
+        ids = {record.id for record in release.requirements}
+        for record in release.requirements:
+            assert all(p in delivered or p in ids for p in record.dependsOn or ())
+        delivered |= ids
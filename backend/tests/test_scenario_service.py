@@ -0,0 +1,115 @@
+"""Scenario ranking and Kendall's tau against direct computation"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from models.compact import RequirementRecord, SCORE_FIELDS
+from models.requirement import Weights
+from services.ranking_engines import CATEGORY_MULTIPLIERS
+from services.scenario_service import ScenarioService, kendall_tau
+
+
+def brute_force_tau(first, second):
+    """1 - 4 * discordant pairs / (n * (n - 1)), ties broken by position as in kendall_tau"""
+    count = len(first)
+    rank_first = {index: rank for rank, index in enumerate(sorted(range(count), key=lambda i: (first[i], i)))}
+    rank_second = {index: rank for rank, index in enumerate(sorted(range(count), key=lambda i: (second[i], i)))}
+    discordant = sum(
+        (rank_first[i] - rank_first[j]) * (rank_second[i] - rank_second[j]) < 0
+        for i, j in combinations(range(count), 2)
+    )
+    return 1 - 4 * discordant / (count * (count - 1))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_kendall_tau_matches_brute_force(seed):
+    rng = random.Random(seed)
+    count = rng.randint(2, 70)
+    # Narrow value ranges produce many ties
+    values = rng.choice([3, 10, 1000])
+    first = [rng.randint(0, values) for _ in range(count)]
+    second = [rng.randint(0, values) for _ in range(count)]
+    assert kendall_tau(first, second) == pytest.approx(brute_force_tau(first, second))
+
+
+def test_kendall_tau_extremes():
+    assert kendall_tau([], []) is None
+    assert kendall_tau([1], [5]) is None
+    assert kendall_tau([1, 2, 3, 4], [10, 20, 30, 40]) == 1.0
+    assert kendall_tau([1, 2, 3, 4], [4, 3, 2, 1]) == -1.0
+    # All ties: both orders fall back to input position
+    assert kendall_tau([7] * 5, [7] * 5) == 1.0
+
+
+def make_records(rng, count, dependency_probability=0.0):
+    records = []
+    for index in range(count):
+        depends_on = [f"R{other}" for other in range(index) if rng.random() < dependency_probability]
+        records.append(RequirementRecord(
+            id=f"R{index}", title="", description="",
+            category=rng.choice(list(CATEGORY_MULTIPLIERS)),
+            dependsOn=depends_on or None,
+            **{field: None if rng.random() < 0.2 else float(rng.randint(1, 10)) for field in SCORE_FIELDS},
+        ))
+    return records
+
+
+def random_weights(rng):
+    raw = [rng.random() for _ in SCORE_FIELDS]
+    shares = [round(value / sum(raw), 3) for value in raw]
+    shares[-1] = round(1 - sum(shares[:-1]), 3)
+    return Weights(**dict(zip(SCORE_FIELDS, shares)))
+
+
+def direct_score(record, weights):
+    """Weighted sum of 0-1 normalized scores (cost and risk inverted) x category multiplier, on 0-100"""
+    total = 0.0
+    for field in SCORE_FIELDS:
+        value = getattr(record, field)
+        scaled = ((5.0 if value is None else value) - 1) / 9
+        if field in ("cost", "risk"):
+            scaled = 1 - scaled
+        total += scaled * getattr(weights, field)
+    return min(100.0, max(0.0, total * CATEGORY_MULTIPLIERS[record.category] * 100))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rank_matches_direct_scoring(seed):
+    rng = random.Random(seed)
+    records = make_records(rng, rng.randint(1, 30))
+    scenarios = [(f"S{i}", random_weights(rng), None) for i in range(rng.randint(1, 5))]
+    for ranking, (name, weights, _) in zip(ScenarioService().rank(records, scenarios), scenarios):
+        expected = [direct_score(record, weights) for record in records]
+        assert ranking.name == name
+        assert ranking.scores == pytest.approx(expected)
+        assert sorted(ranking.ranks) == list(range(1, len(records) + 1))
+        # Higher score never ranks below a lower one
+        for i, j in combinations(range(len(records)), 2):
+            if expected[i] > expected[j] + 1e-9:
+                assert ranking.ranks[i] < ranking.ranks[j]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rank_puts_prerequisites_first(seed):
+    rng = random.Random(seed)
+    records = make_records(rng, 20, dependency_probability=0.15)
+    for ranking in ScenarioService().rank(records, [("a", Weights(), None), ("b", random_weights(rng), None)]):
+        rank = {record.id: ranking.ranks[index] for index, record in enumerate(records)}
+        for record in records:
+            assert all(rank[prerequisite] < rank[record.id] for prerequisite in record.dependsOn or ())
+
+
+def test_correlations_use_common_requirements():
+    ranks = [
+        ("a", {"R1": 1, "R2": 2, "R3": 3, "only-a": 4}),
+        ("b", {"R3": 1, "R2": 2, "R1": 3}),
+        ("c", {"R1": 2, "R2": 1}),
+    ]
+    correlations = ScenarioService.correlations(ranks)
+    assert [(first, second) for first, second, _ in correlations] == [("a", "b"), ("a", "c"), ("b", "c")]
+    assert correlations[0][2] == -1.0
+    assert correlations[1][2] == -1.0
+    assert correlations[2][2] == 1.0
+    assert ScenarioService.correlations([("a", {"R1": 1}), ("b", {"R2": 1})]) == [("a", "b", None)]
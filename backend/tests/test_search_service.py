@@ -0,0 +1,139 @@
+"""SQLite full-text search: trigger-maintained FTS keys, escaped snippets and totals"""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base
+from database.models import Requirement, Session as DBSession, User
+from migrations import add_requirement_search
+from services.search_service import SearchService, fts5_query, highlight, MATCH_END, MATCH_START
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(add_requirement_search, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    add_requirement_search.run_migration()
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(id="alice", email="alice@example.com", username="alice", hashed_password="x"),
+        User(id="bob", email="bob@example.com", username="bob", hashed_password="x"),
+        DBSession(id="s1", user_id="alice", name="First"),
+        DBSession(id="s2", user_id="alice", name="Second"),
+        DBSession(id="s3", user_id="bob", name="Other"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def add(db, id, session_id, title, description=""):
+    db.add(Requirement(id=id, session_id=session_id, external_id=f"REQ-{id}", title=title, description=description))
+    db.commit()
+
+
+def found(db, query, user_id="alice", **kwargs):
+    hits, total = SearchService().search(db, user_id, query, **kwargs)
+    return sorted((hit.requirementId, hit.sessionId) for hit in hits), total
+
+
+def test_index_follows_inserts_updates_and_deletes(db):
+    add(db, "a", "s1", "Single sign-on login")
+    add(db, "b", "s2", "Password reset", "Reset the login password by email")
+    add(db, "c", "s3", "Login audit log")
+    assert found(db, "login") == ([("REQ-a", "s1"), ("REQ-b", "s2")], 2)
+    assert found(db, "login", session_id="s2") == ([("REQ-b", "s2")], 1)
+    assert found(db, "login", user_id="bob") == ([("REQ-c", "s3")], 1)
+
+    requirement = db.get(Requirement, "a")
+    requirement.title = "Single sign-on with SAML"
+    db.commit()
+    assert found(db, "login") == ([("REQ-b", "s2")], 1)
+    assert found(db, "saml") == ([("REQ-a", "s1")], 1)
+
+    db.delete(db.get(Requirement, "b"))
+    db.commit()
+    assert found(db, "login") == ([], 0)
+    assert found(db, "password") == ([], 0)
+
+    # A new row must not pick up the FTS entry of the deleted one
+    add(db, "d", "s2", "Export report")
+    assert found(db, "export") == ([("REQ-d", "s2")], 1)
+    assert found(db, "password") == ([], 0)
+    assert found(db, "saml") == ([("REQ-a", "s1")], 1)
+
+
+def test_keys_survive_vacuum(db):
+    for index in range(5):
+        add(db, f"r{index}", "s1", f"Requirement number{index}")
+    db.delete(db.get(Requirement, "r1"))
+    db.commit()
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    for index in (0, 2, 3, 4):
+        assert found(db, f"number{index}") == ([(f"REQ-r{index}", "s1")], 1)
+
+
+def test_snippet_is_escaped_and_only_matches_are_bold(db):
+    add(db, "x", "s1", "<script>alert(1)</script> checkout button")
+    hits, _ = SearchService().search(db, "alice", "checkout")
+    assert hits[0].title == "<script>alert(1)</script> checkout button"
+    assert hits[0].snippet == "&lt;script&gt;alert(1)&lt;/script&gt; <b>checkout</b> button"
+
+
+def test_highlight():
+    assert highlight(None) == ""
+    assert highlight(f"a & {MATCH_START}<b>{MATCH_END}") == "a &amp; <b>&lt;b&gt;</b>"
+
+
+def test_query_syntax_is_quoted(db):
+    add(db, "a", "s1", "Login NOT working")
+    assert fts5_query('login" OR title:*') == '"login" "OR" "title"'
+    assert found(db, "NOT working") == ([("REQ-a", "s1")], 1)
+    assert found(db, "***") == ([], 0)
+
+
+@pytest.mark.parametrize("count", [0, 1, 9, 10, 11, 25])
+def test_total_with_and_without_count_query(db, count):
+    for index in range(count):
+        add(db, f"r{index}", "s1", f"Dashboard widget {index}")
+    counts = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: counts.append("count(*)" in args[2]))
+    pages = max(1, -(-count // 10))
+    for page in range(1, pages + 2):
+        counts.clear()
+        hits, total = SearchService().search(db, "alice", "dashboard", page=page, page_size=10)
+        assert total == count
+        assert len(hits) == max(0, min(10, count - (page - 1) * 10))
+        # Only a full page (or an empty page past the end) needs the count query
+        assert any(counts) == (len(hits) == 10 or (not hits and page > 1))
+
+
+def test_migration_indexes_existing_rows_and_rebuilds_only_when_needed(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(id="alice", email="alice@example.com", username="alice", hashed_password="x"),
+        DBSession(id="s1", user_id="alice"),
+        Requirement(id="old", session_id="s1", external_id="REQ-old", title="Legacy billing", description=""),
+    ])
+    session.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    add_requirement_search.run_migration()
+    assert found(session, "billing") == ([("REQ-old", "s1")], 1)
+    assert any("'rebuild'" in statement for statement in statements)
+
+    statements.clear()
+    add_requirement_search.run_migration()
+    assert not any("'rebuild'" in statement for statement in statements)
+    assert found(session, "billing") == ([("REQ-old", "s1")], 1)
+    session.close()
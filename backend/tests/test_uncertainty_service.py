@@ -0,0 +1,118 @@
+"""Monte Carlo rank uncertainty against a per-simulation loop"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models.compact import RequirementRecord, SCORE_FIELDS
+from models.requirement import RankingMethod, Weights
+from services import uncertainty_service
+from services.ranking_engines import CriteriaMatrix, get_engine
+from services.uncertainty_service import MISSING_SPREAD, PERCENTILES, simulate_ranks, simulation_count
+
+# Engines that use no randomness of their own, so the oracle can replay the noise
+DETERMINISTIC_METHODS = [RankingMethod.TOPSIS, RankingMethod.WSJF, RankingMethod.AHP]
+
+
+def make_records(rng, count, missing_probability=0.2):
+    return [
+        RequirementRecord(
+            id=f"R{index}", title="", description="",
+            **{field: None if rng.random() < missing_probability else float(rng.randint(1, 10)) for field in SCORE_FIELDS},
+        )
+        for index in range(count)
+    ]
+
+
+def brute_force(matrix, engine, weights, seed, simulations, spread, top_k):
+    """Score and rank one simulation at a time, then read percentiles off each requirement's sorted ranks"""
+    rng = np.random.default_rng(seed)
+    count = len(matrix)
+    noise = rng.random((simulations, *matrix.values.shape), dtype=np.float32) * 2 - 1
+    half_width = np.where(matrix.provided, spread, MISSING_SPREAD).astype(np.float32)
+    ranks = []
+    for simulation in range(simulations):
+        values = np.clip(noise[simulation] * half_width + matrix.values.astype(np.float32), 1.0, 10.0)
+        scores, _ = engine.score(CriteriaMatrix.with_values(matrix, values), weights, rng)
+        order = sorted(range(count), key=lambda i: -scores[i])
+        rank = [0] * count
+        for position, index in enumerate(order, start=1):
+            rank[index] = position
+        ranks.append(rank)
+
+    top_k = max(1, min(top_k, count))
+    percentiles = []
+    for p in PERCENTILES:
+        percentiles.append([sorted(r[i] for r in ranks)[round(p / 100 * (simulations - 1))] for i in range(count)])
+    probability = [sum(r[i] <= top_k for r in ranks) / simulations for i in range(count)]
+    return percentiles, probability
+
+
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("chunk_cells", [uncertainty_service.CHUNK_CELLS, 7])
+def test_matches_per_simulation_loop(seed, chunk_cells, monkeypatch):
+    # Chunking must not change the result: the noise is drawn as one stream either way
+    monkeypatch.setattr(uncertainty_service, "CHUNK_CELLS", chunk_cells)
+    rng = random.Random(seed)
+    matrix = CriteriaMatrix(make_records(rng, rng.randint(1, 12)))
+    engine = get_engine(DETERMINISTIC_METHODS[seed % len(DETERMINISTIC_METHODS)])
+    weights = Weights()
+    simulations, spread, top_k = rng.randint(1, 60), rng.choice([0.5, 1.0, 3.0]), rng.randint(1, 15)
+
+    result = simulate_ranks(matrix, engine, weights, np.random.default_rng(seed), simulations, spread, top_k)
+    (low, median, high), probability = brute_force(matrix, engine, weights, seed, simulations, spread, top_k)
+    assert result.rank_low.tolist() == low
+    assert result.rank_median.tolist() == median
+    assert result.rank_high.tolist() == high
+    assert result.top_k_probability.tolist() == pytest.approx(probability)
+
+
+@pytest.mark.parametrize("method", list(RankingMethod))
+def test_ranks_are_within_bounds(method):
+    rng = random.Random(1)
+    count = 15
+    matrix = CriteriaMatrix(make_records(rng, count))
+    result = simulate_ranks(matrix, get_engine(method), Weights(), np.random.default_rng(1), 200, top_k=5)
+    assert ((1 <= result.rank_low) & (result.rank_low <= result.rank_median)).all()
+    assert ((result.rank_median <= result.rank_high) & (result.rank_high <= count)).all()
+    assert ((0 <= result.confidence) & (result.confidence <= 1)).all()
+    # Exactly top_k requirements land in the top K of every simulation
+    assert result.top_k_probability.sum() == pytest.approx(5)
+
+
+def test_zero_spread_without_missing_scores_is_certain():
+    rng = random.Random(2)
+    records = make_records(rng, 10, missing_probability=0.0)
+    matrix = CriteriaMatrix(records)
+    engine = get_engine(RankingMethod.TOPSIS)
+    scores, _ = engine.score(CriteriaMatrix.with_values(matrix, matrix.values.astype(np.float32)), Weights(), None)
+    result = simulate_ranks(matrix, engine, Weights(), np.random.default_rng(2), 50, spread=0.0, top_k=3)
+
+    assert (result.rank_low == result.rank_high).all()
+    assert (result.confidence == 1.0).all()
+    assert sorted(result.rank_median.tolist()) == list(range(1, 11))
+    # Same ranking as the point estimate, up to ties
+    assert np.all(np.diff(np.asarray(scores)[np.argsort(result.rank_median)]) <= 1e-6)
+    assert sorted(result.top_k_probability.tolist()) == [0.0] * 7 + [1.0] * 3
+
+
+def test_single_requirement():
+    matrix = CriteriaMatrix(make_records(random.Random(3), 1))
+    result = simulate_ranks(matrix, get_engine(RankingMethod.WSJF), Weights(), np.random.default_rng(3), 20, top_k=10)
+    assert result.top_k == 1
+    assert result.rank_low.tolist() == result.rank_high.tolist() == [1]
+    assert result.confidence.tolist() == [1.0]
+    assert result.top_k_probability.tolist() == [1.0]
+
+
+def test_simulation_count(monkeypatch):
+    monkeypatch.setattr(uncertainty_service, "DEFAULT_SIMULATIONS", 1000)
+    monkeypatch.setattr(uncertainty_service, "MAX_CELLS", 100_000)
+    assert simulation_count(None, 10) == 1000
+    assert simulation_count(0, 10) == 0
+    assert simulation_count(-5, 10) == 0
+    assert simulation_count(5000, 0) == 5000
+    assert simulation_count(5000, 1000) == 100
+    # Never below the minimum, however large the session
+    assert simulation_count(5000, 10_000_000) == uncertainty_service.MIN_SIMULATIONS